@@ -1,11 +1,17 @@
 from fastapi import APIRouter, HTTPException, Depends, Request
-from sqlmodel import Session, select
+from sqlmodel import Session
+from typing import Any, Optional
 from ...models.user import User, UserRegister, UserLogin, UserLoginResponse, UserResponse
+from ...models.refresh_token import TokenRefreshRequest, TokenRefreshResponse
+from ...models.revoked_token import LogoutRequest
 from ...core.database import get_session
 from ...core.security import hash_password, verify_password, create_access_token
 from ...core.settings import get_settings
-from ...core.auth import get_current_active_user
+from ...core.statements import user_by_email_statement
+from ...core.auth import get_current_active_user, get_token_payload
 from ...core.rate_limit import rate_limit_auth, rate_limit_api
+from ...core.refresh_tokens import issue_refresh_token, rotate_refresh_token, revoke_refresh_token
+from ...core.revocation import revoke_token, revoke_all_tokens
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -21,8 +27,7 @@ async def register_user(
     await rate_limit_auth(request, settings.rate_limit_auth_per_min)
     
     # Check if email already exists
-    statement = select(User).where(User.email == payload.email)
-    existing_user = session.exec(statement).first()
+    existing_user = session.exec(user_by_email_statement(), params={"email": payload.email}).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already exists")
     
@@ -34,8 +39,9 @@ async def register_user(
     # Create new user
     user = User(**user_data)
     session.add(user)
+    session.flush()
+    refresh_token = issue_refresh_token(session, user.id)
     session.commit()
-    session.refresh(user)
     
     # Create access token immediately
     access_token = create_access_token(
@@ -45,6 +51,7 @@ async def register_user(
     
     return UserLoginResponse(
         access_token=access_token,
+        refresh_token=refresh_token,
         user=UserResponse.model_validate(user)
     )
 
@@ -60,10 +67,9 @@ async def login_user(
     await rate_limit_auth(request, settings.rate_limit_auth_per_min)
     
     # Find user by email
-    statement = select(User).where(User.email == payload.email)
-    user = session.exec(statement).first()
+    user = session.exec(user_by_email_statement(), params={"email": payload.email}).first()
     
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=401, detail="Invalid email or password")
     
     # Verify password
@@ -74,17 +80,43 @@ async def login_user(
     if not user.active:
         raise HTTPException(status_code=401, detail="User account is disabled")
     
-    # Create access token
+    # Create access token, and a refresh token to renew it without the password
     access_token = create_access_token(
         data={"sub": str(user.id), "email": user.email},
-        expires_minutes=settings.access_token_expire_minutes
+        expires_minutes=settings.access_token_expire_minutes,
+        not_before=user.tokens_not_before
     )
+    refresh_token = issue_refresh_token(session, user.id)
+    session.commit()
     
     return UserLoginResponse(
         access_token=access_token,
+        refresh_token=refresh_token,
         user=UserResponse.model_validate(user)
     )
 
+@router.post("/refresh", response_model=TokenRefreshResponse)
+async def refresh_access_token(
+    request: Request,
+    payload: TokenRefreshRequest,
+    session: Session = Depends(get_session)
+) -> TokenRefreshResponse:
+    """
+    Exchange a refresh token for a new access token and a new refresh token.
+    Each refresh token works once; reusing one revokes every token of its login.
+    """
+    # No password hash here, so the per-IP API limit applies instead of the login limit
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min)
+    
+    user, refresh_token = rotate_refresh_token(session, payload.refresh_token)
+    access_token = create_access_token(
+        data={"sub": str(user.id), "email": user.email},
+        expires_minutes=settings.access_token_expire_minutes,
+        not_before=user.tokens_not_before
+    )
+    return TokenRefreshResponse(access_token=access_token, refresh_token=refresh_token)
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
     request: Request,
@@ -95,3 +127,33 @@ async def get_current_user_info(
     settings = get_settings()
     await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
     return UserResponse.model_validate(current_user)
+
+@router.post("/logout", status_code=204)
+async def logout_user(
+    request: Request,
+    payload: Optional[LogoutRequest] = None,
+    token: dict[str, Any] = Depends(get_token_payload),
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session)
+):
+    """Revoke the current access token and, if given, the refresh token of the same login"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    if payload and payload.refresh_token:
+        revoke_refresh_token(session, payload.refresh_token, current_user.id)
+    revoke_token(session, token, current_user.id)
+    return None
+
+@router.post("/logout-all", status_code=204)
+async def logout_all_sessions(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_session)
+):
+    """Revoke every access and refresh token of the current user"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    revoke_all_tokens(session, current_user)
+    return None
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Request
+from sqlmodel import Session
+from typing import Any
+from ...models.batch import BatchRequest, BatchResponse
+from ...models.user import User
+from ...core.database import get_session
+from ...core.auth import get_current_active_user, get_token_payload
+from ...core.batch import BatchRunner, check_batch
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+@router.post("", response_model=BatchResponse)
+async def run_batch(
+    request: Request,
+    payload: BatchRequest,
+    token: dict[str, Any] = Depends(get_token_payload),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> BatchResponse:
+    """
+    Run several API requests in one roundtrip, as the authenticated user.
+    Consecutive GETs run concurrently; other methods run in order, one at a time.
+    Each sub-request gets its own status, headers and body in the response, in request order.
+    """
+    check_batch(payload.requests)
+    runner = BatchRunner(request, token, current_user, session)
+    return BatchResponse(responses=await runner.run(payload.requests))
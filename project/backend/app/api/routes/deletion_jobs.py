@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Depends, Request
+from sqlmodel import Session
+from ...models.user import User
+from ...models.project import Project
+from ...models.deletion_job import DeletionJob, DeletionJobResponse
+from ...core.database import get_session
+from ...core.replicas import get_read_session
+from ...core.auth import get_current_active_user, is_admin
+from ...core.rate_limit import rate_limit_api
+from ...core.settings import get_settings
+
+router = APIRouter(prefix="/deletion-jobs", tags=["deletion-jobs"])
+
+def can_view_job(session: Session, user: User, job: DeletionJob) -> bool:
+    """Administrators, the user who started the job and the owner of the deleted project or account"""
+    if is_admin(user) or job.requested_by == user.id:
+        return True
+    if job.entity == "user":
+        return job.entity_id == user.id
+    project = session.get(Project, job.entity_id)
+    return project is not None and project.id_user == user.id
+
+@router.get("/{job_id}", response_model=DeletionJobResponse)
+async def get_deletion_job(
+    job_id: int,
+    request: Request,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user)
+) -> DeletionJobResponse:
+    """Get status and progress of a background deletion job (see can_view_job)"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    job = session.get(DeletionJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+    if not can_view_job(session, current_user, job):
+        raise HTTPException(status_code=403, detail="Not enough permissions on this deletion job")
+    return DeletionJobResponse.model_validate(job)
@@ -0,0 +1,56 @@
+import io
+import tempfile
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+from ...models.user import User
+from ...models.import_report import ImportReport
+from ...core.database import get_session
+from ...core.auth import get_current_active_user
+from ...core.rate_limit import rate_limit_api
+from ...core.settings import get_settings
+from ...core.importer import Importer, IMPORT_ENTITIES, IMPORT_FORMATS
+from ...core.permissions import get_permissions
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+# Request bodies larger than this are spooled to disk instead of memory
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+@router.post("", response_model=ImportReport)
+async def import_data(
+    request: Request,
+    entity: str = Query(description=f"Entity to import ({', '.join(IMPORT_ENTITIES)})"),
+    import_format: str = Query(default="csv", alias="format", description=f"Input format ({', '.join(IMPORT_FORMATS)})"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> ImportReport:
+    """
+    Import users, projects or tasks from a CSV or NDJSON request body.
+    Invalid rows are reported with their line number; valid rows are still imported.
+    """
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    if entity not in IMPORT_ENTITIES:
+        raise HTTPException(status_code=400, detail=f"entity must be one of: {', '.join(IMPORT_ENTITIES)}")
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+    
+    # Stream the body to a spooled file so large uploads are not held in memory
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        
+        stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+        # Tasks are only imported into projects the user can write to
+        permissions = get_permissions(session, current_user)
+        importer = Importer(
+            session,
+            entity,
+            batch_size=settings.import_batch_size,
+            hash_workers=settings.import_hash_workers,
+            can_write_project=lambda project_id: "write" in permissions.get(project_id, ())
+        )
+        return await run_in_threadpool(importer.run, stream, import_format)
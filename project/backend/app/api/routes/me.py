@@ -0,0 +1,97 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from sqlmodel import Session, select
+from typing import Optional
+from ...models.task import Task, WorkItemResponse, TASK_STATUSES
+from ...models.project import Project
+from ...models.project_member import ProjectMember
+from ...models.project_role import ProjectRole
+from ...models.user import User
+from ...models.pagination import CursorPaginatedResponse
+from ...core.database import get_session
+from ...core.replicas import get_read_session
+from ...core.auth import get_current_active_user
+from ...core.rate_limit import rate_limit_api
+from ...core.settings import get_settings
+from ...core.cursors import encode_due_cursor, decode_due_cursor, after_due_cursor, undated_after_cursor
+from ...core.permissions import accessible_projects
+from ...core.fieldsets import fetch_rows
+
+router = APIRouter(prefix="/me", tags=["me"])
+
+@router.get("/work", response_model=CursorPaginatedResponse[WorkItemResponse])
+async def get_my_work(
+    request: Request,
+    session: Session = Depends(get_read_session),
+    limit: int = Query(default=20, ge=1, le=100, description="Number of records to return"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page"),
+    status: Optional[str] = Query(default=None, description="Filter by status"),
+    current_user: User = Depends(get_current_active_user)
+) -> CursorPaginatedResponse[WorkItemResponse]:
+    """Get tasks assigned to the current user in projects they can read, by due date (undated last)"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+
+    if status is not None and status not in TASK_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Status must be one of: {', '.join(TASK_STATUSES)}")
+
+    # Same access set as every other task read: memberships and projects created by the user
+    project_ids = accessible_projects(session, current_user)
+    if not project_ids:
+        return CursorPaginatedResponse[WorkItemResponse](items=[], limit=limit, next_cursor=None, has_more=False)
+
+    base = (
+        select(
+            Task.id, Task.project_id, Task.title, Task.description, Task.status,
+            Task.assigned_to, Task.created_at, Task.due_date,
+            Project.name.label("project_name"),
+            Project.description.label("project_description")
+        )
+        .join(Project, Project.id == Task.project_id)
+        .where(Task.assigned_to == current_user.id, Task.project_id.in_(project_ids), Project.deleting == False)
+    )
+    if status:
+        base = base.where(Task.status == status)
+
+    # Two ranges of the (assigned_to, due_date, id) index, each read in index order:
+    # dated tasks by (due_date, id), then undated tasks by id
+    due_date, row_id = decode_due_cursor(cursor) if cursor else (None, None)
+    in_dated_range = row_id is None or due_date is not None
+    rows = []
+    if in_dated_range:
+        dated = after_due_cursor(Task.due_date, Task.id, due_date, row_id) if due_date else Task.due_date.is_not(None)
+        rows = fetch_rows(session, base.where(dated).order_by(Task.due_date, Task.id).limit(limit + 1))
+    if len(rows) <= limit:
+        undated = undated_after_cursor(Task.due_date, Task.id, 0 if in_dated_range else row_id)
+        rows += fetch_rows(session, base.where(undated).order_by(Task.id).limit(limit + 1 - len(rows)))
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # The user's role in each project of the page (lowest role id if added twice; none for creators)
+    roles = {}
+    page_projects = {row["project_id"] for row in rows}
+    if page_projects:
+        for project_id, role_id, role_name in session.exec(
+            select(ProjectMember.project_id, ProjectMember.project_role_id, ProjectRole.name)
+            .join(ProjectRole, ProjectRole.id == ProjectMember.project_role_id, isouter=True)
+            .where(ProjectMember.user_id == current_user.id, ProjectMember.project_id.in_(page_projects))
+            .order_by(ProjectMember.project_role_id.desc())
+        ).all():
+            roles[project_id] = {"project_role_id": role_id, "role_name": role_name}
+
+    # The assignee is always the current user: no lookup needed
+    items = [
+        WorkItemResponse(
+            **row,
+            **roles.get(row["project_id"], {}),
+            assigned_to_name=current_user.name,
+            assigned_to_email=current_user.email
+        )
+        for row in rows
+    ]
+    next_cursor = encode_due_cursor(rows[-1]["due_date"], rows[-1]["id"]) if has_more else None
+    return CursorPaginatedResponse[WorkItemResponse](
+        items=items,
+        limit=limit,
+        next_cursor=next_cursor,
+        has_more=has_more
+    )
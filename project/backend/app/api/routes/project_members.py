@@ -1,81 +1,170 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Query
-from sqlmodel import Session, select, func, col
-from typing import List, Optional
+from sqlmodel import Session, select
+from typing import List, Optional, Set
 from ...models.project_member import ProjectMember, ProjectMemberCreate, ProjectMemberUpdate, ProjectMemberResponse
 from ...models.user import User
 from ...models.project_role import ProjectRole
 from ...models.project import Project
-from ...models.pagination import PaginatedResponse
+from ...models.pagination import PaginatedResponse, NormalizedPaginatedResponse, NormalizedListResponse
 from ...core.database import get_session
+from ...core.replicas import get_read_session
+from ...core.statements import (
+    member_list_statements, project_members_statement, user_memberships_statement, order_column_name, column_names
+)
 from ...core.auth import get_current_active_user
 from ...core.rate_limit import rate_limit_api
 from ...core.settings import get_settings
+from ...core.deletion import deleting_projects, deleting_users
+from ...core.permissions import require_project_access, accessible_projects, invalidate_permissions
+from ...core.fieldsets import sparse_fields, wants, columns_for, trim, fetch_rows, sparse_response
+from ...core.sideload import Relation, normalized_shape, normalized_columns, side_load
 
 router = APIRouter(prefix="/project-members", tags=["project-members"])
 
-def enrich_project_member_response(member: ProjectMember, session: Session) -> ProjectMemberResponse:
-    """Helper function to enrich project member with related information"""
+# Response fields that require a lookup on a related table
+PROJECT_FIELDS = {"project_name"}
+USER_FIELDS = {"user_name", "user_email"}
+ROLE_FIELDS = {"role_name", "role_description"}
+
+# Related entities side-loaded by ?shape=normalized
+MEMBER_RELATIONS = (
+    Relation("project_id", "projects", Project, {"project_name": "name"}),
+    Relation("user_id", "users", User, {"user_name": "name", "user_email": "email"}),
+    Relation("project_role_id", "roles", ProjectRole, {"role_name": "name", "role_description": "description"}),
+)
+
+member_fields = sparse_fields(ProjectMemberResponse)
+
+def enrich_project_member_data(
+    member_data: dict,
+    session: Session,
+    fieldset: Optional[Set[str]] = None,
+    project: Optional[Project] = None,
+    user: Optional[User] = None,
+    project_role: Optional[ProjectRole] = None
+) -> dict:
+    """
+    Add related information to member data, skipping lookups for fields not requested.
+    Related objects the caller already loaded are reused instead of queried again.
+    """
     # Get project information
-    project = session.get(Project, member.project_id)
+    if wants(fieldset, PROJECT_FIELDS):
+        if project is None:
+            project = session.get(Project, member_data['project_id'])
+        member_data['project_name'] = project.name if project else "Unknown Project"
     
     # Get user information
-    user = session.get(User, member.user_id)
+    if wants(fieldset, USER_FIELDS):
+        if user is None:
+            user = session.get(User, member_data['user_id'])
+        member_data['user_name'] = user.name if user else "Unknown User"
+        member_data['user_email'] = user.email if user else "Unknown Email"
     
     # Get project role information
-    project_role = session.get(ProjectRole, member.project_role_id)
-    
-    # Create enriched member data
-    member_data = member.model_dump()
-    member_data['project_name'] = project.name if project else "Unknown Project"
-    member_data['user_name'] = user.name if user else "Unknown User"
-    member_data['user_email'] = user.email if user else "Unknown Email"
-    member_data['role_name'] = project_role.name if project_role else "Unknown Role"
-    member_data['role_description'] = project_role.description if project_role else None
+    if wants(fieldset, ROLE_FIELDS):
+        if project_role is None:
+            project_role = session.get(ProjectRole, member_data['project_role_id'])
+        member_data['role_name'] = project_role.name if project_role else "Unknown Role"
+        member_data['role_description'] = project_role.description if project_role else None
     
+    return member_data
+
+def enrich_project_member_response(
+    member: ProjectMember,
+    session: Session,
+    project: Optional[Project] = None,
+    user: Optional[User] = None,
+    project_role: Optional[ProjectRole] = None
+) -> ProjectMemberResponse:
+    """Helper function to enrich project member with related information"""
+    member_data = enrich_project_member_data(
+        member.model_dump(), session, project=project, user=user, project_role=project_role
+    )
     return ProjectMemberResponse.model_validate(member_data)
 
+def member_columns(fieldset: Set[str], *required: str) -> list:
+    """Columns needed to build a sparse project member response"""
+    required = list(required)
+    if wants(fieldset, PROJECT_FIELDS):
+        required.append("project_id")
+    if wants(fieldset, USER_FIELDS):
+        required.append("user_id")
+    if wants(fieldset, ROLE_FIELDS):
+        required.append("project_role_id")
+    return columns_for(ProjectMember, fieldset, *required)
+
+def normalized_member_columns(fieldset: Optional[Set[str]]) -> list:
+    """Columns of project members returned with ?shape=normalized"""
+    return normalized_columns(ProjectMember, ProjectMemberResponse, MEMBER_RELATIONS, fieldset)
+
+def sparse_member_items(rows: List[dict], session: Session, fieldset: Set[str]) -> List[dict]:
+    """Build trimmed project member dicts from projected rows"""
+    return [trim(enrich_project_member_data(row, session, fieldset), fieldset) for row in rows]
+
 @router.get("/", response_model=PaginatedResponse[ProjectMemberResponse])
 async def list_project_members(
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     skip: int = Query(default=0, ge=0, description="Number of records to skip"),
     limit: int = Query(default=10, ge=1, le=100, description="Number of records to return"),
     order_by: str = Query(default="created_at", description="Field to order by"),
     order_dir: str = Query(default="desc", description="Order direction (asc or desc)"),
     project_id: Optional[int] = Query(default=None, description="Filter by project ID"),
     user_id: Optional[int] = Query(default=None, description="Filter by user ID"),
+    fieldset: Optional[Set[str]] = Depends(member_fields),
+    normalized: bool = Depends(normalized_shape),
     current_user: User = Depends(get_current_active_user)
 ) -> PaginatedResponse[ProjectMemberResponse]:
     """Get paginated list of project members with filtering and ordering"""
     settings = get_settings()
     await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
     
-    # Base query
-    statement = select(ProjectMember)
+    # Filter values; memberships of projects and users being deleted, and of projects the user
+    # cannot read, are hidden
+    params = {"project_ids": accessible_projects(session, current_user), "project_id": project_id, "user_id": user_id}
+    params = {name: value for name, value in params.items() if value is not None}
     
-    # Apply filters
-    if project_id is not None:
-        statement = statement.where(ProjectMember.project_id == project_id)
+    if normalized:
+        columns = normalized_member_columns(fieldset)
+    else:
+        columns = None if fieldset is None else member_columns(fieldset)
     
-    if user_id is not None:
-        statement = statement.where(ProjectMember.user_id == user_id)
+    # Cached statements for this shape (filters present, columns, ordering)
+    statement, count_statement = member_list_statements(
+        column_names(columns),
+        frozenset(params),
+        order_column_name(ProjectMember, order_by),
+        order_dir.lower() != "asc"
+    )
     
     # Get total count
-    count_statement = select(func.count()).select_from(statement.subquery())
-    total = session.exec(count_statement).one()
-    
-    # Apply ordering
-    order_column = getattr(ProjectMember, order_by, ProjectMember.created_at)
-    if order_dir.lower() == "asc":
-        statement = statement.order_by(col(order_column).asc())
-    else:
-        statement = statement.order_by(col(order_column).desc())
+    total = session.exec(count_statement, params=params).one()
     
     # Apply pagination
-    statement = statement.offset(skip).limit(limit)
+    params.update(skip=skip, limit=limit)
+    
+    if normalized:
+        rows = fetch_rows(session, statement, params)
+        return sparse_response(NormalizedPaginatedResponse[dict](
+            items=rows,
+            included=side_load(session, rows, MEMBER_RELATIONS, fieldset),
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=(skip + limit) < total
+        ))
+    
+    if fieldset is not None:
+        return sparse_response(PaginatedResponse[dict](
+            items=sparse_member_items(fetch_rows(session, statement, params), session, fieldset),
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=(skip + limit) < total
+        ))
     
     # Execute query
-    members = session.exec(statement).all()
+    members = session.exec(statement, params=params).all()
     
     return PaginatedResponse(
         items=[enrich_project_member_response(member, session) for member in members],
@@ -86,27 +175,62 @@ async def list_project_members(
     )
 
 @router.get("/project/{project_id}", response_model=List[ProjectMemberResponse])
-def list_project_members_by_project(project_id: int, session: Session = Depends(get_session)) -> List[ProjectMemberResponse]:
+def list_project_members_by_project(
+    project_id: int,
+    session: Session = Depends(get_read_session),
+    fieldset: Optional[Set[str]] = Depends(member_fields),
+    normalized: bool = Depends(normalized_shape),
+    current_user: User = Depends(get_current_active_user)
+) -> List[ProjectMemberResponse]:
     """Get all members for a specific project"""
     # Validate project exists
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
+    
+    params = {"project_id": project_id}
+    if normalized:
+        statement = project_members_statement(column_names(normalized_member_columns(fieldset)))
+        rows = fetch_rows(session, statement, params)
+        return sparse_response(NormalizedListResponse[dict](
+            items=rows, included=side_load(session, rows, MEMBER_RELATIONS, fieldset)
+        ))
+    
+    if fieldset is not None:
+        statement = project_members_statement(column_names(member_columns(fieldset)))
+        return sparse_response(sparse_member_items(fetch_rows(session, statement, params), session, fieldset))
     
-    statement = select(ProjectMember).where(ProjectMember.project_id == project_id).order_by(ProjectMember.created_at.desc())
-    members = session.exec(statement).all()
+    members = session.exec(project_members_statement(None), params=params).all()
     return [enrich_project_member_response(member, session) for member in members]
 
 @router.get("/user/{user_id}", response_model=List[ProjectMemberResponse])
-def list_project_members_by_user(user_id: int, session: Session = Depends(get_session)) -> List[ProjectMemberResponse]:
-    """Get all projects where a user is a member"""
+def list_project_members_by_user(
+    user_id: int,
+    session: Session = Depends(get_read_session),
+    fieldset: Optional[Set[str]] = Depends(member_fields),
+    normalized: bool = Depends(normalized_shape),
+    current_user: User = Depends(get_current_active_user)
+) -> List[ProjectMemberResponse]:
+    """Get all projects where a user is a member (among the projects the current user can read)"""
     # Validate user exists
     user = session.get(User, user_id)
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=404, detail="User not found")
     
-    statement = select(ProjectMember).where(ProjectMember.user_id == user_id).order_by(ProjectMember.created_at.desc())
-    members = session.exec(statement).all()
+    params = {"user_id": user_id, "project_ids": accessible_projects(session, current_user)}
+    if normalized:
+        statement = user_memberships_statement(column_names(normalized_member_columns(fieldset)))
+        rows = fetch_rows(session, statement, params)
+        return sparse_response(NormalizedListResponse[dict](
+            items=rows, included=side_load(session, rows, MEMBER_RELATIONS, fieldset)
+        ))
+    
+    if fieldset is not None:
+        statement = user_memberships_statement(column_names(member_columns(fieldset)))
+        return sparse_response(sparse_member_items(fetch_rows(session, statement, params), session, fieldset))
+    
+    members = session.exec(user_memberships_statement(None), params=params).all()
     return [enrich_project_member_response(member, session) for member in members]
 
 @router.post("/", response_model=ProjectMemberResponse, status_code=201)
@@ -122,18 +246,19 @@ async def create_project_member(
     
     # Validate that the project exists
     project = session.get(Project, payload.project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=400, detail="project_id does not exist")
+    require_project_access(session, current_user, payload.project_id, "manage")
     
     # Validate that the user exists
     user = session.get(User, payload.user_id)
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=400, detail="user_id does not exist")
     
     # Validate that the project role exists
     project_role = session.get(ProjectRole, payload.project_role_id)
-    if not project_role:
-        raise HTTPException(status_code=400, detail="project_role_id does not exist")
+    if not project_role or project_role.project_id != payload.project_id:
+        raise HTTPException(status_code=400, detail="project_role_id does not exist in this project")
     
     # Check if user is already a member of this project
     existing_member = session.exec(
@@ -150,28 +275,53 @@ async def create_project_member(
     member = ProjectMember(**payload.model_dump())
     session.add(member)
     session.commit()
-    session.refresh(member)
-    return enrich_project_member_response(member, session)
+    invalidate_permissions([member.user_id])
+    return enrich_project_member_response(member, session, project=project, user=user, project_role=project_role)
 
 @router.get("/{member_id}", response_model=ProjectMemberResponse)
-def get_project_member(member_id: int, session: Session = Depends(get_session)) -> ProjectMemberResponse:
+def get_project_member(
+    member_id: int,
+    session: Session = Depends(get_read_session),
+    fieldset: Optional[Set[str]] = Depends(member_fields),
+    current_user: User = Depends(get_current_active_user)
+) -> ProjectMemberResponse:
     """Get project member by ID"""
-    member = session.get(ProjectMember, member_id)
+    conditions = (
+        ProjectMember.id == member_id,
+        ProjectMember.project_id.not_in(deleting_projects()),
+        ProjectMember.user_id.not_in(deleting_users())
+    )
+    if fieldset is not None:
+        # project_id is always read for the access check
+        rows = fetch_rows(session, select(*member_columns(fieldset, "project_id")).where(*conditions))
+        if not rows:
+            raise HTTPException(status_code=404, detail="Project member not found")
+        require_project_access(session, current_user, rows[0]['project_id'], "read")
+        return sparse_response(sparse_member_items(rows, session, fieldset)[0])
+    
+    member = session.exec(select(ProjectMember).where(*conditions)).first()
     if not member:
         raise HTTPException(status_code=404, detail="Project member not found")
+    require_project_access(session, current_user, member.project_id, "read")
     return enrich_project_member_response(member, session)
 
 @router.put("/{member_id}", response_model=ProjectMemberResponse)
-def update_project_member(member_id: int, payload: ProjectMemberUpdate, session: Session = Depends(get_session)) -> ProjectMemberResponse:
+def update_project_member(
+    member_id: int,
+    payload: ProjectMemberUpdate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> ProjectMemberResponse:
     """Update project member role by ID"""
     member = session.get(ProjectMember, member_id)
     if not member:
         raise HTTPException(status_code=404, detail="Project member not found")
+    require_project_access(session, current_user, member.project_id, "manage")
     
     # Validate that the project role exists
     project_role = session.get(ProjectRole, payload.project_role_id)
-    if not project_role:
-        raise HTTPException(status_code=400, detail="project_role_id does not exist")
+    if not project_role or project_role.project_id != member.project_id:
+        raise HTTPException(status_code=400, detail="project_role_id does not exist in this project")
     
     # Update member
     update_data = payload.model_dump(exclude_unset=True)
@@ -180,16 +330,23 @@ def update_project_member(member_id: int, payload: ProjectMemberUpdate, session:
     
     session.add(member)
     session.commit()
-    session.refresh(member)
-    return enrich_project_member_response(member, session)
+    invalidate_permissions([member.user_id])
+    return enrich_project_member_response(member, session, project_role=project_role)
 
 @router.delete("/{member_id}", status_code=204)
-def delete_project_member(member_id: int, session: Session = Depends(get_session)):
+def delete_project_member(
+    member_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+):
     """Remove user from project"""
     member = session.get(ProjectMember, member_id)
     if not member:
         raise HTTPException(status_code=404, detail="Project member not found")
+    require_project_access(session, current_user, member.project_id, "manage")
     
+    user_id = member.user_id
     session.delete(member)
     session.commit()
+    invalidate_permissions([user_id])
     return None
@@ -1,24 +1,44 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Query
 from sqlmodel import Session, select, func, col
-from typing import List, Optional
+from typing import List, Optional, Set
 from ...models.project_role import ProjectRole, ProjectRoleCreate, ProjectRoleUpdate, ProjectRoleResponse
 from ...models.project import Project
 from ...models.user import User
 from ...models.pagination import PaginatedResponse
 from ...core.database import get_session
+from ...core.replicas import get_read_session
 from ...core.auth import get_current_active_user
 from ...core.rate_limit import rate_limit_api
 from ...core.settings import get_settings
+from ...core.deletion import deleting_projects
+from ...core.permissions import require_project_access, invalidate_permissions, role_member_ids
+from ...core.fieldsets import sparse_fields, wants, columns_for, trim, fetch_rows, sparse_response
 
 router = APIRouter(prefix="/project-roles", tags=["project-roles"])
 
+role_fields = sparse_fields(ProjectRoleResponse)
+
 @router.get("/project/{project_id}", response_model=List[ProjectRoleResponse])
-def list_project_roles_by_project(project_id: int, session: Session = Depends(get_session)) -> List[ProjectRoleResponse]:
+def list_project_roles_by_project(
+    project_id: int,
+    session: Session = Depends(get_read_session),
+    fieldset: Optional[Set[str]] = Depends(role_fields),
+    current_user: User = Depends(get_current_active_user)
+) -> List[ProjectRoleResponse]:
     """Get all roles for a specific project"""
     # Validate project exists
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
+    
+    if fieldset is not None:
+        statement = select(*columns_for(ProjectRole, fieldset)).where(ProjectRole.project_id == project_id).order_by(ProjectRole.name.asc())
+        items = []
+        for role_data in fetch_rows(session, statement):
+            role_data['project_name'] = project.name
+            items.append(trim(role_data, fieldset))
+        return sparse_response(items)
     
     statement = select(ProjectRole).where(ProjectRole.project_id == project_id).order_by(ProjectRole.name.asc())
     roles = session.exec(statement).all()
@@ -45,8 +65,9 @@ async def create_project_role(
     
     # Validate that the project exists
     project = session.get(Project, payload.project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=400, detail="project_id does not exist")
+    require_project_access(session, current_user, payload.project_id, "manage")
     
     # Check if role name already exists for this project
     existing_role = session.exec(
@@ -63,7 +84,6 @@ async def create_project_role(
     role = ProjectRole(**payload.model_dump())
     session.add(role)
     session.commit()
-    session.refresh(role)
     
     # Enrich with project name
     role_data = role.model_dump()
@@ -72,14 +92,37 @@ async def create_project_role(
     return ProjectRoleResponse.model_validate(role_data)
 
 @router.get("/{role_id}", response_model=ProjectRoleResponse)
-def get_project_role(role_id: int, session: Session = Depends(get_session)) -> ProjectRoleResponse:
+def get_project_role(
+    role_id: int,
+    session: Session = Depends(get_read_session),
+    fieldset: Optional[Set[str]] = Depends(role_fields),
+    current_user: User = Depends(get_current_active_user)
+) -> ProjectRoleResponse:
     """Get project role by ID"""
+    if fieldset is not None:
+        # project_id is always read for the access check
+        statement = select(*columns_for(ProjectRole, fieldset, "project_id")).where(
+            ProjectRole.id == role_id, ProjectRole.project_id.not_in(deleting_projects())
+        )
+        rows = fetch_rows(session, statement)
+        if not rows:
+            raise HTTPException(status_code=404, detail="Project role not found")
+        role_data = rows[0]
+        require_project_access(session, current_user, role_data['project_id'], "read")
+        if wants(fieldset, {"project_name"}):
+            project = session.get(Project, role_data['project_id'])
+            role_data['project_name'] = project.name if project else "Unknown Project"
+        return sparse_response(trim(role_data, fieldset))
+    
     role = session.get(ProjectRole, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Project role not found")
     
-    # Get project information
+    # Get project information (roles of a project being deleted are hidden)
     project = session.get(Project, role.project_id)
+    if project and project.deleting:
+        raise HTTPException(status_code=404, detail="Project role not found")
+    require_project_access(session, current_user, role.project_id, "read")
     
     # Enrich with project name
     role_data = role.model_dump()
@@ -88,20 +131,30 @@ def get_project_role(role_id: int, session: Session = Depends(get_session)) -> P
     return ProjectRoleResponse.model_validate(role_data)
 
 @router.put("/{role_id}", response_model=ProjectRoleResponse)
-def update_project_role(role_id: int, payload: ProjectRoleUpdate, session: Session = Depends(get_session)) -> ProjectRoleResponse:
+def update_project_role(
+    role_id: int,
+    payload: ProjectRoleUpdate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> ProjectRoleResponse:
     """Update project role by ID"""
     role = session.get(ProjectRole, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Project role not found")
+    require_project_access(session, current_user, role.project_id, "manage")
     
     # Update role
     update_data = payload.model_dump(exclude_unset=True)
+    capabilities_changed = update_data.get("capabilities", role.capabilities) != role.capabilities
     for key, value in update_data.items():
         setattr(role, key, value)
     
     session.add(role)
     session.commit()
-    session.refresh(role)
+    
+    # Members holding the role get their permissions reloaded
+    if capabilities_changed:
+        invalidate_permissions(role_member_ids(session, role.id))
     
     # Get project information
     project = session.get(Project, role.project_id)
@@ -113,11 +166,16 @@ def update_project_role(role_id: int, payload: ProjectRoleUpdate, session: Sessi
     return ProjectRoleResponse.model_validate(role_data)
 
 @router.delete("/{role_id}", status_code=204)
-def delete_project_role(role_id: int, session: Session = Depends(get_session)):
+def delete_project_role(
+    role_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+):
     """Delete project role by ID"""
     role = session.get(ProjectRole, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Project role not found")
+    require_project_access(session, current_user, role.project_id, "manage")
     
     session.delete(role)
     session.commit()
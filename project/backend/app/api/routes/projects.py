@@ -1,35 +1,79 @@
-from fastapi import APIRouter, HTTPException, Depends, Request, Query
-from sqlmodel import Session, select, func, col
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, Query, BackgroundTasks
+from fastapi.responses import Response, StreamingResponse
+from sqlmodel import Session, select, func, col, insert
+from typing import List, Optional, Set
+from datetime import datetime, date
 from ...models.project import Project, ProjectCreate, ProjectUpdate, ProjectResponse
 from ...models.user import User
 from ...models.project_role import ProjectRole
 from ...models.pagination import PaginatedResponse
+from ...models.bulk import BulkItemResult, BulkResponse
+from ...models.deletion_job import DeletionJobResponse
+from ...models.task_stats import ProjectTaskStatsResponse
+from ...models.project_overview import ProjectOverviewResponse
+from ...models.calendar import ProjectCalendarResponse
+from ...models.task_history import BurndownResponse, CycleTimeResponse
 from ...core.database import get_session
+from ...core.replicas import get_read_session
 from ...core.auth import get_current_active_user
 from ...core.rate_limit import rate_limit_api
 from ...core.settings import get_settings
+from ...core.statements import order_column_name
+from ...core.bulk import check_bulk_size, bulk_response, existing_ids, insert_rows
+from ...core.role_templates import default_role_rows
+from ...core.deletion import start_deletion, run_deletion_job
+from ...core.export import EXPORT_FORMATS, export_project_tasks
+from ...core.compression import choose_encoding
+from ...core.task_stats import get_project_stats
+from ...core.overview import project_overview
+from ...core.etags import etag_response
+from ...core.calendar import MAX_CALENDAR_DAYS, project_calendar
+from ...core.task_history import MAX_CHART_DAYS, project_burndown, project_cycle_time
+from ...core.permissions import require_project_access, accessible_projects, invalidate_permissions
+from ...core.fieldsets import sparse_fields, wants, columns_for, trim, fetch_rows, sparse_response
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+# Response fields that require a lookup on the users table
+CREATOR_FIELDS = {"creator_name", "creator_email"}
+
+project_fields = sparse_fields(ProjectResponse)
+
+def sparse_project_item(project_data: dict, session: Session, fieldset: Set[str]) -> dict:
+    """Build a trimmed project dict from a projected row"""
+    if wants(fieldset, CREATOR_FIELDS):
+        creator = session.get(User, project_data['id_user'])
+        project_data['creator_name'] = creator.name if creator else "Unknown User"
+        project_data['creator_email'] = creator.email if creator else "Unknown User"
+    return trim(project_data, fieldset)
+
+def project_columns(fieldset: Set[str]) -> list:
+    """Columns needed to build a sparse project response"""
+    required = ["id_user"] if wants(fieldset, CREATOR_FIELDS) else []
+    return columns_for(Project, fieldset, *required)
+
 @router.get("/", response_model=PaginatedResponse[ProjectResponse])
 async def list_projects(
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     skip: int = Query(default=0, ge=0, description="Number of records to skip"),
     limit: int = Query(default=10, ge=1, le=100, description="Number of records to return"),
     order_by: str = Query(default="updated_at", description="Field to order by"),
     order_dir: str = Query(default="desc", description="Order direction (asc or desc)"),
     search: Optional[str] = Query(default=None, description="Search by name or description"),
     creator_id: Optional[int] = Query(default=None, description="Filter by creator ID"),
+    fieldset: Optional[Set[str]] = Depends(project_fields),
     current_user: User = Depends(get_current_active_user)
 ) -> PaginatedResponse[ProjectResponse]:
     """Get paginated list of projects with filtering and ordering"""
     settings = get_settings()
     await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
     
-    # Base query
-    statement = select(Project)
+    # Base query (only the requested columns when a fieldset is given)
+    statement = select(Project) if fieldset is None else select(*project_columns(fieldset))
+    
+    # Hide projects being deleted and projects the user cannot read
+    statement = statement.where(Project.deleting == False, Project.id.in_(accessible_projects(session, current_user)))
     
     # Apply filters
     if search:
@@ -46,7 +90,7 @@ async def list_projects(
     total = session.exec(count_statement).one()
     
     # Apply ordering
-    order_column = getattr(Project, order_by, Project.updated_at)
+    order_column = getattr(Project, order_column_name(Project, order_by))
     if order_dir.lower() == "asc":
         statement = statement.order_by(col(order_column).asc())
     else:
@@ -55,6 +99,15 @@ async def list_projects(
     # Apply pagination
     statement = statement.offset(skip).limit(limit)
     
+    if fieldset is not None:
+        return sparse_response(PaginatedResponse[dict](
+            items=[sparse_project_item(row, session, fieldset) for row in fetch_rows(session, statement)],
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=(skip + limit) < total
+        ))
+    
     # Execute query
     projects = session.exec(statement).all()
     
@@ -88,27 +141,18 @@ async def create_project(
     
     # Validate that the creator user exists
     user = session.get(User, payload.id_user)
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=400, detail="id_user does not exist")
     
-    # Create new project
+    # Create new project (flush assigns the id without committing)
     project = Project(**payload.model_dump())
     session.add(project)
-    session.commit()
-    session.refresh(project)
-    
-    # Create default roles for the project
-    default_roles = [
-        {"name": "Administrador", "description": "Administrador del proyecto", "project_id": project.id},
-        {"name": "Desarrollador", "description": "Desarrollador del proyecto", "project_id": project.id},
-        {"name": "Revisor", "description": "Revisor del proyecto", "project_id": project.id}
-    ]
-    
-    for role_data in default_roles:
-        role = ProjectRole(**role_data)
-        session.add(role)
+    session.flush()
     
+    # Create default roles for the project with one multi-row INSERT, same transaction
+    session.execute(insert(ProjectRole), default_role_rows([project.id]))
     session.commit()
+    invalidate_permissions([project.id_user])
     
     # Include creator information in response
     project_data = {
@@ -124,17 +168,61 @@ async def create_project(
     
     return ProjectResponse.model_validate(project_data)
 
+@router.post("/bulk", response_model=BulkResponse)
+async def create_projects_bulk(
+    request: Request,
+    payload: List[ProjectCreate],
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> BulkResponse:
+    """Create many projects with their default roles in a single transaction"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    check_bulk_size(len(payload))
+    
+    # Validate creators for the whole batch with one IN query
+    users = existing_ids(session, User, (item.id_user for item in payload), User.deleting == False)
+    
+    results: List[Optional[BulkItemResult]] = [None] * len(payload)
+    rows, row_indexes = [], []
+    for index, item in enumerate(payload):
+        if item.id_user not in users:
+            results[index] = BulkItemResult(index=index, success=False, error="id_user does not exist")
+        else:
+            rows.append(Project(**item.model_dump()).model_dump(exclude={"id"}))
+            row_indexes.append(index)
+    
+    # Insert projects, then all their default roles with one multi-row INSERT
+    new_ids = insert_rows(session, Project, rows)
+    if new_ids:
+        session.execute(insert(ProjectRole), default_role_rows(new_ids))
+    session.commit()
+    invalidate_permissions(row["id_user"] for row in rows)
+    
+    for index, project_id in zip(row_indexes, new_ids):
+        results[index] = BulkItemResult(index=index, id=project_id, success=True)
+    return bulk_response(results)
+
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: int, 
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
+    fieldset: Optional[Set[str]] = Depends(project_fields),
     current_user: User = Depends(get_current_active_user)
 ) -> ProjectResponse:
     """Get project by ID"""
+    if fieldset is not None:
+        rows = fetch_rows(session, select(*project_columns(fieldset)).where(Project.id == project_id, Project.deleting == False))
+        if not rows:
+            raise HTTPException(status_code=404, detail="Project not found")
+        require_project_access(session, current_user, project_id, "read")
+        return sparse_response(sparse_project_item(rows[0], session, fieldset))
+    
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
     
     # Include creator information
     creator = session.get(User, project.id_user)
@@ -151,6 +239,158 @@ async def get_project(
     
     return ProjectResponse.model_validate(project_data)
 
+@router.get("/{project_id}/stats", response_model=ProjectTaskStatsResponse)
+async def get_project_stats_endpoint(
+    project_id: int,
+    request: Request,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user)
+) -> ProjectTaskStatsResponse:
+    """Get task counts by status, overdue count and per-assignee load of a project"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    project = session.get(Project, project_id)
+    if not project or project.deleting:
+        raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
+    
+    # Read from the precomputed summary rows, never from the tasks table
+    return get_project_stats(session, project_id)
+
+@router.get("/{project_id}/overview", response_model=ProjectOverviewResponse)
+async def get_project_overview(
+    project_id: int,
+    request: Request,
+    task_limit: int = Query(default=20, ge=1, le=100, description="Number of newest tasks to include"),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user)
+) -> Response:
+    """
+    Get the project with its creator, roles, members, newest tasks and task counts.
+    Built from a fixed number of queries; send the ETag back in If-None-Match to get 304 when unchanged.
+    """
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    return etag_response(request, project_overview(session, current_user, project_id, task_limit))
+
+@router.get("/{project_id}/calendar", response_model=ProjectCalendarResponse)
+async def get_project_calendar(
+    project_id: int,
+    request: Request,
+    start: date = Query(description="First day of the range (inclusive)"),
+    end: date = Query(description="Last day of the range (inclusive)"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> ProjectCalendarResponse:
+    """Get a project's tasks grouped by due day for a calendar range"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days + 1 > MAX_CALENDAR_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_CALENDAR_DAYS} days")
+    
+    project = session.get(Project, project_id)
+    if not project or project.deleting:
+        raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
+    
+    # One range query on (project_id, due_date), or none when the project is in the calendar index
+    return project_calendar(session, project_id, start, end)
+
+def check_chart_range(start: date, end: date) -> None:
+    """Reject inverted or too long chart ranges"""
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days + 1 > MAX_CHART_DAYS:
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_CHART_DAYS} days")
+
+@router.get("/{project_id}/burndown", response_model=BurndownResponse)
+async def get_project_burndown(
+    project_id: int,
+    request: Request,
+    start: date = Query(description="First day of the range (inclusive)"),
+    end: date = Query(description="Last day of the range (inclusive)"),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user)
+) -> BurndownResponse:
+    """Get open, completed and cancelled task counts at the end of each day"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    check_chart_range(start, end)
+    
+    project = session.get(Project, project_id)
+    if not project or project.deleting:
+        raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
+    
+    # Built from the daily rollup, not the transition log
+    return project_burndown(session, project_id, start, end)
+
+@router.get("/{project_id}/cycle-time", response_model=CycleTimeResponse)
+async def get_project_cycle_time(
+    project_id: int,
+    request: Request,
+    start: date = Query(description="First day of the range (inclusive)"),
+    end: date = Query(description="Last day of the range (inclusive)"),
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user)
+) -> CycleTimeResponse:
+    """Get tasks completed per day and their average hours from creation to completion"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    check_chart_range(start, end)
+    
+    project = session.get(Project, project_id)
+    if not project or project.deleting:
+        raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
+    
+    return project_cycle_time(session, project_id, start, end)
+
+@router.get("/{project_id}/tasks/export")
+async def export_project_tasks_endpoint(
+    project_id: int,
+    request: Request,
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$", description="Export format (ndjson or csv)"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> StreamingResponse:
+    """Stream all tasks of a project as NDJSON or CSV (gzip if accepted by the client)"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    project = session.get(Project, project_id)
+    if not project or project.deleting:
+        raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
+    
+    # q-values count: "gzip;q=0" or an identity-only client gets the plain stream
+    compress = choose_encoding(request.headers.get("accept-encoding", ""), ["gzip"]) == "gzip"
+    headers = {
+        "Content-Disposition": f'attachment; filename="project_{project_id}_tasks.{export_format}"',
+        "Vary": "Accept-Encoding"
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    
+    # The stream opens its own sessions: the request session is closed before the body is sent
+    return StreamingResponse(
+        export_project_tasks(
+            project.id,
+            project.name,
+            project.description,
+            export_format,
+            settings.export_batch_size,
+            compress=compress
+        ),
+        media_type=EXPORT_FORMATS[export_format],
+        headers=headers
+    )
+
 @router.put("/{project_id}", response_model=ProjectResponse)
 async def update_project(
     project_id: int, 
@@ -161,17 +401,18 @@ async def update_project(
 ) -> ProjectResponse:
     """Update project by ID"""
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "manage")
     
     # Update project
     update_data = payload.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(project, key, value)
+    project.updated_at = datetime.utcnow()
     
     session.add(project)
     session.commit()
-    session.refresh(project)
     
     # Include creator information in response
     creator = session.get(User, project.id_user)
@@ -188,18 +429,24 @@ async def update_project(
     
     return ProjectResponse.model_validate(project_data)
 
-@router.delete("/{project_id}", status_code=204)
+@router.delete("/{project_id}", response_model=DeletionJobResponse, status_code=202)
 async def delete_project(
     project_id: int, 
     request: Request,
+    background_tasks: BackgroundTasks,
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_active_user)
-):
-    """Delete project by ID"""
+) -> DeletionJobResponse:
+    """
+    Delete project by ID.
+    The project is hidden immediately; its tasks, members and roles are removed
+    in batches by a background job whose progress is available at /api/deletion-jobs/{id}.
+    """
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "manage")
     
-    session.delete(project)
-    session.commit()
-    return None
+    job = start_deletion(session, "project", project, current_user.id)
+    background_tasks.add_task(run_deletion_job, job.id)
+    return DeletionJobResponse.model_validate(job)
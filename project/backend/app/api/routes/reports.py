@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlmodel import Session
+from typing import List, Optional
+from ...models.user import User
+from ...models.report import ThroughputReport, StatusDistributionReport, AssigneeLoadReport
+from ...core.database import get_session
+from ...core.auth import get_current_active_user
+from ...core.permissions import require_project_access, accessible_projects
+from ...core.rate_limit import rate_limit_api
+from ...core.settings import get_settings
+from ...core.reports import (
+    DEFAULT_LOAD_BINS, get_snapshot, throughput_report, status_distribution_report, assignee_load_report
+)
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+def readable_projects(session: Session, user: User, project_id: Optional[int]) -> Optional[List[int]]:
+    """
+    Projects a report may count: None when project_id is given and readable
+    (the report filters on it), otherwise every project the user can read.
+
+    Raises:
+        HTTPException: 403 if project_id is given and the user cannot read it
+    """
+    if project_id is not None:
+        require_project_access(session, user, project_id, "read")
+        return None
+    return accessible_projects(session, user)
+
+@router.get("/throughput", response_model=ThroughputReport)
+async def get_throughput_report(
+    request: Request,
+    weeks: int = Query(default=12, ge=1, le=104, description="Number of weeks up to the current one"),
+    project_id: Optional[int] = Query(default=None, description="Filter by project ID"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> ThroughputReport:
+    """Get tasks created and completed per week in the projects the user can read"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    readable = readable_projects(session, current_user, project_id)
+    snapshot = await run_in_threadpool(get_snapshot)
+    return await run_in_threadpool(throughput_report, snapshot, weeks, project_id, readable=readable)
+
+@router.get("/status-distribution", response_model=StatusDistributionReport)
+async def get_status_distribution_report(
+    request: Request,
+    limit: int = Query(default=100, ge=1, le=1000, description="Number of projects to return (largest first)"),
+    project_id: Optional[int] = Query(default=None, description="Filter by project ID"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> StatusDistributionReport:
+    """Get task counts per status for each project the user can read"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    readable = readable_projects(session, current_user, project_id)
+    snapshot = await run_in_threadpool(get_snapshot)
+    return await run_in_threadpool(status_distribution_report, snapshot, limit, project_id, readable=readable)
+
+@router.get("/assignee-load", response_model=AssigneeLoadReport)
+async def get_assignee_load_report(
+    request: Request,
+    bins: List[int] = Query(default=DEFAULT_LOAD_BINS, description="Lower bounds of the open task buckets"),
+    top: int = Query(default=10, ge=0, le=100, description="Number of most loaded assignees to return"),
+    project_id: Optional[int] = Query(default=None, description="Filter by project ID"),
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> AssigneeLoadReport:
+    """Get a histogram of open tasks per assignee and the most loaded assignees in the projects the user can read"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    if not bins or min(bins) < 1:
+        raise HTTPException(status_code=400, detail="bins must be positive integers")
+    
+    readable = readable_projects(session, current_user, project_id)
+    snapshot = await run_in_threadpool(get_snapshot)
+    return await run_in_threadpool(assignee_load_report, snapshot, bins, top, project_id, readable=readable)
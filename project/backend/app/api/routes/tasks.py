@@ -1,45 +1,106 @@
 from fastapi import APIRouter, HTTPException, Depends, Request, Query
-from sqlmodel import Session, select, func, col
-from typing import List, Optional
+from sqlmodel import Session, select, delete
+from typing import List, Optional, Set
 from datetime import datetime
-from ...models.task import Task, TaskCreate, TaskUpdate, TaskResponse
+from ...models.task import (
+    Task, TaskCreate, TaskUpdate, TaskResponse,
+    TaskBulkUpdateItem, TaskBulkDelete
+)
+from ...models.task_history import TaskStatusHistory, TaskStatusHistoryResponse
+from ...models.bulk import BulkItemResult, BulkResponse
 from ...models.project import Project
 from ...models.user import User
-from ...models.pagination import PaginatedResponse
+from ...models.pagination import PaginatedResponse, NormalizedPaginatedResponse, NormalizedListResponse
 from ...core.database import get_session
+from ...core.replicas import get_read_session
+from ...core.statements import task_list_statements, project_tasks_statement, order_column_name, column_names
 from ...core.auth import get_current_active_user
 from ...core.rate_limit import rate_limit_api
 from ...core.settings import get_settings
 from ...core.task_automation import update_overdue_tasks, get_overdue_tasks_count
+from ...core.deletion import deleting_projects
+from ...core.bulk import check_bulk_size, bulk_response, existing_ids, insert_rows, update_rows
+from ...core.task_stats import task_key, apply_task_changes
+from ...core.calendar import invalidate_calendar
+from ...core.task_history import record_transitions
+from ...core.permissions import FORBIDDEN_DETAIL, require_project_access, accessible_projects
+from ...core.fieldsets import sparse_fields, wants, columns_for, trim, fetch_rows, sparse_response
+from ...core.sideload import Relation, normalized_shape, normalized_columns, side_load
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-def enrich_task_response(task: Task, session: Session) -> TaskResponse:
-    """Helper function to enrich task with related information"""
+# Response fields that require a lookup on a related table
+PROJECT_FIELDS = {"project_name", "project_description"}
+ASSIGNEE_FIELDS = {"assigned_to_name", "assigned_to_email"}
+
+# Related entities side-loaded by ?shape=normalized
+TASK_RELATIONS = (
+    Relation("project_id", "projects", Project, {"project_name": "name", "project_description": "description"}),
+    Relation("assigned_to", "users", User, {"assigned_to_name": "name", "assigned_to_email": "email"}),
+)
+
+task_fields = sparse_fields(TaskResponse)
+
+def enrich_task_data(
+    task_data: dict,
+    session: Session,
+    fieldset: Optional[Set[str]] = None,
+    project: Optional[Project] = None,
+    assigned_user: Optional[User] = None
+) -> dict:
+    """
+    Add related information to task data, skipping lookups for fields not requested.
+    Related objects the caller already loaded are reused instead of queried again.
+    """
     # Get project information
-    project = session.get(Project, task.project_id)
+    if wants(fieldset, PROJECT_FIELDS):
+        if project is None:
+            project = session.get(Project, task_data['project_id'])
+        task_data['project_name'] = project.name if project else "Unknown Project"
+        task_data['project_description'] = project.description if project else None
     
     # Get assigned user information
-    assigned_user = None
-    if task.assigned_to:
-        assigned_user = session.get(User, task.assigned_to)
-    
-    # Get project creator information
-    project_creator = session.get(User, project.id_user) if project else None
-    
-    # Create enriched task data
-    task_data = task.model_dump()
-    task_data['project_name'] = project.name if project else "Unknown Project"
-    task_data['project_description'] = project.description if project else None
-    task_data['assigned_to_name'] = assigned_user.name if assigned_user else None
-    task_data['assigned_to_email'] = assigned_user.email if assigned_user else None
+    if wants(fieldset, ASSIGNEE_FIELDS):
+        if not task_data['assigned_to']:
+            assigned_user = None
+        elif assigned_user is None:
+            assigned_user = session.get(User, task_data['assigned_to'])
+        task_data['assigned_to_name'] = assigned_user.name if assigned_user else None
+        task_data['assigned_to_email'] = assigned_user.email if assigned_user else None
     
+    return task_data
+
+def enrich_task_response(
+    task: Task,
+    session: Session,
+    project: Optional[Project] = None,
+    assigned_user: Optional[User] = None
+) -> TaskResponse:
+    """Helper function to enrich task with related information"""
+    task_data = enrich_task_data(task.model_dump(), session, project=project, assigned_user=assigned_user)
     return TaskResponse.model_validate(task_data)
 
+def task_columns(fieldset: Set[str], *required: str) -> list:
+    """Columns needed to build a sparse task response"""
+    required = list(required)
+    if wants(fieldset, PROJECT_FIELDS):
+        required.append("project_id")
+    if wants(fieldset, ASSIGNEE_FIELDS):
+        required.append("assigned_to")
+    return columns_for(Task, fieldset, *required)
+
+def normalized_task_columns(fieldset: Optional[Set[str]]) -> list:
+    """Columns of tasks returned with ?shape=normalized"""
+    return normalized_columns(Task, TaskResponse, TASK_RELATIONS, fieldset)
+
+def sparse_task_items(rows: List[dict], session: Session, fieldset: Set[str]) -> List[dict]:
+    """Build trimmed task dicts from projected rows"""
+    return [trim(enrich_task_data(row, session, fieldset), fieldset) for row in rows]
+
 @router.get("/", response_model=PaginatedResponse[TaskResponse])
 async def list_tasks(
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     skip: int = Query(default=0, ge=0, description="Number of records to skip"),
     limit: int = Query(default=10, ge=1, le=100, description="Number of records to return"),
     order_by: str = Query(default="created_at", description="Field to order by"),
@@ -48,47 +109,73 @@ async def list_tasks(
     status: Optional[str] = Query(default=None, description="Filter by status"),
     project_id: Optional[int] = Query(default=None, description="Filter by project ID"),
     assigned_to: Optional[int] = Query(default=None, description="Filter by assigned user ID"),
+    due_from: Optional[datetime] = Query(default=None, description="Only tasks due at or after this date"),
+    due_to: Optional[datetime] = Query(default=None, description="Only tasks due before this date"),
+    fieldset: Optional[Set[str]] = Depends(task_fields),
+    normalized: bool = Depends(normalized_shape),
     current_user: User = Depends(get_current_active_user)
 ) -> PaginatedResponse[TaskResponse]:
     """Get paginated list of tasks with filtering and ordering"""
     settings = get_settings()
     await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
     
-    # Base query
-    statement = select(Task)
-    
-    # Apply filters
-    if search:
-        search_filter = f"%{search}%"
-        statement = statement.where(
-            (Task.title.like(search_filter)) | (Task.description.like(search_filter))
-        )
+    # Half-open due date range [due_from, due_to)
+    if due_from and due_to and due_to <= due_from:
+        raise HTTPException(status_code=400, detail="due_to must be after due_from")
     
-    if status:
-        statement = statement.where(Task.status == status)
+    # Filter values; tasks of projects being deleted and of projects the user cannot read are hidden
+    params = {
+        "project_ids": accessible_projects(session, current_user),
+        "search": f"%{search}%" if search else None,
+        "status": status or None,
+        "project_id": project_id,
+        "assigned_to": assigned_to,
+        "due_from": due_from,
+        "due_to": due_to,
+    }
+    params = {name: value for name, value in params.items() if value is not None}
     
-    if project_id is not None:
-        statement = statement.where(Task.project_id == project_id)
+    if normalized:
+        columns = normalized_task_columns(fieldset)
+    else:
+        columns = None if fieldset is None else task_columns(fieldset)
     
-    if assigned_to is not None:
-        statement = statement.where(Task.assigned_to == assigned_to)
+    # Cached statements for this shape (filters present, columns, ordering)
+    statement, count_statement = task_list_statements(
+        column_names(columns),
+        frozenset(params),
+        order_column_name(Task, order_by),
+        order_dir.lower() != "asc"
+    )
     
     # Get total count
-    count_statement = select(func.count()).select_from(statement.subquery())
-    total = session.exec(count_statement).one()
-    
-    # Apply ordering
-    order_column = getattr(Task, order_by, Task.created_at)
-    if order_dir.lower() == "asc":
-        statement = statement.order_by(col(order_column).asc())
-    else:
-        statement = statement.order_by(col(order_column).desc())
+    total = session.exec(count_statement, params=params).one()
     
     # Apply pagination
-    statement = statement.offset(skip).limit(limit)
+    params.update(skip=skip, limit=limit)
+    
+    if normalized:
+        rows = fetch_rows(session, statement, params)
+        return sparse_response(NormalizedPaginatedResponse[dict](
+            items=rows,
+            included=side_load(session, rows, TASK_RELATIONS, fieldset),
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=(skip + limit) < total
+        ))
+    
+    if fieldset is not None:
+        return sparse_response(PaginatedResponse[dict](
+            items=sparse_task_items(fetch_rows(session, statement, params), session, fieldset),
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=(skip + limit) < total
+        ))
     
     # Execute query
-    tasks = session.exec(statement).all()
+    tasks = session.exec(statement, params=params).all()
     
     return PaginatedResponse(
         items=[enrich_task_response(task, session) for task in tasks],
@@ -99,18 +186,36 @@ async def list_tasks(
     )
 
 @router.get("/project/{project_id}", response_model=List[TaskResponse])
-def list_tasks_by_project(project_id: int, session: Session = Depends(get_session)) -> List[TaskResponse]:
+def list_tasks_by_project(
+    project_id: int,
+    session: Session = Depends(get_session),
+    fieldset: Optional[Set[str]] = Depends(task_fields),
+    normalized: bool = Depends(normalized_shape),
+    current_user: User = Depends(get_current_active_user)
+) -> List[TaskResponse]:
     """Get all tasks for a specific project"""
     # Validate project exists
     project = session.get(Project, project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=404, detail="Project not found")
+    require_project_access(session, current_user, project_id, "read")
     
     # Auto-update overdue tasks before returning
     update_overdue_tasks(session)
     
-    statement = select(Task).where(Task.project_id == project_id).order_by(Task.created_at.desc())
-    tasks = session.exec(statement).all()
+    params = {"project_id": project_id}
+    if normalized:
+        statement = project_tasks_statement(column_names(normalized_task_columns(fieldset)))
+        rows = fetch_rows(session, statement, params)
+        return sparse_response(NormalizedListResponse[dict](
+            items=rows, included=side_load(session, rows, TASK_RELATIONS, fieldset)
+        ))
+    
+    if fieldset is not None:
+        statement = project_tasks_statement(column_names(task_columns(fieldset)))
+        return sparse_response(sparse_task_items(fetch_rows(session, statement, params), session, fieldset))
+    
+    tasks = session.exec(project_tasks_statement(None), params=params).all()
     return [enrich_task_response(task, session) for task in tasks]
 
 @router.post("/", response_model=TaskResponse, status_code=201)
@@ -126,10 +231,12 @@ async def create_task(
     
     # Validate that the project exists
     project = session.get(Project, payload.project_id)
-    if not project:
+    if not project or project.deleting:
         raise HTTPException(status_code=400, detail="project_id does not exist")
+    require_project_access(session, current_user, payload.project_id, "write")
     
     # Validate that assigned_to user exists (if provided)
+    user = None
     if payload.assigned_to:
         user = session.get(User, payload.assigned_to)
         if not user:
@@ -138,64 +245,289 @@ async def create_task(
     # Create new task (no creator field in new schema)
     task = Task(**payload.model_dump())
     session.add(task)
+    session.flush()
+    apply_task_changes(session, added=[task_key(task)])
+    record_transitions(session, [(task.id, task.project_id, None, task.status, task.created_at)])
     session.commit()
-    session.refresh(task)
-    return enrich_task_response(task, session)
+    invalidate_calendar([task.project_id])
+    return enrich_task_response(task, session, project=project, assigned_user=user)
+
+@router.post("/bulk", response_model=BulkResponse)
+async def create_tasks_bulk(
+    request: Request,
+    payload: List[TaskCreate],
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> BulkResponse:
+    """Create many tasks in a single transaction"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    check_bulk_size(len(payload))
+    
+    # Validate foreign keys for the whole batch (one IN query per table)
+    projects = existing_ids(session, Project, (item.project_id for item in payload), Project.deleting == False)
+    users = existing_ids(session, User, (item.assigned_to for item in payload))
+    writable = set(accessible_projects(session, current_user, "write"))
+    
+    results: List[Optional[BulkItemResult]] = [None] * len(payload)
+    rows, row_indexes = [], []
+    for index, item in enumerate(payload):
+        if item.project_id not in projects:
+            results[index] = BulkItemResult(index=index, success=False, error="project_id does not exist")
+        elif item.project_id not in writable:
+            results[index] = BulkItemResult(index=index, success=False, error=FORBIDDEN_DETAIL)
+        elif item.assigned_to and item.assigned_to not in users:
+            results[index] = BulkItemResult(index=index, success=False, error="assigned_to user does not exist")
+        else:
+            rows.append(Task(**item.model_dump()).model_dump(exclude={"id"}))
+            row_indexes.append(index)
+    
+    # Insert valid rows with executemany
+    new_ids = insert_rows(session, Task, rows)
+    apply_task_changes(session, added=[(row["project_id"], row["assigned_to"], row["status"]) for row in rows])
+    record_transitions(session, [
+        (task_id, row["project_id"], None, row["status"], row["created_at"]) for task_id, row in zip(new_ids, rows)
+    ])
+    session.commit()
+    invalidate_calendar(row["project_id"] for row in rows)
+    
+    for index, task_id in zip(row_indexes, new_ids):
+        results[index] = BulkItemResult(index=index, id=task_id, success=True)
+    return bulk_response(results)
+
+@router.patch("/bulk", response_model=BulkResponse)
+async def update_tasks_bulk(
+    request: Request,
+    payload: List[TaskBulkUpdateItem],
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> BulkResponse:
+    """Partially update many tasks in a single transaction"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    check_bulk_size(len(payload))
+    
+    # Load current stats keys and validate foreign keys for the whole batch (one IN query per table)
+    tasks, created = {}, {}
+    for task_id, project_id, assigned_to, status, created_at in session.exec(
+        select(Task.id, Task.project_id, Task.assigned_to, Task.status, Task.created_at).where(
+            Task.id.in_({item.id for item in payload})
+        )
+    ).all():
+        tasks[task_id] = (project_id, assigned_to, status)
+        created[task_id] = created_at
+    users = existing_ids(session, User, (item.assigned_to for item in payload))
+    writable = set(accessible_projects(session, current_user, "write"))
+    
+    results: List[BulkItemResult] = []
+    rows, removed, added, transitions = [], [], [], []
+    seen = set()
+    for index, item in enumerate(payload):
+        error = None
+        if item.id not in tasks:
+            error = "Task not found"
+        elif tasks[item.id][0] not in writable:
+            error = FORBIDDEN_DETAIL
+        elif item.id in seen:
+            error = "Duplicate task id in batch"
+        elif item.assigned_to and item.assigned_to not in users:
+            error = "assigned_to user does not exist"
+        
+        if error:
+            results.append(BulkItemResult(index=index, id=item.id, success=False, error=error))
+            continue
+        
+        seen.add(item.id)
+        update_data = item.model_dump(exclude_unset=True)
+        if len(update_data) > 1:
+            rows.append(update_data)
+            project_id, assigned_to, status = tasks[item.id]
+            new_key = (project_id, update_data.get("assigned_to", assigned_to), update_data.get("status", status))
+            if new_key != tasks[item.id]:
+                removed.append(tasks[item.id])
+                added.append(new_key)
+            transitions.append((item.id, project_id, status, new_key[2], created[item.id]))
+        results.append(BulkItemResult(index=index, id=item.id, success=True))
+    
+    # Update by primary key with executemany
+    update_rows(session, Task, rows)
+    apply_task_changes(session, removed, added)
+    record_transitions(session, transitions)
+    session.commit()
+    invalidate_calendar(tasks[row["id"]][0] for row in rows)
+    return bulk_response(results)
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def delete_tasks_bulk(
+    request: Request,
+    payload: TaskBulkDelete,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> BulkResponse:
+    """Delete many tasks in a single statement"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    check_bulk_size(len(payload.ids))
+    
+    found = {
+        task_id: (project_id, assigned_to, status)
+        for task_id, project_id, assigned_to, status in session.exec(
+            select(Task.id, Task.project_id, Task.assigned_to, Task.status).where(Task.id.in_(set(payload.ids)))
+        ).all()
+    }
+    writable = set(accessible_projects(session, current_user, "write"))
+    tasks = {task_id: key for task_id, key in found.items() if key[0] in writable}
+    if tasks:
+        session.exec(delete(Task).where(Task.id.in_(tasks)))
+        apply_task_changes(session, removed=tasks.values())
+        record_transitions(session, [
+            (task_id, project_id, status, None, None) for task_id, (project_id, _, status) in tasks.items()
+        ])
+        session.commit()
+        invalidate_calendar(project_id for project_id, _, _ in tasks.values())
+    
+    def error(task_id: int) -> Optional[str]:
+        if task_id not in found:
+            return "Task not found"
+        return None if task_id in tasks else FORBIDDEN_DETAIL
+    
+    results = [
+        BulkItemResult(index=index, id=task_id, success=task_id in tasks, error=error(task_id))
+        for index, task_id in enumerate(payload.ids)
+    ]
+    return bulk_response(results)
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, session: Session = Depends(get_session)) -> TaskResponse:
+def get_task(
+    task_id: int,
+    session: Session = Depends(get_read_session),
+    fieldset: Optional[Set[str]] = Depends(task_fields),
+    current_user: User = Depends(get_current_active_user)
+) -> TaskResponse:
     """Get task by ID"""
+    if fieldset is not None:
+        # project_id is always read for the access check
+        statement = select(*task_columns(fieldset, "project_id")).where(
+            Task.id == task_id, Task.project_id.not_in(deleting_projects())
+        )
+        rows = fetch_rows(session, statement)
+        if not rows:
+            raise HTTPException(status_code=404, detail="Task not found")
+        require_project_access(session, current_user, rows[0]['project_id'], "read")
+        return sparse_response(sparse_task_items(rows, session, fieldset)[0])
+    
     task = session.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return enrich_task_response(task, session)
+    
+    # Tasks of a project being deleted are hidden
+    project = session.get(Project, task.project_id)
+    if not project or project.deleting:
+        raise HTTPException(status_code=404, detail="Task not found")
+    require_project_access(session, current_user, task.project_id, "read")
+    return enrich_task_response(task, session, project=project)
+
+@router.get("/{task_id}/history", response_model=List[TaskStatusHistoryResponse])
+async def get_task_history(
+    task_id: int,
+    request: Request,
+    session: Session = Depends(get_read_session),
+    current_user: User = Depends(get_current_active_user)
+) -> List[TaskStatusHistoryResponse]:
+    """Get the status transitions of a task, oldest first (kept after the task is deleted)"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    entries = session.exec(
+        select(TaskStatusHistory).where(
+            TaskStatusHistory.task_id == task_id,
+            TaskStatusHistory.project_id.not_in(deleting_projects())
+        ).order_by(TaskStatusHistory.id)
+    ).all()
+    if not entries:
+        raise HTTPException(status_code=404, detail="Task history not found")
+    require_project_access(session, current_user, entries[0].project_id, "read")
+    return [TaskStatusHistoryResponse.model_validate(entry) for entry in entries]
 
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, payload: TaskUpdate, session: Session = Depends(get_session)) -> TaskResponse:
+def update_task(
+    task_id: int,
+    payload: TaskUpdate,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> TaskResponse:
     """Update task by ID"""
     task = session.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    require_project_access(session, current_user, task.project_id, "write")
     
     # Validate assigned_to user exists (if being updated)
+    user = None
     if payload.assigned_to:
         user = session.get(User, payload.assigned_to)
         if not user:
             raise HTTPException(status_code=400, detail="assigned_to user does not exist")
     
     # Update task
+    old_key = task_key(task)
     update_data = payload.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(task, key, value)
     
     session.add(task)
+    if task_key(task) != old_key:
+        apply_task_changes(session, removed=[old_key], added=[task_key(task)])
+        record_transitions(session, [(task.id, task.project_id, old_key[2], task.status, task.created_at)])
     session.commit()
-    session.refresh(task)
-    return enrich_task_response(task, session)
+    invalidate_calendar([task.project_id])
+    return enrich_task_response(task, session, assigned_user=user)
 
 @router.delete("/{task_id}", status_code=204)
-def delete_task(task_id: int, session: Session = Depends(get_session)):
+def delete_task(
+    task_id: int,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+):
     """Delete task by ID"""
     task = session.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    require_project_access(session, current_user, task.project_id, "write")
     
+    apply_task_changes(session, removed=[task_key(task)])
+    record_transitions(session, [(task.id, task.project_id, task.status, None, None)])
     session.delete(task)
     session.commit()
+    invalidate_calendar([task.project_id])
     return None
 
 @router.get("/user/{user_id}", response_model=List[TaskResponse])
-def list_tasks_by_user(user_id: int, session: Session = Depends(get_session)) -> List[TaskResponse]:
-    """Get all tasks assigned to a specific user"""
+def list_tasks_by_user(
+    user_id: int,
+    session: Session = Depends(get_session),
+    fieldset: Optional[Set[str]] = Depends(task_fields),
+    current_user: User = Depends(get_current_active_user)
+) -> List[TaskResponse]:
+    """Get all tasks assigned to a specific user (in projects the current user can read)"""
     # Validate user exists
     user = session.get(User, user_id)
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Auto-update overdue tasks before returning
     update_overdue_tasks(session)
     
-    statement = select(Task).where(Task.assigned_to == user_id).order_by(Task.created_at.desc())
+    conditions = (
+        Task.assigned_to == user_id,
+        Task.project_id.not_in(deleting_projects()),
+        Task.project_id.in_(accessible_projects(session, current_user))
+    )
+    if fieldset is not None:
+        statement = select(*task_columns(fieldset)).where(*conditions).order_by(Task.created_at.desc())
+        return sparse_response(sparse_task_items(fetch_rows(session, statement), session, fieldset))
+    
+    statement = select(Task).where(*conditions).order_by(Task.created_at.desc())
     tasks = session.exec(statement).all()
     return [enrich_task_response(task, session) for task in tasks]
 
@@ -223,7 +555,7 @@ async def update_overdue_tasks_endpoint(
 @router.get("/overdue-count")
 async def get_overdue_count(
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: User = Depends(get_current_active_user)
 ) -> dict:
     """Get count of tasks that should be marked as overdue"""
@@ -1,34 +1,47 @@
-from fastapi import APIRouter, HTTPException, Depends, Request, Query
+from fastapi import APIRouter, HTTPException, Depends, Request, Query, BackgroundTasks
 from sqlmodel import Session, select, func, col
-from typing import List, Optional
+from typing import List, Optional, Set
+from datetime import datetime
 from ...models.user import User, UserCreate, UserUpdate, UserResponse
 from ...models.pagination import PaginatedResponse
+from ...models.deletion_job import DeletionJobResponse
 from ...core.database import get_session
+from ...core.replicas import get_read_session
 from ...core.security import hash_password
 from ...core.settings import get_settings
-from ...core.auth import get_current_active_user
+from ...core.statements import order_column_name, user_by_email_statement
+from ...core.auth import get_current_active_user, get_admin_user, is_admin
 from ...core.rate_limit import rate_limit_api
+from ...core.deletion import start_deletion, run_deletion_job
+from ...core.revocation import revoke_all_tokens
+from ...core.fieldsets import sparse_fields, columns_for, fetch_rows, sparse_response
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+user_fields = sparse_fields(UserResponse)
+
 @router.get("/", response_model=PaginatedResponse[UserResponse])
 async def list_users(
     request: Request,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     skip: int = Query(default=0, ge=0, description="Number of records to skip"),
     limit: int = Query(default=10, ge=1, le=100, description="Number of records to return"),
     order_by: str = Query(default="updated_at", description="Field to order by"),
     order_dir: str = Query(default="desc", description="Order direction (asc or desc)"),
     search: Optional[str] = Query(default=None, description="Search by name or email"),
     active: Optional[bool] = Query(default=None, description="Filter by active status"),
+    fieldset: Optional[Set[str]] = Depends(user_fields),
     current_user: User = Depends(get_current_active_user)
 ) -> PaginatedResponse[UserResponse]:
     """Get paginated list of users with filtering and ordering"""
     settings = get_settings()
     await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
     
-    # Base query
-    statement = select(User)
+    # Base query (only the requested columns when a fieldset is given)
+    statement = select(User) if fieldset is None else select(*columns_for(User, fieldset))
+    
+    # Hide users being deleted
+    statement = statement.where(User.deleting == False)
     
     # Apply filters
     if search:
@@ -45,7 +58,7 @@ async def list_users(
     total = session.exec(count_statement).one()
     
     # Apply ordering
-    order_column = getattr(User, order_by, User.updated_at)
+    order_column = getattr(User, order_column_name(User, order_by))
     if order_dir.lower() == "asc":
         statement = statement.order_by(col(order_column).asc())
     else:
@@ -54,6 +67,15 @@ async def list_users(
     # Apply pagination
     statement = statement.offset(skip).limit(limit)
     
+    if fieldset is not None:
+        return sparse_response(PaginatedResponse[dict](
+            items=fetch_rows(session, statement),
+            total=total,
+            skip=skip,
+            limit=limit,
+            has_more=(skip + limit) < total
+        ))
+    
     # Execute query
     users = session.exec(statement).all()
     
@@ -72,8 +94,7 @@ async def list_users(
 def create_user(payload: UserCreate, session: Session = Depends(get_session)) -> UserResponse:
     """Create a new user"""
     # Check if email already exists
-    statement = select(User).where(User.email == payload.email)
-    existing_user = session.exec(statement).first()
+    existing_user = session.exec(user_by_email_statement(), params={"email": payload.email}).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already exists")
     
@@ -87,16 +108,25 @@ def create_user(payload: UserCreate, session: Session = Depends(get_session)) ->
     user = User(**user_data)
     session.add(user)
     session.commit()
-    session.refresh(user)
     
     # Create response without role information
     return UserResponse.model_validate(user)
 
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(user_id: int, session: Session = Depends(get_session)) -> UserResponse:
+def get_user(
+    user_id: int,
+    session: Session = Depends(get_session),
+    fieldset: Optional[Set[str]] = Depends(user_fields)
+) -> UserResponse:
     """Get user by ID"""
+    if fieldset is not None:
+        rows = fetch_rows(session, select(*columns_for(User, fieldset)).where(User.id == user_id, User.deleting == False))
+        if not rows:
+            raise HTTPException(status_code=404, detail="User not found")
+        return sparse_response(rows[0])
+    
     user = session.get(User, user_id)
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Return user without role information
@@ -106,7 +136,7 @@ def get_user(user_id: int, session: Session = Depends(get_session)) -> UserRespo
 def update_user(user_id: int, payload: UserUpdate, session: Session = Depends(get_session)) -> UserResponse:
     """Update user by ID"""
     user = session.get(User, user_id)
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=404, detail="User not found")
     
     # Check if email already exists (if being updated)
@@ -122,21 +152,55 @@ def update_user(user_id: int, payload: UserUpdate, session: Session = Depends(ge
     update_data = payload.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(user, key, value)
+    user.updated_at = datetime.utcnow()
     
     session.add(user)
     session.commit()
-    session.refresh(user)
     
     # Return user without role information
     return UserResponse.model_validate(user)
 
-@router.delete("/{user_id}", status_code=204)
-def delete_user(user_id: int, session: Session = Depends(get_session)):
-    """Delete user by ID"""
+@router.post("/{user_id}/revoke-tokens", status_code=204)
+async def revoke_user_tokens(
+    user_id: int,
+    request: Request,
+    session: Session = Depends(get_session),
+    admin_user: User = Depends(get_admin_user)
+):
+    """Revoke every access and refresh token of a user (administrators only)"""
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(admin_user.id))
+    
     user = session.get(User, user_id)
-    if not user:
+    if not user or user.deleting:
         raise HTTPException(status_code=404, detail="User not found")
     
-    session.delete(user)
-    session.commit()
+    revoke_all_tokens(session, user)
     return None
+
+@router.delete("/{user_id}", response_model=DeletionJobResponse, status_code=202)
+async def delete_user(
+    user_id: int,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_active_user)
+) -> DeletionJobResponse:
+    """
+    Delete user by ID (the user themselves or an administrator).
+    The user is hidden immediately; memberships, created projects and task
+    assignments are cleaned up in batches by a background job.
+    """
+    settings = get_settings()
+    await rate_limit_api(request, settings.rate_limit_api_per_min, str(current_user.id))
+    
+    if current_user.id != user_id and not is_admin(current_user):
+        raise HTTPException(status_code=403, detail="Users can only delete their own account")
+    
+    user = session.get(User, user_id)
+    if not user or user.deleting:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    job = start_deletion(session, "user", user, current_user.id)
+    background_tasks.add_task(run_deletion_job, job.id)
+    return DeletionJobResponse.model_validate(job)
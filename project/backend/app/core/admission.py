@@ -0,0 +1,215 @@
+"""
+Admission Control Module
+========================
+Concurrency limit and load shedding in front of the DB-bound routes.
+
+At most ``admission_max_concurrency`` requests run at once (by default the
+size of SQLAlchemy's connection pool, 5 + 10 overflow); the rest wait in a
+bounded queue per priority class. A waiting request is served before its
+deadline or rejected with ``503`` and ``Retry-After``, and it is rejected
+up front when the queue is full or the estimated wait (queue ahead x
+average service time) already exceeds the deadline, so an overloaded
+database does not make every client wait until it times out.
+
+Priority classes:
+
+- exempt: health checks, docs and CORS preflights bypass the limiter.
+- high: cheap reads served from in-memory indexes and summary tables
+  (reports, calendar, stats, current user); queued ahead of normal ones.
+- normal: everything else.
+
+Limits are per worker process. Counters are served at /health/admission.
+"""
+
+import asyncio
+import math
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .settings import get_settings
+
+HIGH = "high"
+NORMAL = "normal"
+PRIORITIES = (HIGH, NORMAL)
+
+EXEMPT_PATHS = re.compile(r"^/(health(/.*)?|api/(docs|redoc|openapi\.json)(/.*)?)?$")
+HIGH_PRIORITY_ROUTES = (
+    ("GET", re.compile(r"^/api/reports/")),
+    ("GET", re.compile(r"^/api/projects/\d+/(calendar|stats)$")),
+    ("GET", re.compile(r"^/api/auth/me$")),
+    ("GET", re.compile(r"^/api/deletion-jobs/\d+$")),
+    ("POST", re.compile(r"^/api/auth/refresh$")),
+)
+
+# Smoothing of the average service time used to estimate queue waits
+SERVICE_TIME_ALPHA = 0.1
+INITIAL_SERVICE_TIME = 0.05
+OVERLOADED_DETAIL = "Server is overloaded, please retry later"
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """Priority class of a request, or None if it bypasses admission control"""
+    if method == "OPTIONS" or EXEMPT_PATHS.match(path):
+        return None
+    for route_method, pattern in HIGH_PRIORITY_ROUTES:
+        if method == route_method and pattern.match(path):
+            return HIGH
+    return NORMAL
+
+
+class AdmissionController:
+    """Concurrency limiter with bounded priority queues (used from the event loop only)"""
+
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.waiters: Dict[str, Deque[asyncio.Future]] = {priority: deque() for priority in PRIORITIES}
+        self.service_time = INITIAL_SERVICE_TIME
+        self.admitted = {priority: 0 for priority in PRIORITIES}
+        self.shed = {"queue_full": 0, "deadline": 0, "timeout": 0}
+        self.max_queue_depth = 0
+
+    def queued(self, priority: Optional[str] = None) -> int:
+        if priority is not None:
+            return len(self.waiters[priority])
+        return sum(len(waiters) for waiters in self.waiters.values())
+
+    def _ahead(self, priority: str) -> int:
+        """Waiters that will be served before a new request of this class"""
+        return self.queued(HIGH) if priority == HIGH else self.queued()
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain"""
+        return max(math.ceil(self.queued() / max(self.max_concurrency, 1) * self.service_time), 1)
+
+    async def acquire(self, priority: str) -> Optional[str]:
+        """
+        Wait for a slot.
+
+        Returns:
+            None once admitted (call ``release``), or the reason the request was shed
+        """
+        ahead = self._ahead(priority)
+        if self.in_flight < self.max_concurrency and ahead == 0:
+            self.in_flight += 1
+            self.admitted[priority] += 1
+            return None
+        if len(self.waiters[priority]) >= self.max_queue:
+            self.shed["queue_full"] += 1
+            return "queue_full"
+        if (ahead + 1) / max(self.max_concurrency, 1) * self.service_time > self.queue_timeout:
+            self.shed["deadline"] += 1
+            return "deadline"
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters[priority].append(waiter)
+        self.max_queue_depth = max(self.max_queue_depth, self.queued())
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():  # handed a slot right at the deadline: keep it
+                self.admitted[priority] += 1
+                return None
+            self.waiters[priority].remove(waiter)
+            waiter.cancel()
+            self.shed["timeout"] += 1
+            return "timeout"
+        except asyncio.CancelledError:
+            # Client went away while queued: give back a slot it may have been handed
+            if waiter.done() and not waiter.cancelled():
+                self.release(None)
+            else:
+                self.waiters[priority].remove(waiter)
+                waiter.cancel()
+            raise
+        self.admitted[priority] += 1
+        return None
+
+    def release(self, started: Optional[float]) -> None:
+        """Free a slot, handing it to the next waiter by priority"""
+        if started is not None:
+            elapsed = time.monotonic() - started
+            self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+        for priority in PRIORITIES:
+            waiters = self.waiters[priority]
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)  # the slot passes to the waiter, in_flight unchanged
+                    return
+        self.in_flight -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_ms": round(self.queue_timeout * 1000),
+            "in_flight": self.in_flight,
+            "queued": {priority: self.queued(priority) for priority in PRIORITIES},
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": dict(self.admitted),
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values()),
+            "avg_service_ms": round(self.service_time * 1000, 2),
+        }
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Controller of this worker, created from settings on first use"""
+    global _controller
+    if _controller is None:
+        settings = get_settings()
+        _controller = AdmissionController(
+            settings.admission_max_concurrency,
+            settings.admission_max_queue,
+            settings.admission_queue_timeout_ms / 1000
+        )
+    return _controller
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying admission control to every HTTP request (0 concurrency disables it)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or get_settings().admission_max_concurrency <= 0:
+            await self.app(scope, receive, send)
+            return
+        priority = classify(scope["method"], scope["path"])
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        controller = get_admission_controller()
+        shed = await controller.acquire(priority)
+        if shed is not None:
+            # Same body shape as the HTTPException handler
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "error": "HTTPException",
+                    "detail": f"{status.HTTP_503_SERVICE_UNAVAILABLE}: {OVERLOADED_DETAIL}",
+                    "path": str(Request(scope).url)
+                },
+                headers={"Retry-After": str(controller.retry_after())}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(started)
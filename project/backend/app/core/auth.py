@@ -1,23 +1,29 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session, select
-from typing import Optional
+from typing import Any, Optional
 from .security import decode_token
 from .database import get_session
+from .revocation import is_token_revoked
+from .settings import get_settings
 from ..models.user import User
 
 security = HTTPBearer()
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
-) -> User:
+async def get_token_payload(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> dict[str, Any]:
     """
-    Dependency to get the current authenticated user from JWT token.
-    Raises 401 if token is invalid or user not found.
+    Dependency to get the verified claims of the bearer token.
+    Raises 401 if the token is invalid or expired.
     """
-    token = credentials.credentials
-    payload = decode_token(token)
+    # Sub-requests of a batch carry the claims the batch already verified
+    payload = getattr(request.state, "auth_payload", None)
+    if payload is not None:
+        return payload
+    
+    payload = decode_token(credentials.credentials)
     
     if payload is None:
         raise HTTPException(
@@ -25,6 +31,21 @@ async def get_current_user(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return payload
+
+async def get_current_user(
+    request: Request,
+    payload: dict[str, Any] = Depends(get_token_payload),
+    session: Session = Depends(get_session)
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+    Raises 401 if token is invalid, revoked or user not found.
+    """
+    # Sub-requests of a batch run as the user the batch already authenticated
+    batch_user = getattr(request.state, "auth_user", None)
+    if batch_user is not None:
+        return batch_user
     
     user_id: Optional[str] = payload.get("sub")
     if user_id is None:
@@ -44,19 +65,29 @@ async def get_current_user(
         )
     
     user = session.get(User, user_id_int)
-    if user is None:
+    if user is None or user.deleting:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Answered from memory unless the token hits the revocation Bloom filter
+    if is_token_revoked(session, payload, user):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
     if not user.active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
     
+    # Read by ReplicaStickinessMiddleware once the request is done
+    request.state.auth_user_id = user.id
     return user
 
 async def get_current_active_user(
@@ -67,3 +98,20 @@ async def get_current_active_user(
     """
     return current_user
 
+def is_admin(user: User) -> bool:
+    """Whether the user is an administrator (email listed in ADMIN_EMAILS)"""
+    return user.email.lower() in get_settings().admin_emails
+
+async def get_admin_user(
+    current_user: User = Depends(get_current_active_user)
+) -> User:
+    """
+    Dependency to require an administrator (email listed in ADMIN_EMAILS).
+    Raises 403 for other users.
+    """
+    if not is_admin(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Administrator privileges required",
+        )
+    return current_user
@@ -0,0 +1,197 @@
+"""
+Batch Requests Module
+=====================
+Runs the sub-requests of ``POST /api/batch`` in-process, so a screen that
+needs several endpoints costs one HTTP roundtrip.
+
+- Sub-requests go straight to the API router (with the app's exception
+  handlers), not through the middleware stack: the batch is admitted,
+  rate limited per sub-request by the endpoints themselves, and compressed
+  as a whole.
+- The batch authenticates once. Sub-requests reuse its verified token
+  claims and user instead of decoding the JWT and loading the user again.
+- Consecutive GET sub-requests run concurrently (at most
+  ``batch_max_concurrency`` at a time), each with its own session since a
+  SQLAlchemy session cannot be shared between threads. Any other method is
+  a barrier: it runs alone, after everything before it and before
+  everything after it, so reads listed after a write see it.
+- Sub-requests that run alone share the batch's DB session, which keeps
+  its connection between sub-requests that do not commit.
+- Authentication endpoints and nested batches are rejected: they would
+  change or re-enter the principal the batch runs as.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+from fastapi import HTTPException, Request
+from sqlmodel import Session
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp, Message
+from ..models.batch import BatchRequestItem, BatchResponseItem
+from ..models.user import User
+from .database import shared_session
+from .replicas import SAFE_METHODS, replicas, sticky
+from .settings import get_settings
+
+BATCH_PATH = "/api/batch"
+# Sub-requests that would change the batch's own credentials
+FORBIDDEN_PREFIXES = ("/api/auth/", BATCH_PATH)
+# Sub-response headers that describe the transport, not the result
+HIDDEN_HEADERS = frozenset({"content-length", "content-type"})
+
+
+def check_batch(items: List[BatchRequestItem]) -> None:
+    """
+    Validate the size of a batch and the target of every sub-request.
+
+    Raises:
+        HTTPException: 400 for empty or oversized batches and disallowed URLs
+    """
+    max_requests = get_settings().batch_max_requests
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one request")
+    if len(items) > max_requests:
+        raise HTTPException(status_code=400, detail=f"Batch cannot contain more than {max_requests} requests")
+    for index, item in enumerate(items):
+        path = urlsplit(item.url).path
+        if not path.startswith("/api/") or path.startswith(FORBIDDEN_PREFIXES):
+            raise HTTPException(
+                status_code=400,
+                detail=f"requests[{index}].url must be an /api/ path outside /api/auth and /api/batch"
+            )
+
+
+def plan(items: List[BatchRequestItem]) -> List[List[int]]:
+    """Group sub-request indexes into waves: runs of consecutive GETs, and every other request alone"""
+    waves: List[List[int]] = []
+    for index, item in enumerate(items):
+        if item.method == "GET" and waves and items[waves[-1][0]].method == "GET":
+            waves[-1].append(index)
+        else:
+            waves.append([index])
+    return waves
+
+
+def _router(request: Request) -> ASGIApp:
+    """The app's router wrapped with its exception handlers (built once per app)"""
+    app = request.app
+    target = getattr(app.state, "batch_router", None)
+    if target is None:
+        target = ExceptionMiddleware(app.router, handlers=app.exception_handlers)
+        app.state.batch_router = target
+    return target
+
+
+def _decode_body(content_type: str, body: bytes) -> Any:
+    if not body:
+        return None
+    if content_type.startswith("application/json"):
+        return json.loads(body)
+    return body.decode("utf-8", errors="replace")
+
+
+class BatchRunner:
+    """Executes the sub-requests of one batch as its authenticated user"""
+
+    def __init__(self, request: Request, payload: Dict[str, Any], user: User, session: Session):
+        self.target = _router(request)
+        self.parent = request.scope
+        self.authorization = request.headers.get("authorization", "").encode("latin-1")
+        self.state = {"auth_payload": payload, "auth_user": user}
+        self.user_id = str(user.id)
+        self.session = session
+        # Detached, so concurrent sub-requests in other threads and rollbacks of the
+        # shared session never touch it (its attributes are already loaded)
+        if user in session:
+            session.expunge(user)
+        self.limit = asyncio.Semaphore(max(get_settings().batch_max_concurrency, 1))
+
+    async def dispatch(self, item: BatchRequestItem, session: Optional[Session]) -> BatchResponseItem:
+        """Run one sub-request through the router and capture its response"""
+        url = urlsplit(item.url)
+        body = b"" if item.body is None else json.dumps(item.body).encode("utf-8")
+        scope = {
+            "type": "http",
+            "asgi": self.parent.get("asgi", {"version": "3.0"}),
+            "http_version": self.parent.get("http_version", "1.1"),
+            "method": item.method,
+            "scheme": self.parent.get("scheme", "http"),
+            "server": self.parent.get("server"),
+            "client": self.parent.get("client"),
+            "root_path": self.parent.get("root_path", ""),
+            "path": url.path,
+            "raw_path": url.path.encode("utf-8"),
+            "query_string": url.query.encode("utf-8"),
+            "headers": [
+                (b"authorization", self.authorization),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+            ],
+            "app": self.parent.get("app"),
+            "state": dict(self.state),
+        }
+        received = False
+
+        async def receive() -> Message:
+            nonlocal received
+            if received:
+                return {"type": "http.disconnect"}
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        status, headers, chunks = 500, {}, []
+
+        async def send(message: Message) -> None:
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = {name.decode("latin-1"): value.decode("latin-1") for name, value in message["headers"]}
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        # Shared session for sub-requests that run alone, a session of their own otherwise
+        token = shared_session.set(session)
+        try:
+            await self.target(scope, receive, send)
+        except Exception as e:
+            return BatchResponseItem(id=item.id, status=500, body={"error": type(e).__name__, "detail": str(e)})
+        finally:
+            shared_session.reset(token)
+        return BatchResponseItem(
+            id=item.id,
+            status=status,
+            headers={name: value for name, value in headers.items() if name not in HIDDEN_HEADERS},
+            body=_decode_body(headers.get("content-type", ""), b"".join(chunks))
+        )
+
+    async def _concurrent(self, item: BatchRequestItem) -> BatchResponseItem:
+        async with self.limit:
+            return await self.dispatch(item, None)
+
+    async def _alone(self, item: BatchRequestItem) -> BatchResponseItem:
+        write = item.method not in SAFE_METHODS and bool(replicas.engines)
+        seconds = get_settings().replica_sticky_seconds
+        if write:
+            sticky.mark(self.user_id, seconds)  # read-your-writes, as ReplicaStickinessMiddleware does
+        try:
+            return await self.dispatch(item, self.session)
+        finally:
+            if write:
+                sticky.mark(self.user_id, seconds)
+            # Drop what a failed write left pending so the next sub-request does not flush it
+            if self.session.new or self.session.dirty or self.session.deleted:
+                self.session.rollback()
+
+    async def run(self, items: List[BatchRequestItem]) -> List[BatchResponseItem]:
+        """Run every wave in order and return the responses in request order"""
+        responses: List[Optional[BatchResponseItem]] = [None] * len(items)
+        for wave in plan(items):
+            if len(wave) == 1:
+                responses[wave[0]] = await self._alone(items[wave[0]])
+                continue
+            results = await asyncio.gather(*(self._concurrent(items[index]) for index in wave))
+            for index, result in zip(wave, results):
+                responses[index] = result
+        return responses
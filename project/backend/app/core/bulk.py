@@ -0,0 +1,124 @@
+"""
+Bulk Operations Module
+======================
+Helpers for batched reads and writes that touch many rows with a fixed
+number of statements.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import mysql, sqlite
+from sqlmodel import Session, SQLModel, select, insert, update
+from typing import Any, Iterable, List, Sequence, Set
+from ..models.bulk import BulkItemResult, BulkResponse
+from .settings import get_settings
+
+
+def check_bulk_size(count: int) -> None:
+    """Reject empty batches and batches larger than the configured maximum"""
+    max_items = get_settings().bulk_max_items
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+    if count > max_items:
+        raise HTTPException(status_code=400, detail=f"Batch cannot contain more than {max_items} items")
+
+
+def bulk_response(results: List[BulkItemResult]) -> BulkResponse:
+    """Summarize per-item results"""
+    succeeded = sum(1 for result in results if result.success)
+    return BulkResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+
+def existing_ids(session: Session, model: type[SQLModel], ids: Iterable[int], *conditions) -> Set[int]:
+    """
+    Get which of the given primary keys exist, using a single IN query.
+
+    Args:
+        session: Database session
+        model: Table model to check
+        ids: Primary keys to look up
+        conditions: Extra filters the rows must match
+
+    Returns:
+        Set of primary keys that exist
+    """
+    unique_ids = {i for i in ids if i is not None}
+    if not unique_ids:
+        return set()
+    statement = select(model.id).where(model.id.in_(unique_ids), *conditions)
+    return set(session.exec(statement).all())
+
+
+def insert_rows(session: Session, model: type[SQLModel], rows: List[dict[str, Any]]) -> List[int]:
+    """
+    Insert many rows with executemany and return their new primary keys in order.
+
+    Uses a batched INSERT ... RETURNING when the dialect can return keys in
+    parameter order. Otherwise (e.g. MySQL, which has no RETURNING) the ORM
+    flush issues one INSERT per row, still inside the caller's transaction
+    and without per-row commits.
+
+    Args:
+        session: Database session (not committed here)
+        model: Table model to insert into
+        rows: Column values for each row
+
+    Returns:
+        List of generated primary keys, one per row
+    """
+    if not rows:
+        return []
+
+    dialect = session.get_bind().dialect
+    if dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+        return list(session.scalars(statement, rows).all())
+
+    objects = [model(**row) for row in rows]
+    session.add_all(objects)
+    session.flush()
+    return [obj.id for obj in objects]
+
+
+def update_rows(session: Session, model: type[SQLModel], rows: List[dict[str, Any]]) -> None:
+    """
+    Update many rows by primary key with executemany.
+    Each dict must contain ``id``; rows with the same keys are batched together.
+    """
+    if rows:
+        session.execute(update(model), rows)
+
+
+def upsert_increments(
+    session: Session,
+    model: type[SQLModel],
+    rows: List[dict[str, Any]],
+    key_columns: Sequence[str],
+    increment_columns: Sequence[str]
+) -> None:
+    """
+    Add counters to rows identified by key_columns, creating missing rows,
+    with one atomic executemany upsert (not committed here).
+
+    Args:
+        session: Database session
+        model: Table model whose primary key is key_columns
+        rows: Key and increment values for each row
+        key_columns: Primary key columns
+        increment_columns: Columns to add to existing rows
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    if session.get_bind().dialect.name == "mysql":
+        statement = mysql.insert(table)
+        statement = statement.on_duplicate_key_update(
+            {column: table.c[column] + statement.inserted[column] for column in increment_columns}
+        )
+    else:
+        statement = sqlite.insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c[column] for column in key_columns],
+            set_={column: table.c[column] + statement.excluded[column] for column in increment_columns}
+        )
+    session.execute(statement, rows)
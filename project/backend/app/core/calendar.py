@@ -0,0 +1,160 @@
+"""
+Task Calendar Module
+====================
+Range queries over task due dates, bucketed per day for calendar views.
+
+A range is read with one query on the ``(project_id, due_date)`` index.
+Optionally, the dated tasks of the most requested projects are kept in an
+in-memory index sorted by ``(due_date, id)`` that answers any range with
+two bisections. Task writes in this process invalidate the affected
+projects; entries also expire after ``calendar_index_ttl_seconds`` so
+writes from other workers show up within that window.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import date, datetime, time as day_start, timedelta
+from typing import Iterable, List, Optional, Tuple
+from sqlmodel import Session, select
+from ..models.task import Task
+from ..models.calendar import CalendarDay, CalendarTask, ProjectCalendarResponse
+from .settings import get_settings
+
+# Longest range a single calendar request may cover
+MAX_CALENDAR_DAYS = 92
+
+# (due_date, id, title, status, assigned_to)
+CalendarRow = Tuple[datetime, int, str, str, Optional[int]]
+
+CALENDAR_COLUMNS = (Task.due_date, Task.id, Task.title, Task.status, Task.assigned_to)
+
+
+class DueDateIndex:
+    """Dated tasks of one project sorted by (due_date, id)"""
+
+    def __init__(self, rows: List[CalendarRow]):
+        self.rows = rows
+        self.keys = [(row[0], row[1]) for row in rows]
+
+    def range(self, start: datetime, end: datetime) -> List[CalendarRow]:
+        """Rows with start <= due_date < end"""
+        low = bisect_left(self.keys, (start, 0))
+        high = bisect_left(self.keys, (end, 0), low)
+        return self.rows[low:high]
+
+
+class CalendarIndexCache:
+    """
+    LRU of per-project due date indexes; None marks projects too large to index.
+    Both kinds of entry expire after the TTL, so a project that shrinks gets indexed again.
+    """
+
+    def __init__(self):
+        self.entries: "OrderedDict[int, Tuple[float, Optional[DueDateIndex]]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, project_id: int, ttl: int) -> Tuple[bool, Optional[DueDateIndex]]:
+        """Return (found, index) for a fresh entry"""
+        with self.lock:
+            if project_id not in self.entries:
+                return False, None
+            built_at, index = self.entries[project_id]
+            if time.monotonic() - built_at > ttl:
+                del self.entries[project_id]
+                return False, None
+            self.entries.move_to_end(project_id)
+            return True, index
+
+    def put(self, project_id: int, index: Optional[DueDateIndex], capacity: int) -> None:
+        with self.lock:
+            self.entries[project_id] = (time.monotonic(), index)
+            self.entries.move_to_end(project_id)
+            while len(self.entries) > capacity:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, project_ids: Iterable[int]) -> None:
+        with self.lock:
+            for project_id in project_ids:
+                self.entries.pop(project_id, None)
+
+
+calendar_index = CalendarIndexCache()
+
+
+def invalidate_calendar(project_ids: Iterable[int]) -> None:
+    """Drop cached indexes of projects whose tasks changed (call after commit)"""
+    if get_settings().calendar_index_projects > 0:
+        calendar_index.invalidate(set(project_ids))
+
+
+def fetch_calendar_rows(
+    session: Session,
+    project_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: Optional[int] = None
+) -> List[CalendarRow]:
+    """Read dated tasks of a project, optionally within [start, end), ordered by (due_date, id)"""
+    statement = select(*CALENDAR_COLUMNS).where(Task.project_id == project_id, Task.due_date.is_not(None))
+    if start is not None:
+        statement = statement.where(Task.due_date >= start)
+    if end is not None:
+        statement = statement.where(Task.due_date < end)
+    statement = statement.order_by(Task.due_date, Task.id)
+    if limit is not None:
+        statement = statement.limit(limit)
+    return [tuple(row) for row in session.exec(statement).all()]
+
+
+def calendar_rows(session: Session, project_id: int, start: datetime, end: datetime) -> List[CalendarRow]:
+    """
+    Get a project's tasks due in [start, end), from the in-memory index when enabled.
+
+    Args:
+        session: Database session
+        project_id: Project to read
+        start: Inclusive lower bound
+        end: Exclusive upper bound
+
+    Returns:
+        Rows ordered by (due_date, id)
+    """
+    settings = get_settings()
+    if settings.calendar_index_projects <= 0:
+        return fetch_calendar_rows(session, project_id, start, end)
+
+    found, index = calendar_index.get(project_id, settings.calendar_index_ttl_seconds)
+    if not found:
+        # Load every dated task once; projects above the limit keep using range queries
+        rows = fetch_calendar_rows(session, project_id, limit=settings.calendar_index_max_tasks + 1)
+        index = DueDateIndex(rows) if len(rows) <= settings.calendar_index_max_tasks else None
+        calendar_index.put(project_id, index, settings.calendar_index_projects)
+
+    if index is None:
+        return fetch_calendar_rows(session, project_id, start, end)
+    return index.range(start, end)
+
+
+def build_calendar(project_id: int, start: date, end: date, rows: List[CalendarRow]) -> ProjectCalendarResponse:
+    """Bucket rows per day, including empty days, for start..end (inclusive)"""
+    buckets = {start + timedelta(days=offset): [] for offset in range((end - start).days + 1)}
+    for due_date, task_id, title, status, assigned_to in rows:
+        buckets[due_date.date()].append(
+            CalendarTask(id=task_id, title=title, status=status, assigned_to=assigned_to, due_date=due_date)
+        )
+    return ProjectCalendarResponse(
+        project_id=project_id,
+        start=start,
+        end=end,
+        total=len(rows),
+        days=[CalendarDay(date=day, count=len(tasks), tasks=tasks) for day, tasks in buckets.items()]
+    )
+
+
+def project_calendar(session: Session, project_id: int, start: date, end: date) -> ProjectCalendarResponse:
+    """Build the calendar of a project between two dates (inclusive)"""
+    start_at = datetime.combine(start, day_start.min)
+    end_at = datetime.combine(end + timedelta(days=1), day_start.min)
+    return build_calendar(project_id, start, end, calendar_rows(session, project_id, start_at, end_at))
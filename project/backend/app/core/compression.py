@@ -0,0 +1,314 @@
+"""
+Response Compression Module
+===========================
+Compresses JSON and text responses with the best encoding the client
+accepts (``zstd`` and ``br`` when the ``zstandard`` / ``brotli`` packages
+are installed, ``gzip`` always).
+
+- Bodies smaller than ``compression_min_size`` are sent as they are: the
+  headers and CPU cost more than the bytes saved.
+- Responses that already carry a ``Content-Encoding`` (the task export
+  compresses its own stream) and streamed bodies pass through untouched.
+- Compressed bodies are kept in a byte-bounded LRU, keyed by the URL and
+  ETag when the response has one, or by a digest of the body otherwise,
+  so a cached entity (reports, calendar ranges, a polled board) is
+  compressed once and then served from memory on every hit. Hashing is an
+  order of magnitude cheaper than compressing.
+- Large bodies are compressed in the threadpool (zlib, brotli and zstd
+  release the GIL) instead of blocking the event loop.
+- Strong ETags are made weak on compressed responses, like nginx does: the
+  bytes differ per encoding, the representation does not.
+
+Bandwidth saved per encoding and cache hits are served at
+/health/compression (per worker process).
+"""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .settings import get_settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Media types worth compressing (images, archives and the like are already compressed)
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "application/xml", "text/")
+# Bodies at least this large are compressed in the threadpool
+THREADPOOL_MIN_SIZE = 64 * 1024
+# Larger bodies are compressed on every request instead of filling the cache
+CACHE_MAX_ENTRY_SIZE = 1024 * 1024
+
+
+def _gzip(body: bytes, level: int) -> bytes:
+    # mtime=0 keeps the output (and so the cache) deterministic
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def _brotli(body: bytes, level: int) -> bytes:
+    return brotli.compress(body, quality=level)
+
+
+def _zstd(body: bytes, level: int) -> bytes:
+    return zstandard.ZstdCompressor(level=level).compress(body)
+
+
+def available_encodings() -> Dict[str, Callable[[bytes, int], bytes]]:
+    """Encodings this process can produce, in server preference order"""
+    codecs: Dict[str, Callable[[bytes, int], bytes]] = {}
+    if zstandard is not None:
+        codecs["zstd"] = _zstd
+    if brotli is not None:
+        codecs["br"] = _brotli
+    codecs["gzip"] = _gzip
+    return codecs
+
+
+def choose_encoding(accept_encoding: str, enabled: List[str]) -> Optional[str]:
+    """
+    Pick the encoding for a request.
+
+    The client's highest q-value wins; ties go to the first one in ``enabled``
+    (server preference). ``q=0`` and encodings not listed (unless ``*`` is)
+    are excluded.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in enabled:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies bounded by their total size (used from the event loop only)"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: Tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self.entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+
+class CompressionStats:
+    """Bytes in and out per encoding, plus the responses left uncompressed"""
+
+    def __init__(self):
+        self.encodings: Dict[str, Dict[str, int]] = {}
+        self.skipped = {"too_small": 0, "not_accepted": 0, "passthrough": 0}
+
+    def record(self, encoding: str, original: int, compressed: int) -> None:
+        counters = self.encodings.setdefault(encoding, {"responses": 0, "original_bytes": 0, "compressed_bytes": 0})
+        counters["responses"] += 1
+        counters["original_bytes"] += original
+        counters["compressed_bytes"] += compressed
+
+    def snapshot(self) -> Dict[str, Any]:
+        original = sum(counters["original_bytes"] for counters in self.encodings.values())
+        compressed = sum(counters["compressed_bytes"] for counters in self.encodings.values())
+        return {
+            "encodings": {
+                encoding: {**counters, "ratio": round(counters["compressed_bytes"] / counters["original_bytes"], 4)}
+                for encoding, counters in self.encodings.items()
+            },
+            "skipped": dict(self.skipped),
+            "original_bytes": original,
+            "sent_bytes": compressed,
+            "saved_bytes": original - compressed,
+            "saved_ratio": round(1 - compressed / original, 4) if original else 0.0,
+        }
+
+
+class Compressor:
+    """Encodings, levels, cache and counters of this worker"""
+
+    def __init__(self, enabled: List[str], levels: Dict[str, int], min_size: int, cache_bytes: int):
+        codecs = available_encodings()
+        self.codecs = {encoding: codecs[encoding] for encoding in enabled if encoding in codecs}
+        self.levels = levels
+        self.min_size = min_size
+        self.cache = CompressedBodyCache(cache_bytes) if cache_bytes > 0 else None
+        self.stats = CompressionStats()
+
+    def _key(self, encoding: str, body: bytes, target: str, etag: Optional[str]) -> Tuple:
+        if etag is not None:
+            return ("etag", target, etag, encoding)
+        return ("body", hashlib.blake2b(body, digest_size=16).digest(), encoding)
+
+    async def compress(self, encoding: str, body: bytes, target: str, etag: Optional[str]) -> bytes:
+        """
+        Compressed body, from the cache when the same entity was compressed before.
+
+        Args:
+            target: Request path and query string (scopes the ETag)
+            etag: ETag of the response, if any
+        """
+        cacheable = self.cache is not None and len(body) <= CACHE_MAX_ENTRY_SIZE
+        if cacheable:
+            key = self._key(encoding, body, target, etag)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        codec, level = self.codecs[encoding], self.levels[encoding]
+        if len(body) >= THREADPOOL_MIN_SIZE:
+            compressed = await run_in_threadpool(codec, body, level)
+        else:
+            compressed = codec(body, level)
+        if cacheable:
+            self.cache.put(key, compressed)
+        return compressed
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {
+            "available": list(self.codecs),
+            "levels": {encoding: self.levels[encoding] for encoding in self.codecs},
+            "min_size": self.min_size,
+            **self.stats.snapshot(),
+        }
+        if self.cache is not None:
+            snapshot["cache"] = {
+                "entries": len(self.cache.entries),
+                "bytes": self.cache.size,
+                "max_bytes": self.cache.max_bytes,
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+            }
+        return snapshot
+
+
+_compressor: Optional[Compressor] = None
+
+
+def get_compressor() -> Compressor:
+    """Compressor of this worker, created from settings on first use"""
+    global _compressor
+    if _compressor is None:
+        settings = get_settings()
+        _compressor = Compressor(
+            settings.compression_encodings,
+            {"gzip": settings.compression_gzip_level, "br": settings.compression_brotli_level,
+             "zstd": settings.compression_zstd_level},
+            settings.compression_min_size,
+            settings.compression_cache_mb * 1024 * 1024
+        )
+    return _compressor
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete (non-streamed) responses (no encodings disables it)"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not get_settings().compression_encodings:
+            await self.app(scope, receive, send)
+            return
+        compressor = get_compressor()
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""), list(compressor.codecs))
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if "content-encoding" in headers:
+                    compressor.stats.skipped["passthrough"] += 1
+                    passthrough = True
+                    await send(message)
+                    return
+                if not is_compressible(headers.get("content-type", "")):
+                    passthrough = True
+                    await send(message)
+                    return
+                start = message  # held until the body shows whether it is streamed
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                # Streamed: sent as produced, the endpoint picks its own encoding
+                compressor.stats.skipped["passthrough"] += 1
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+            if len(body) < compressor.min_size:
+                compressor.stats.skipped["too_small"] += 1
+                await send(start)
+                await send(message)
+                return
+            if encoding is None:
+                compressor.stats.skipped["not_accepted"] += 1
+                await send(start)
+                await send(message)
+                return
+
+            etag = headers.get("etag")
+            target = f"{scope['path']}?{scope['query_string'].decode('latin-1')}"
+            compressed = await compressor.compress(encoding, body, target, etag)
+            compressor.stats.record(encoding, len(body), len(compressed))
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            if etag is not None and not etag.startswith("W/"):
+                headers["ETag"] = f"W/{etag}"
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,3 +1,5 @@
+from contextvars import ContextVar
+from typing import Optional
 from sqlmodel import SQLModel, create_engine, Session
 from .settings import get_settings
 
@@ -19,7 +21,22 @@ engine = create_engine(
     pool_recycle=300,    # Recycle connections every 5 minutes
 )
 
+# Read replicas (READ_REPLICA_URLS), used by read-only endpoints through app.core.replicas
+replica_engines = [
+    create_engine(url, echo=True, pool_pre_ping=True, pool_recycle=300)
+    for url in settings.read_replica_urls
+]
+
+# Session of a batch request, reused by the sub-requests it runs one at a time (app.core.batch)
+shared_session: ContextVar[Optional[Session]] = ContextVar("shared_session", default=None)
+
 def get_session():
     """Dependency to get database session"""
-    with Session(engine) as session:
+    shared = shared_session.get()
+    if shared is not None:
+        yield shared  # closed by the batch request that owns it
+        return
+    # Keep loaded attributes after commit so write paths can build responses
+    # without a refresh SELECT (all defaults are generated client-side)
+    with Session(engine, expire_on_commit=False) as session:
         yield session
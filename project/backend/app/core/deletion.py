@@ -0,0 +1,177 @@
+"""
+Background Deletion Module
+==========================
+Deletes large projects and users in bounded batches outside the request.
+
+The request only marks the entity as ``deleting`` and records a
+DeletionJob. The job then removes children in batches of
+``deletion_batch_size`` rows, committing after each batch so locks are
+short-lived, and reports its progress on the job row. Reads skip entities
+marked as deleting.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import inspect
+from sqlmodel import Session, SQLModel, select, delete, update
+from ..models.deletion_job import DeletionJob
+from ..models.project import Project
+from ..models.project_member import ProjectMember
+from ..models.refresh_token import RefreshToken
+from ..models.revoked_token import RevokedToken
+from ..models.project_role import ProjectRole
+from ..models.task import Task
+from ..models.task_history import TaskStatusHistory
+from ..models.user import User
+from .database import engine
+from .settings import get_settings
+from .task_stats import clear_project_stats, rebuild_project_stats
+from .task_history import clear_project_rollup
+
+logger = logging.getLogger(__name__)
+
+# Jobs not updated for this long are considered abandoned and resumed
+STALE_JOB_AFTER = timedelta(minutes=10)
+
+
+def deleting_projects():
+    """Subquery of project ids being deleted, used to hide their children in reads"""
+    return select(Project.id).where(Project.deleting == True)
+
+
+def deleting_users():
+    """Subquery of user ids being deleted, used to hide their memberships in reads"""
+    return select(User.id).where(User.deleting == True)
+
+
+def start_deletion(session: Session, entity: str, entity_obj: SQLModel, requested_by: int) -> DeletionJob:
+    """
+    Mark an entity as deleting and create its deletion job.
+
+    Args:
+        session: Database session
+        entity: "project" or "user"
+        entity_obj: Project or User to delete
+        requested_by: Id of the user starting the deletion
+
+    Returns:
+        The created job (committed)
+    """
+    entity_obj.deleting = True
+    job = DeletionJob(entity=entity, entity_id=entity_obj.id, requested_by=requested_by)
+    session.add(entity_obj)
+    session.add(job)
+    session.commit()
+    return job
+
+
+def _delete_in_batches(session: Session, job: DeletionJob, model: type[SQLModel], condition, batch_size: int) -> None:
+    """Delete matching rows in batches, committing progress after each one"""
+    key = inspect(model).primary_key[0]  # id, or jti for revoked tokens
+    while True:
+        ids = session.exec(select(key).where(condition).limit(batch_size)).all()
+        if not ids:
+            return
+        session.exec(delete(model).where(key.in_(ids)))
+        _progress(session, job, len(ids))
+
+
+def _unassign_in_batches(session: Session, job: DeletionJob, user_id: int, batch_size: int) -> None:
+    """Clear assigned_to on the user's tasks in batches (same effect as ON DELETE SET NULL)"""
+    while True:
+        ids = session.exec(select(Task.id).where(Task.assigned_to == user_id).limit(batch_size)).all()
+        if not ids:
+            return
+        session.exec(update(Task).where(Task.id.in_(ids)).values(assigned_to=None))
+        _progress(session, job, 0)
+
+
+def _progress(session: Session, job: DeletionJob, deleted: int) -> None:
+    job.deleted_rows += deleted
+    job.updated_at = datetime.utcnow()
+    session.add(job)
+    session.commit()
+
+
+def _delete_project(session: Session, job: DeletionJob, project_id: int, batch_size: int) -> None:
+    """Delete a project's children in dependency order, then the project"""
+    _delete_in_batches(session, job, Task, Task.project_id == project_id, batch_size)
+    _delete_in_batches(session, job, ProjectMember, ProjectMember.project_id == project_id, batch_size)
+    _delete_in_batches(session, job, ProjectRole, ProjectRole.project_id == project_id, batch_size)
+    _delete_in_batches(session, job, TaskStatusHistory, TaskStatusHistory.project_id == project_id, batch_size)
+    clear_project_stats(session, project_id)
+    clear_project_rollup(session, project_id)
+    session.exec(delete(Project).where(Project.id == project_id))
+    _progress(session, job, 1)
+
+
+def _delete_user(session: Session, job: DeletionJob, user_id: int, batch_size: int) -> None:
+    """Delete a user's memberships, tokens and created projects, unassign its tasks, then the user"""
+    assigned_projects = session.exec(select(Task.project_id).where(Task.assigned_to == user_id).distinct()).all()
+    _unassign_in_batches(session, job, user_id, batch_size)
+    rebuild_project_stats(session, list(assigned_projects))
+    _delete_in_batches(session, job, ProjectMember, ProjectMember.user_id == user_id, batch_size)
+    _delete_in_batches(session, job, RefreshToken, RefreshToken.user_id == user_id, batch_size)
+    _delete_in_batches(session, job, RevokedToken, RevokedToken.user_id == user_id, batch_size)
+
+    # Projects created by the user cascade on delete: hide them all first, then remove one by one
+    session.exec(update(Project).where(Project.id_user == user_id).values(deleting=True))
+    session.commit()
+    project_ids = session.exec(select(Project.id).where(Project.id_user == user_id)).all()
+    for project_id in project_ids:
+        _delete_project(session, job, project_id, batch_size)
+
+    session.exec(delete(User).where(User.id == user_id))
+    _progress(session, job, 1)
+
+
+def run_deletion_job(job_id: int) -> None:
+    """
+    Run a deletion job to completion in its own session.
+    Safe to re-run: every step only deletes rows that still exist.
+    """
+    batch_size = get_settings().deletion_batch_size
+    with Session(engine, expire_on_commit=False) as session:
+        job = session.get(DeletionJob, job_id)
+        if not job or job.status == "completed":
+            return
+
+        job.status = "running"
+        _progress(session, job, 0)
+        try:
+            if job.entity == "project":
+                _delete_project(session, job, job.entity_id, batch_size)
+            else:
+                _delete_user(session, job, job.entity_id, batch_size)
+            job.status = "completed"
+            job.finished_at = datetime.utcnow()
+            _progress(session, job, 0)
+            logger.info(f"Deletion job {job.id} removed {job.entity} {job.entity_id} ({job.deleted_rows} rows)")
+        except Exception as e:
+            session.rollback()
+            logger.error(f"Deletion job {job_id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)[:255]
+            _progress(session, job, 0)
+
+
+def resume_deletion_jobs(now: Optional[datetime] = None) -> int:
+    """
+    Resume jobs left unfinished (e.g. by a restarted worker) or failed.
+
+    Returns:
+        Number of jobs resumed
+    """
+    cutoff = (now or datetime.utcnow()) - STALE_JOB_AFTER
+    with Session(engine) as session:
+        job_ids = session.exec(
+            select(DeletionJob.id).where(
+                DeletionJob.status.in_(["pending", "running", "failed"]),
+                DeletionJob.updated_at < cutoff
+            )
+        ).all()
+
+    for job_id in job_ids:
+        run_deletion_job(job_id)
+    return len(job_ids)
@@ -0,0 +1,61 @@
+"""
+Entity Tags Module
+==================
+ETag validation for JSON responses.
+
+The tag is a digest of the serialized body, so it changes exactly when
+the response does. A request whose ``If-None-Match`` lists it gets an
+empty ``304`` instead of the body. Comparison is weak (``W/`` prefixes
+are ignored) because the compression middleware marks the tags of the
+responses it encodes as weak. The response must still be built to be
+validated; what is saved is the transfer and the client's parsing.
+"""
+
+import hashlib
+from typing import Optional
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+
+# Responses depend on the caller's permissions: only the browser may store them,
+# and it must revalidate before reuse
+PRIVATE_REVALIDATE = "private, no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag of a response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    tag = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == tag:
+            return True
+    return False
+
+
+def etag_response(request: Request, content: BaseModel, cache_control: str = PRIVATE_REVALIDATE) -> Response:
+    """
+    Serialize a response model with its ETag, or answer 304 when the client has it.
+
+    Args:
+        request: Incoming request (for If-None-Match)
+        content: Response model to send
+        cache_control: Cache-Control header value
+
+    Returns:
+        JSON response, or an empty 304 Not Modified
+    """
+    body = content.model_dump_json().encode("utf-8")
+    headers = {"ETag": make_etag(body), "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, headers["ETag"]):
+        # Echo the form the client holds (weak if it got the tag on a compressed response)
+        if f"W/{headers['ETag']}" in if_none_match:
+            headers["ETag"] = f"W/{headers['ETag']}"
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -0,0 +1,100 @@
+"""
+Sparse Fieldsets Module
+=======================
+Handles the ``fields`` query parameter used to request a subset of the
+response attributes. The selected set drives both the SQL projection and
+which enrichment lookups are executed.
+"""
+
+from fastapi import HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlmodel import Session, SQLModel
+from typing import Any, Callable, Iterable, Optional, Set
+
+
+def parse_fields(fields: Optional[str], response_model: type[SQLModel]) -> Optional[Set[str]]:
+    """
+    Parse a comma-separated ``fields`` value against a response model.
+
+    Args:
+        fields: Raw query parameter value (e.g. "id,title,status")
+        response_model: Response model whose attributes can be requested
+
+    Returns:
+        Set of requested field names, or None when no selection was made
+
+    Raises:
+        HTTPException: 400 if the selection is empty or has unknown fields
+    """
+    if fields is None:
+        return None
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must contain at least one field name")
+
+    allowed = set(response_model.model_fields)
+    invalid = requested - allowed
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {', '.join(sorted(invalid))}. Allowed fields: {', '.join(sorted(allowed))}"
+        )
+
+    return requested
+
+
+def sparse_fields(response_model: type[SQLModel]) -> Callable[..., Optional[Set[str]]]:
+    """
+    Build a dependency that parses ``fields`` for the given response model.
+    Invalid selections are rejected before the endpoint touches the database.
+    """
+    def dependency(
+        fields: Optional[str] = Query(
+            default=None,
+            description=f"Comma-separated list of {response_model.__name__} fields to return"
+        )
+    ) -> Optional[Set[str]]:
+        return parse_fields(fields, response_model)
+
+    return dependency
+
+
+def wants(fieldset: Optional[Set[str]], names: Iterable[str]) -> bool:
+    """Check whether any of the given fields is requested (None means all fields)"""
+    return fieldset is None or not fieldset.isdisjoint(names)
+
+
+def columns_for(model: type[SQLModel], fieldset: Set[str], *required: str) -> list:
+    """
+    Get the table columns needed to serve a fieldset.
+
+    Args:
+        model: Table model to select from
+        fieldset: Requested response fields
+        required: Extra columns needed by enrichment lookups
+
+    Returns:
+        List of model attributes to pass to select()
+    """
+    needed = set(fieldset) | set(required)
+    return [getattr(model, name) for name in model.__table__.columns.keys() if name in needed]
+
+
+def fetch_rows(session: Session, statement, params: Optional[dict[str, Any]] = None) -> list[dict[str, Any]]:
+    """
+    Execute a projected select and return each row as a dict keyed by column name.
+    Unlike session.exec(), single-column selects are not collapsed to scalars.
+    """
+    return [dict(row) for row in session.execute(statement, params).mappings().all()]
+
+
+def trim(data: dict[str, Any], fieldset: Set[str]) -> dict[str, Any]:
+    """Keep only the requested fields of a response dict"""
+    return {key: value for key, value in data.items() if key in fieldset}
+
+
+def sparse_response(content: Any) -> JSONResponse:
+    """Serialize a partial payload without validating it against the full response model"""
+    return JSONResponse(content=jsonable_encoder(content))
@@ -0,0 +1,305 @@
+"""
+Bulk Import Module
+==================
+Loads users, projects and tasks from CSV or NDJSON streams.
+
+Input is read incrementally and processed in batches: each batch is
+validated with the existing Create models, its foreign keys are resolved
+through lookup tables (one IN query per batch for unseen keys), passwords
+are hashed in parallel and the rows are written with a multi-row INSERT in
+their own transaction (projects and tasks go through ``insert_rows`` so their
+new ids are known for the default roles and the status history). Invalid
+rows are reported with their line number and never abort the rest of the
+load.
+"""
+
+import csv
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, SQLModel, select, insert
+from ..models.user import User, UserCreate
+from ..models.project import Project, ProjectCreate
+from ..models.project_role import ProjectRole
+from ..models.task import Task, TaskCreate
+from ..models.import_report import ImportReport, ImportRowError
+from .bulk import existing_ids, insert_rows
+from .role_templates import default_role_rows
+from .task_stats import apply_task_changes
+from .calendar import invalidate_calendar
+from .task_history import record_transitions
+from .permissions import FORBIDDEN_DETAIL, invalidate_permissions
+from .security import hash_password
+
+logger = logging.getLogger(__name__)
+
+IMPORT_ENTITIES = ("users", "projects", "tasks")
+IMPORT_FORMATS = ("csv", "ndjson")
+
+# (line number, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def iter_records(stream: TextIO, import_format: str) -> Iterator[Record]:
+    """
+    Read records one at a time from a CSV (with header) or NDJSON stream.
+    Empty values are dropped so optional fields fall back to their defaults.
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if k and v not in ("", None)}, None
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, {k: v for k, v in record.items() if v not in ("", None)}, None
+
+
+def batched(records: Iterable[Record], size: int) -> Iterator[List[Record]]:
+    """Split an iterable into lists of at most size items"""
+    iterator = iter(records)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def format_validation_error(error: ValidationError) -> str:
+    """Flatten a pydantic error into a single line"""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in item['loc']) or 'row'}: {item['msg']}" for item in error.errors()
+    )
+
+
+class Importer:
+    """Runs one import, keeping lookup tables and the report across batches"""
+
+    def __init__(
+        self,
+        session: Session,
+        entity: str,
+        batch_size: int = 500,
+        hash_workers: int = 4,
+        max_errors: int = 1000,
+        on_progress: Optional[Callable[[ImportReport], None]] = None,
+        can_write_project: Optional[Callable[[int], bool]] = None
+    ):
+        if entity not in IMPORT_ENTITIES:
+            raise ValueError(f"entity must be one of: {', '.join(IMPORT_ENTITIES)}")
+        self.session = session
+        self.entity = entity
+        self.batch_size = batch_size
+        self.hash_workers = hash_workers
+        self.max_errors = max_errors
+        self.on_progress = on_progress
+        # Tasks of projects rejected by this check fail (None = no check, e.g. the CLI)
+        self.can_write_project = can_write_project
+        self.report = ImportReport(entity=entity)
+        self.pool: Optional[ThreadPoolExecutor] = None
+
+        # Lookup tables for foreign keys already resolved in previous batches
+        self.user_ids_by_email: Dict[str, int] = {}
+        self.known_user_ids: Set[int] = set()
+        self.known_project_ids: Set[int] = set()
+
+    def run(self, stream: TextIO, import_format: str) -> ImportReport:
+        """Import every record of the stream and return the final report"""
+        if import_format not in IMPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+
+        handler = {
+            "users": self._import_users,
+            "projects": self._import_projects,
+            "tasks": self._import_tasks,
+        }[self.entity]
+
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as pool:
+            self.pool = pool
+            for batch in batched(iter_records(stream, import_format), self.batch_size):
+                self.report.processed += len(batch)
+                valid = []
+                for line, record, error in batch:
+                    if error:
+                        self._fail(line, error)
+                    else:
+                        valid.append((line, record))
+                if valid:
+                    handler(valid)
+                if self.on_progress:
+                    self.on_progress(self.report)
+
+        self.report.errors.sort(key=lambda error: error.line)
+        return self.report
+
+    def _fail(self, line: int, error: str) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < self.max_errors:
+            self.report.errors.append(ImportRowError(line=line, error=error))
+
+    def _validate(self, model: type[SQLModel], line: int, record: Dict[str, Any]) -> Optional[SQLModel]:
+        try:
+            return model.model_validate(record)
+        except ValidationError as e:
+            self._fail(line, format_validation_error(e))
+            return None
+
+    def _resolve_emails(self, emails: Set[str]) -> None:
+        """Load user ids for emails not in the lookup table yet (one IN query)"""
+        missing = emails - self.user_ids_by_email.keys()
+        if missing:
+            rows = self.session.exec(select(User.email, User.id).where(User.email.in_(missing))).all()
+            for email, user_id in rows:
+                self.user_ids_by_email[email] = user_id
+                self.known_user_ids.add(user_id)
+
+    def _known(self, model: type[SQLModel], cache: Set[int], ids: Iterable[Optional[int]]) -> Set[int]:
+        """Add existing ids not in the lookup table yet (one IN query) and return the table"""
+        missing = {i for i in ids if i is not None} - cache
+        cache.update(existing_ids(self.session, model, missing))
+        return cache
+
+    def _insert(self, model: type[SQLModel], rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert rows with one statement, keeping the default roles of projects and
+        the stats and history of tasks in the same transaction
+        """
+        if model is Project:
+            # Projects need their new ids for their default roles, as in create_project
+            project_ids = insert_rows(self.session, Project, rows)
+            self.session.execute(insert(ProjectRole), default_role_rows(project_ids))
+            return
+        if model is not Task:
+            self.session.execute(insert(model), rows)
+            return
+
+        # Tasks need their new ids for the status history
+        task_ids = insert_rows(self.session, Task, rows)
+        apply_task_changes(
+            self.session, added=[(row["project_id"], row["assigned_to"], row["status"]) for row in rows]
+        )
+        record_transitions(self.session, [
+            (task_id, row["project_id"], None, row["status"], row["created_at"]) for task_id, row in zip(task_ids, rows)
+        ])
+
+    def _write(self, model: type[SQLModel], rows: List[Dict[str, Any]], lines: List[int]) -> None:
+        """
+        Insert a batch with a multi-row INSERT in its own transaction.
+        If the batch fails, retry row by row so only the offending rows are reported.
+        """
+        if not rows:
+            return
+        try:
+            self._insert(model, rows)
+            self.session.commit()
+            self.report.imported += len(rows)
+            return
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            logger.warning(f"Import batch failed, retrying row by row: {e.__class__.__name__}")
+
+        for row, line in zip(rows, lines):
+            try:
+                self._insert(model, [row])
+                self.session.commit()
+                self.report.imported += 1
+            except SQLAlchemyError as e:
+                self.session.rollback()
+                self._fail(line, f"Database error: {e.__class__.__name__}")
+
+    def _import_users(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        validated = []
+        for line, record in batch:
+            user = self._validate(UserCreate, line, record)
+            if user:
+                validated.append((line, user))
+
+        # Reject emails already stored (earlier batches are committed) or repeated in this batch
+        self._resolve_emails({user.email for _, user in validated})
+        accepted = []
+        seen: Set[str] = set()
+        for line, user in validated:
+            if user.email in self.user_ids_by_email or user.email in seen:
+                self._fail(line, "Email already exists")
+            else:
+                seen.add(user.email)
+                accepted.append((line, user))
+
+        # Password hashing dominates the cost of a user import: run it in parallel
+        hashes = self.pool.map(hash_password, [user.password for _, user in accepted])
+        rows = []
+        for (_, user), hashed in zip(accepted, hashes):
+            user_data = user.model_dump()
+            user_data['password'] = hashed
+            rows.append(User(**user_data).model_dump(exclude={"id"}))
+        self._write(User, rows, [line for line, _ in accepted])
+
+    def _import_projects(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        self._resolve_emails({record["creator_email"] for _, record in batch if "creator_email" in record})
+
+        validated = []
+        for line, record in batch:
+            creator_email = record.pop("creator_email", None)
+            if creator_email is not None:
+                if creator_email not in self.user_ids_by_email:
+                    self._fail(line, "creator_email does not exist")
+                    continue
+                record["id_user"] = self.user_ids_by_email[creator_email]
+            project = self._validate(ProjectCreate, line, record)
+            if project:
+                validated.append((line, project))
+
+        users = self._known(User, self.known_user_ids, (project.id_user for _, project in validated))
+        rows, lines = [], []
+        for line, project in validated:
+            if project.id_user not in users:
+                self._fail(line, "id_user does not exist")
+                continue
+            rows.append(Project(**project.model_dump()).model_dump(exclude={"id"}))
+            lines.append(line)
+        self._write(Project, rows, lines)
+        invalidate_permissions(row["id_user"] for row in rows)
+
+    def _import_tasks(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        self._resolve_emails({record["assigned_to_email"] for _, record in batch if "assigned_to_email" in record})
+
+        validated = []
+        for line, record in batch:
+            assigned_to_email = record.pop("assigned_to_email", None)
+            if assigned_to_email is not None:
+                if assigned_to_email not in self.user_ids_by_email:
+                    self._fail(line, "assigned_to_email does not exist")
+                    continue
+                record["assigned_to"] = self.user_ids_by_email[assigned_to_email]
+            task = self._validate(TaskCreate, line, record)
+            if task:
+                validated.append((line, task))
+
+        projects = self._known(Project, self.known_project_ids, (task.project_id for _, task in validated))
+        users = self._known(User, self.known_user_ids, (task.assigned_to for _, task in validated))
+        rows, lines = [], []
+        for line, task in validated:
+            if task.project_id not in projects:
+                self._fail(line, "project_id does not exist")
+                continue
+            if self.can_write_project and not self.can_write_project(task.project_id):
+                self._fail(line, FORBIDDEN_DETAIL)
+                continue
+            if task.assigned_to and task.assigned_to not in users:
+                self._fail(line, "assigned_to user does not exist")
+                continue
+            rows.append(Task(**task.model_dump()).model_dump(exclude={"id"}))
+            lines.append(line)
+        self._write(Task, rows, lines)
+        invalidate_calendar(row["project_id"] for row in rows)
@@ -0,0 +1,111 @@
+"""
+Project Overview Module
+=======================
+Everything the project screen shows, assembled from a fixed number of
+queries whatever the size of the project:
+
+1. the project joined with its creator,
+2. its roles,
+3. its members (users being deleted are hidden),
+4. the member and assignee users, with one ``IN`` query,
+5. the first page of tasks (one row more than asked, to know if there
+   are more),
+6. the task counts, from the ``project_task_stats`` summary table.
+
+Related names are filled from these results instead of being looked up
+per member and per task. The permission check is answered by the
+in-memory index.
+"""
+
+from typing import Dict, Optional
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from ..models.project import ProjectResponse
+from ..models.project_member import ProjectMemberResponse
+from ..models.project_overview import ProjectOverviewResponse
+from ..models.project_role import ProjectRoleResponse
+from ..models.task import TaskResponse
+from ..models.user import User
+from .permissions import require_project_access
+from .statements import (
+    project_with_creator_statement, project_roles_statement, project_members_statement, project_task_page_statement
+)
+from .task_stats import get_project_stats
+
+
+def project_overview(session: Session, user: User, project_id: int, task_limit: int) -> ProjectOverviewResponse:
+    """
+    Build the overview of a project the user can read.
+
+    Args:
+        session: Database session
+        user: Current user
+        project_id: Project to describe
+        task_limit: Number of newest tasks to include
+
+    Returns:
+        Project, roles, members, first tasks and task counts
+
+    Raises:
+        HTTPException: 404 if the project does not exist, 403 without read access
+    """
+    params = {"project_id": project_id}
+    row = session.exec(project_with_creator_statement(), params=params).first()
+    if row is None or row[0].deleting:
+        raise HTTPException(status_code=404, detail="Project not found")
+    project, creator = row
+    require_project_access(session, user, project_id, "read")
+
+    roles = session.exec(project_roles_statement(), params=params).all()
+    members = session.exec(project_members_statement(None), params=params).all()
+    tasks = session.exec(project_task_page_statement(), params={**params, "limit": task_limit + 1}).all()
+    has_more_tasks = len(tasks) > task_limit
+    tasks = tasks[:task_limit]
+
+    # Every user the page mentions, in one query
+    user_ids = {member.user_id for member in members} | {task.assigned_to for task in tasks if task.assigned_to}
+    users: Dict[int, Optional[User]] = {creator.id: creator} if creator is not None else {}
+    user_ids -= users.keys()
+    if user_ids:
+        users.update((found.id, found) for found in session.exec(select(User).where(User.id.in_(user_ids))).all())
+    role_by_id = {role.id: role for role in roles}
+
+    project_response = ProjectResponse.model_validate({
+        **project.model_dump(),
+        "creator_name": creator.name if creator else "Unknown User",
+        "creator_email": creator.email if creator else "Unknown User"
+    })
+    role_responses = [
+        ProjectRoleResponse.model_validate({**role.model_dump(), "project_name": project.name}) for role in roles
+    ]
+    member_responses = []
+    for member in members:
+        member_user = users.get(member.user_id)
+        role = role_by_id.get(member.project_role_id)
+        member_responses.append(ProjectMemberResponse.model_validate({
+            **member.model_dump(),
+            "project_name": project.name,
+            "user_name": member_user.name if member_user else "Unknown User",
+            "user_email": member_user.email if member_user else "Unknown Email",
+            "role_name": role.name if role else "Unknown Role",
+            "role_description": role.description if role else None
+        }))
+    task_responses = []
+    for task in tasks:
+        assignee = users.get(task.assigned_to) if task.assigned_to else None
+        task_responses.append(TaskResponse.model_validate({
+            **task.model_dump(),
+            "project_name": project.name,
+            "project_description": project.description,
+            "assigned_to_name": assignee.name if assignee else None,
+            "assigned_to_email": assignee.email if assignee else None
+        }))
+
+    return ProjectOverviewResponse(
+        project=project_response,
+        roles=role_responses,
+        members=member_responses,
+        tasks=task_responses,
+        has_more_tasks=has_more_tasks,
+        stats=get_project_stats(session, project_id)
+    )
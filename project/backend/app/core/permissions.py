@@ -0,0 +1,155 @@
+"""
+Project Permissions Module
+==========================
+Project-scoped authorization driven by project memberships and roles.
+
+Every role carries a set of capabilities (``read``, ``write`` to change
+tasks, ``manage`` to change the project, its members and roles); a
+project's creator holds all of them. The capabilities a user has on each
+project are loaded once per principal into an in-memory index
+(project_id -> capabilities), so checking access is a dict lookup.
+
+Member, role and project writes in this process invalidate the affected
+users; entries also expire after ``permission_cache_ttl_seconds`` so
+writes from other workers show up within that window.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from fastapi import HTTPException
+from sqlmodel import Session, select
+from ..models.project import Project
+from ..models.project_member import ProjectMember
+from ..models.project_role import ProjectRole, CAPABILITIES, normalize_capabilities
+from ..models.user import User
+from .database import engine
+from .settings import get_settings
+
+ALL_CAPABILITIES: FrozenSet[str] = frozenset(CAPABILITIES)
+NO_CAPABILITIES: FrozenSet[str] = frozenset()
+
+FORBIDDEN_DETAIL = "Not enough permissions on this project"
+
+ProjectPermissions = Dict[int, FrozenSet[str]]
+
+
+@lru_cache(maxsize=64)
+def parse_capabilities(value: Optional[str]) -> FrozenSet[str]:
+    """Capabilities stored on a role (few distinct values, parsed once)"""
+    try:
+        return frozenset(normalize_capabilities(value or "").split(","))
+    except ValueError:
+        return NO_CAPABILITIES
+
+
+def load_permissions(session: Session, user_id: int) -> ProjectPermissions:
+    """Read the capabilities a user has on every project they belong to or created"""
+    permissions: Dict[int, FrozenSet[str]] = {}
+    for project_id, capabilities in session.exec(
+        select(ProjectMember.project_id, ProjectRole.capabilities)
+        .join(ProjectRole, ProjectRole.id == ProjectMember.project_role_id)
+        .where(ProjectMember.user_id == user_id)
+    ).all():
+        # A user added twice to a project gets the union of both roles
+        permissions[project_id] = permissions.get(project_id, NO_CAPABILITIES) | parse_capabilities(capabilities)
+    for project_id in session.exec(select(Project.id).where(Project.id_user == user_id)).all():
+        permissions[project_id] = ALL_CAPABILITIES
+    return permissions
+
+
+class PermissionIndexCache:
+    """LRU of per-user permission indexes"""
+
+    def __init__(self):
+        self.entries: "OrderedDict[int, tuple[float, ProjectPermissions]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id: int, ttl: int) -> Optional[ProjectPermissions]:
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > ttl:
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id: int, permissions: ProjectPermissions, capacity: int) -> None:
+        with self.lock:
+            self.entries[user_id] = (time.monotonic(), permissions)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > capacity:
+                self.entries.popitem(last=False)
+
+    def invalidate(self, user_ids: Iterable[int]) -> None:
+        with self.lock:
+            for user_id in user_ids:
+                self.entries.pop(user_id, None)
+
+
+permission_index = PermissionIndexCache()
+
+
+def get_permissions(session: Session, user: User) -> ProjectPermissions:
+    """
+    Get the permission index of a user, loading it on first use.
+
+    The index is cached, so it is always loaded from the primary database,
+    never from a (possibly lagging) replica session.
+
+    Args:
+        session: Database session, used only when the index is not cached
+        user: Authenticated user
+
+    Returns:
+        Mapping of project_id to the user's capabilities (do not modify)
+    """
+    settings = get_settings()
+    permissions = permission_index.get(user.id, settings.permission_cache_ttl_seconds)
+    if permissions is None:
+        if session.info.get("replica"):
+            with Session(engine) as primary:
+                permissions = load_permissions(primary, user.id)
+        else:
+            permissions = load_permissions(session, user.id)
+        if settings.permission_cache_users > 0:
+            permission_index.put(user.id, permissions, settings.permission_cache_users)
+    return permissions
+
+
+def invalidate_permissions(user_ids: Iterable[Optional[int]]) -> None:
+    """Drop cached indexes of users whose memberships or roles changed (call after commit)"""
+    permission_index.invalidate({user_id for user_id in user_ids if user_id is not None})
+
+
+def role_member_ids(session: Session, role_id: int) -> List[int]:
+    """Users holding a role, whose indexes change with it"""
+    return list(session.exec(select(ProjectMember.user_id).where(ProjectMember.project_role_id == role_id)).all())
+
+
+def has_project_access(session: Session, user: User, project_id: int, capability: str = "read") -> bool:
+    """Check whether a user holds a capability on a project"""
+    return capability in get_permissions(session, user).get(project_id, NO_CAPABILITIES)
+
+
+def require_project_access(session: Session, user: User, project_id: int, capability: str = "read") -> None:
+    """
+    Ensure a user holds a capability on a project.
+
+    Raises:
+        HTTPException: 403 if the user lacks the capability
+    """
+    if not has_project_access(session, user, project_id, capability):
+        raise HTTPException(status_code=403, detail=FORBIDDEN_DETAIL)
+
+
+def accessible_projects(session: Session, user: User, capability: str = "read") -> List[int]:
+    """Ids of the projects on which a user holds a capability, for list filters"""
+    return [
+        project_id for project_id, capabilities in get_permissions(session, user).items()
+        if capability in capabilities
+    ]
@@ -0,0 +1,161 @@
+"""
+Refresh Tokens Module
+=====================
+Long-lived refresh tokens that renew access tokens without the password.
+
+Tokens are random strings handed to the client once; the database keeps
+only their HMAC-SHA256, looked up through a unique index, so renewing an
+access token costs one HMAC and one indexed read instead of a password
+hash. Every refresh rotates the token: the presented one is marked used
+and a new one of the same family is issued. Presenting a used token again
+means it was copied, so the whole family is revoked.
+"""
+
+import hashlib
+import hmac
+import logging
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from sqlmodel import Session, select, update, delete
+from ..models.refresh_token import RefreshToken
+from ..models.user import User
+from .database import engine
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+def hash_refresh_token(token: str) -> str:
+    """HMAC of a refresh token keyed with the application secret"""
+    return hmac.new(get_settings().secret_key.encode(), token.encode(), hashlib.sha256).hexdigest()
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def issue_refresh_token(
+    session: Session,
+    user_id: int,
+    family_id: Optional[str] = None,
+    now: Optional[datetime] = None
+) -> str:
+    """
+    Create a refresh token for a user (not committed here).
+
+    Args:
+        session: Database session
+        user_id: Owner of the token
+        family_id: Family of the token being rotated, or None for a new login
+        now: Issue time
+
+    Returns:
+        The token to hand to the client (only its HMAC is stored)
+    """
+    now = now or datetime.utcnow()
+    token = secrets.token_urlsafe(32)
+    session.add(RefreshToken(
+        user_id=user_id,
+        family_id=family_id or secrets.token_hex(16),
+        token_hash=hash_refresh_token(token),
+        created_at=now,
+        expires_at=now + timedelta(days=get_settings().refresh_token_expire_days),
+    ))
+    return token
+
+
+def revoke_family(session: Session, family_id: str, now: Optional[datetime] = None) -> None:
+    """Revoke every token rotated from the same login (not committed here)"""
+    session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now or datetime.utcnow())
+    )
+
+
+def revoke_refresh_token(session: Session, token: str, user_id: int, now: Optional[datetime] = None) -> None:
+    """Revoke a user's refresh token and its whole family, e.g. on logout (not committed here)"""
+    family_id = session.exec(
+        select(RefreshToken.family_id).where(
+            RefreshToken.token_hash == hash_refresh_token(token), RefreshToken.user_id == user_id
+        )
+    ).first()
+    if family_id is not None:
+        revoke_family(session, family_id, now)
+
+
+def revoke_user_refresh_tokens(session: Session, user_id: int, now: Optional[datetime] = None) -> None:
+    """Revoke every refresh token of a user (not committed here)"""
+    session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now or datetime.utcnow())
+    )
+
+
+def rotate_refresh_token(session: Session, token: str, now: Optional[datetime] = None) -> Tuple[User, str]:
+    """
+    Exchange a refresh token for a new one of the same family and commit.
+
+    Args:
+        session: Database session
+        token: Refresh token presented by the client
+        now: Rotation time
+
+    Returns:
+        The token's user and the new refresh token
+
+    Raises:
+        HTTPException: 401 if the token is unknown, revoked, expired or reused,
+            or its user can no longer log in
+    """
+    now = now or datetime.utcnow()
+    record = session.exec(select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))).first()
+    if record is None or record.revoked_at is not None:
+        raise _unauthorized("Invalid refresh token")
+    family_id = record.family_id
+    if record.used_at is not None:
+        revoke_family(session, family_id, now)
+        session.commit()
+        logger.warning(f"Refresh token reuse detected for user {record.user_id}; token family revoked")
+        raise _unauthorized("Invalid refresh token")
+    if record.expires_at <= now:
+        raise _unauthorized("Refresh token expired")
+
+    user = session.get(User, record.user_id)
+    if user is None or user.deleting or not user.active:
+        raise _unauthorized("Invalid refresh token")
+
+    # Claim the token atomically: of two concurrent rotations only one succeeds,
+    # the other is treated as a reuse
+    claimed = session.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == record.id, RefreshToken.used_at.is_(None), RefreshToken.revoked_at.is_(None))
+        .values(used_at=now)
+    ).rowcount
+    if claimed != 1:
+        session.rollback()
+        revoke_family(session, family_id, now)
+        session.commit()
+        logger.warning(f"Concurrent refresh token reuse for user {user.id}; token family revoked")
+        raise _unauthorized("Invalid refresh token")
+
+    new_token = issue_refresh_token(session, user.id, family_id, now)
+    session.commit()
+    return user, new_token
+
+
+def purge_refresh_tokens(now: Optional[datetime] = None) -> int:
+    """Delete expired refresh tokens in their own session (scheduler job)"""
+    with Session(engine) as session:
+        deleted = session.execute(
+            delete(RefreshToken).where(RefreshToken.expires_at < (now or datetime.utcnow()))
+        ).rowcount
+        session.commit()
+    return deleted
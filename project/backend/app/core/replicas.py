@@ -0,0 +1,219 @@
+"""
+Read Replica Routing Module
+===========================
+Sends read-only endpoints to replica databases and everything else to the
+primary.
+
+Read-only routes take their session from ``get_read_session`` instead of
+``get_session``. It picks a replica (``round_robin`` or ``least_loaded``,
+by checked-out connections) among those whose replication lag is below
+``replica_max_lag_seconds``, and falls back to the primary when there is
+none. Lag is probed at most every ``replica_lag_check_seconds``
+(``SHOW REPLICA STATUS`` on MySQL; other databases and MySQL servers that
+are not replicas report no lag, so two local SQLite files or schemas can
+stand in for a replica).
+
+Read-your-writes: a user's reads stay on the primary for
+``replica_sticky_seconds`` after any of their write requests, tracked per
+worker by ``ReplicaStickinessMiddleware``. Authentication and permission
+indexes always read the primary.
+"""
+
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+from fastapi import Depends
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+from starlette.types import ASGIApp, Receive, Scope, Send
+from .auth import get_current_active_user
+from .database import engine, replica_engines, get_session
+from .revocation import revocations
+from .security import decode_token
+from .settings import get_settings
+from ..models.user import User
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Requests that mark their own write sub-requests (POST /api/batch, app.core.batch)
+SELF_MARKING_PATHS = frozenset({"/api/batch"})
+# Sticky entries past this many are evicted, oldest first
+MAX_STICKY_USERS = 100000
+
+
+def replica_lag(replica: Engine) -> float:
+    """Replication lag of a replica in seconds (infinite when replication is stopped)"""
+    if replica.dialect.name != "mysql":
+        return 0.0
+    with replica.connect() as conn:
+        try:
+            row = conn.execute(text("SHOW REPLICA STATUS")).mappings().first()
+            key = "Seconds_Behind_Source"
+        except Exception:
+            # MySQL before 8.0.22
+            row = conn.execute(text("SHOW SLAVE STATUS")).mappings().first()
+            key = "Seconds_Behind_Master"
+    if row is None:
+        return 0.0  # not configured as a replica (e.g. a second local schema)
+    lag = row.get(key)
+    return float("inf") if lag is None else float(lag)
+
+
+class ReplicaSet:
+    """Replica engines with their last measured lag"""
+
+    def __init__(self, engines: List[Engine]):
+        self.engines = engines
+        self.lag: List[Optional[float]] = [None] * len(engines)  # None = unreachable
+        self.errors: List[Optional[str]] = [None] * len(engines)
+        self.checked_at = 0.0
+        self.counter = itertools.count()
+        self.lock = threading.Lock()
+
+    def check(self) -> None:
+        """Probe every replica's lag"""
+        for index, replica in enumerate(self.engines):
+            try:
+                self.lag[index] = replica_lag(replica)
+                self.errors[index] = None
+            except Exception as e:
+                self.lag[index] = None
+                self.errors[index] = str(e)
+                logger.warning(f"Replica {replica.url.render_as_string()} unavailable: {e}")
+        self.checked_at = time.monotonic()
+
+    def _refresh(self, interval: float) -> None:
+        # One request probes when the results are stale; the others keep using the last ones
+        if time.monotonic() - self.checked_at >= interval and self.lock.acquire(blocking=False):
+            try:
+                self.check()
+            finally:
+                self.lock.release()
+
+    def choose(self) -> Optional[Engine]:
+        """A replica within the lag limit, or None to use the primary"""
+        if not self.engines:
+            return None
+        settings = get_settings()
+        self._refresh(settings.replica_lag_check_seconds)
+        candidates = [
+            replica for replica, lag in zip(self.engines, self.lag)
+            if lag is not None and lag <= settings.replica_max_lag_seconds
+        ]
+        if not candidates:
+            return None
+        if settings.read_replica_policy == "least_loaded":
+            return min(candidates, key=lambda replica: replica.pool.checkedout())
+        return candidates[next(self.counter) % len(candidates)]
+
+    def status(self) -> List[Dict[str, Any]]:
+        max_lag = get_settings().replica_max_lag_seconds
+        return [
+            {
+                "url": replica.url.render_as_string(hide_password=True),
+                "lag_seconds": lag,
+                "healthy": lag is not None and lag <= max_lag,
+                "checked_out": replica.pool.checkedout(),
+                "error": error,
+            }
+            for replica, lag, error in zip(self.engines, self.lag, self.errors)
+        ]
+
+
+replicas = ReplicaSet(replica_engines)
+
+
+class StickyWindow:
+    """Users whose reads stay on the primary until a deadline"""
+
+    def __init__(self):
+        # Kept in marking order, which is deadline order (the window has a fixed length)
+        self.until: "OrderedDict[str, float]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def mark(self, user_id: str, seconds: float) -> None:
+        now = time.monotonic()
+        with self.lock:
+            self.until.pop(user_id, None)
+            while self.until:
+                key, deadline = next(iter(self.until.items()))
+                if deadline > now and len(self.until) < MAX_STICKY_USERS:
+                    break
+                del self.until[key]  # expired, or the oldest one past the cap
+            self.until[user_id] = now + seconds
+
+    def active(self, user_id: str) -> bool:
+        deadline = self.until.get(user_id)
+        return deadline is not None and deadline > time.monotonic()
+
+
+sticky = StickyWindow()
+
+
+def get_read_session(
+    current_user: User = Depends(get_current_active_user),
+    auth_session: Session = Depends(get_session)
+):
+    """
+    Dependency to get a session for read-only endpoints.
+
+    Uses a replica unless none is configured or healthy, or the user wrote
+    within the sticky window. Only for authenticated routes that do not write.
+    """
+    # Authentication read the user on the primary: return that connection to the pool now
+    # instead of holding it for the whole request (the user stays loaded)
+    auth_session.close()
+    replica = None if sticky.active(str(current_user.id)) else replicas.choose()
+    with Session(replica or engine, expire_on_commit=False) as session:
+        session.info["replica"] = replica is not None
+        yield session
+
+
+def _verified_subject(scope: Scope) -> Optional[str]:
+    """User id of a bearer token with a valid signature that is not known to be revoked"""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            payload = decode_token(token)
+            if payload is None or payload.get("sub") is None:
+                return None
+            jti = payload.get("jti")
+            if jti is not None and revocations.might_be_revoked(jti):
+                return None
+            return str(payload["sub"])
+    return None
+
+
+class ReplicaStickinessMiddleware:
+    """ASGI middleware keeping a user's reads on the primary after their write requests"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http" or scope["method"] in SAFE_METHODS
+            or scope["path"] in SELF_MARKING_PATHS or not replicas.engines
+        ):
+            await self.app(scope, receive, send)
+            return
+        # request.state lives in scope["state"]: authentication leaves the user id there
+        state = scope.setdefault("state", {})
+        seconds = get_settings().replica_sticky_seconds
+        user_id = _verified_subject(scope)
+        if user_id is not None:
+            sticky.mark(user_id, seconds)  # covers reads issued while the write runs
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Only requests that authenticated keep the user on the primary afterwards
+            auth_user_id = state.get("auth_user_id")
+            if auth_user_id is not None:
+                sticky.mark(str(auth_user_id), seconds)
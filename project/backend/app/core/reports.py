@@ -0,0 +1,324 @@
+"""
+Task Reporting Module
+=====================
+Columnar in-memory snapshot of the tasks table for management reports.
+
+Tasks are loaded once into NumPy column arrays sorted by id (int32 ids,
+int8 status codes, datetime64 dates) and every report is computed with
+vectorized group-bys (``bincount``) and histograms instead of SQL scans.
+
+The snapshot refreshes incrementally: rows with ``updated_at`` past the
+last watermark (minus a small overlap for late commits) are merged into
+the arrays, and a ``COUNT(*)`` check detects deletions, in which case only
+the id column is reloaded to drop the missing rows.
+
+When snapshot files are enabled, a cold worker maps the tasks file
+(see ``snapshots``) and only reads the changes made since it was written.
+Arrays stay shared with the page cache until a refresh actually changes rows.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from sqlmodel import Session, select, func
+from ..models.task import Task, TASK_STATUSES, OPEN_TASK_STATUSES
+from ..models.report import (
+    ThroughputReport, ThroughputWeek, StatusDistributionReport, ProjectStatusCounts,
+    AssigneeLoadReport, LoadBucket, AssigneeLoadItem
+)
+from .database import engine
+from .settings import get_settings
+from .snapshots import MappedTable, load_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Re-read rows changed this long before the watermark, for transactions that committed late
+REFRESH_OVERLAP = timedelta(minutes=1)
+LOAD_BATCH_SIZE = 10000
+STATUS_CODES = {status: code for code, status in enumerate(TASK_STATUSES)}
+UNKNOWN_STATUS = len(TASK_STATUSES)
+OPEN_CODES = np.array([STATUS_CODES[status] for status in OPEN_TASK_STATUSES], dtype=np.int8)
+COMPLETED_CODE = STATUS_CODES["completed"]
+DEFAULT_LOAD_BINS = [1, 2, 5, 10, 20, 50, 100]
+
+TASK_COLUMN_NAMES = ("ids", "project_ids", "assignees", "statuses", "created", "due", "updated")
+SNAPSHOT_COLUMNS = (
+    Task.id, Task.project_id, Task.assigned_to, Task.status, Task.created_at, Task.due_date, Task.updated_at
+)
+
+
+@dataclass(frozen=True)
+class TaskSnapshot:
+    """Immutable column arrays of all tasks, sorted by id"""
+    ids: np.ndarray          # int32
+    project_ids: np.ndarray  # int32
+    assignees: np.ndarray    # int32, 0 = unassigned
+    statuses: np.ndarray     # int8 codes into TASK_STATUSES
+    created: np.ndarray      # datetime64[s]
+    due: np.ndarray          # datetime64[s], NaT = no due date
+    updated: np.ndarray      # datetime64[s]
+    watermark: Optional[datetime]
+    built_at: float
+    file_version: Optional[str] = None  # snapshot file the arrays were mapped from
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+
+def _columns_from_rows(rows: List[tuple]) -> Dict[str, np.ndarray]:
+    """Convert (id, project_id, assigned_to, status, created_at, due_date, updated_at) rows to arrays"""
+    if not rows:
+        ids, project_ids, assignees, statuses, created, due, updated = [], [], [], [], [], [], []
+    else:
+        ids, project_ids, assignees, statuses, created, due, updated = zip(*rows)
+    return {
+        "ids": np.array(ids, dtype=np.int32),
+        "project_ids": np.array(project_ids, dtype=np.int32),
+        "assignees": np.array([assignee or 0 for assignee in assignees], dtype=np.int32),
+        "statuses": np.array([STATUS_CODES.get(status, UNKNOWN_STATUS) for status in statuses], dtype=np.int8),
+        "created": np.array(created, dtype="datetime64[s]"),
+        "due": np.array(due, dtype="datetime64[s]"),
+        "updated": np.array(updated, dtype="datetime64[s]"),
+    }
+
+
+def _load_columns(session: Session, *conditions) -> Dict[str, np.ndarray]:
+    """Read matching tasks in batches from a server-side cursor and build sorted column arrays"""
+    statement = select(*SNAPSHOT_COLUMNS).where(*conditions).order_by(Task.id).execution_options(
+        yield_per=LOAD_BATCH_SIZE
+    )
+    parts = [_columns_from_rows(list(partition)) for partition in session.execute(statement).partitions()]
+    if not parts:
+        return _columns_from_rows([])
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _watermark(columns: Dict[str, np.ndarray], previous: Optional[datetime]) -> Optional[datetime]:
+    if len(columns["updated"]) == 0:
+        return previous
+    latest = columns["updated"].max().astype(datetime)
+    return max(latest, previous) if previous else latest
+
+
+def snapshot_from_file(table: MappedTable) -> TaskSnapshot:
+    """Wrap the read-only columns of a mapped tasks file (needs a refresh before use)"""
+    watermark = table.meta.get("watermark")
+    return TaskSnapshot(
+        **{name: table.columns[name] for name in TASK_COLUMN_NAMES},
+        watermark=datetime.fromisoformat(watermark) if watermark else None,
+        built_at=0.0,
+        file_version=table.version
+    )
+
+
+def _same(current: np.ndarray, changed: np.ndarray) -> np.ndarray:
+    """Element-wise equality that treats NaT as equal to NaT"""
+    if current.dtype.kind == "M":
+        return current.view(np.int64) == changed.view(np.int64)
+    return current == changed
+
+
+def build_snapshot(session: Session) -> TaskSnapshot:
+    """Load every task into a new snapshot"""
+    columns = _load_columns(session)
+    return TaskSnapshot(**columns, watermark=_watermark(columns, None), built_at=time.monotonic())
+
+
+def refresh_snapshot(session: Session, snapshot: TaskSnapshot) -> TaskSnapshot:
+    """
+    Build a new snapshot from an existing one and the changes since its watermark.
+
+    Args:
+        session: Database session
+        snapshot: Current snapshot (left untouched)
+
+    Returns:
+        Updated snapshot
+    """
+    conditions = []
+    if snapshot.watermark is not None:
+        conditions.append(Task.updated_at >= snapshot.watermark - REFRESH_OVERLAP)
+    changes = _load_columns(session, *conditions)
+
+    columns = {name: getattr(snapshot, name) for name in changes}
+    if len(changes["ids"]):
+        # Overwrite rows already in the snapshot, append the new ones and keep the id order
+        if len(columns["ids"]):
+            positions = np.minimum(np.searchsorted(columns["ids"], changes["ids"]), len(columns["ids"]) - 1)
+            existing = columns["ids"][positions] == changes["ids"]
+        else:
+            positions = np.zeros(len(changes["ids"]), dtype=np.intp)
+            existing = np.zeros(len(changes["ids"]), dtype=bool)
+        # Rows re-read by the overlap are usually unchanged: leave the arrays (and their mapping) alone then
+        modified = np.zeros_like(existing)
+        for name in columns:
+            modified[existing] |= ~_same(columns[name][positions[existing]], changes[name][existing])
+
+        if modified.any() or not existing.all():
+            columns = {name: values.copy() for name, values in columns.items()}
+            for name in columns:
+                columns[name][positions[modified]] = changes[name][modified]
+                columns[name] = np.concatenate([columns[name], changes[name][~existing]])
+            if not existing.all():
+                order = np.argsort(columns["ids"], kind="stable")
+                columns = {name: values[order] for name, values in columns.items()}
+
+    # Deleted tasks leave no trace in updated_at: detect them by count, then drop missing ids
+    total = session.exec(select(func.count()).select_from(Task)).one()
+    if total != len(columns["ids"]):
+        current_ids = np.fromiter(session.exec(select(Task.id)).all(), dtype=np.int32)
+        keep = np.isin(columns["ids"], current_ids)
+        columns = {name: values[keep] for name, values in columns.items()}
+
+    return TaskSnapshot(
+        **columns,
+        watermark=_watermark(changes, snapshot.watermark),
+        built_at=time.monotonic(),
+        file_version=snapshot.file_version
+    )
+
+
+class SnapshotStore:
+    """Holds the current snapshot and refreshes it at most once per max_age seconds"""
+
+    def __init__(self):
+        self.snapshot: Optional[TaskSnapshot] = None
+        self.lock = threading.Lock()
+
+    def get(self, max_age: int) -> TaskSnapshot:
+        snapshot = self.snapshot
+        if snapshot is not None and time.monotonic() - snapshot.built_at < max_age:
+            return snapshot
+
+        # One refresh at a time; requests waiting on the lock reuse its result
+        with self.lock:
+            snapshot = self.snapshot
+            if snapshot is not None and time.monotonic() - snapshot.built_at < max_age:
+                return snapshot
+            started = time.monotonic()
+
+            # Prefer a newer snapshot file over rebuilding or keeping a private copy
+            mapped = load_snapshot("tasks")
+            if mapped is not None and (snapshot is None or snapshot.file_version != mapped.version):
+                snapshot = snapshot_from_file(mapped)
+
+            with Session(engine) as session:
+                snapshot = build_snapshot(session) if snapshot is None else refresh_snapshot(session, snapshot)
+            self.snapshot = snapshot
+            logger.info(f"Task report snapshot refreshed ({len(snapshot)} tasks, {time.monotonic() - started:.2f}s)")
+            return snapshot
+
+
+snapshot_store = SnapshotStore()
+
+
+def get_snapshot() -> TaskSnapshot:
+    """Get a snapshot no older than report_snapshot_max_age_seconds (blocking: run in a thread)"""
+    return snapshot_store.get(get_settings().report_snapshot_max_age_seconds)
+
+
+def _project_mask(snapshot: TaskSnapshot, project_id: Optional[int],
+                  readable: Optional[Sequence[int]]) -> np.ndarray:
+    """Rows of one project, or of every project in ``readable`` (None means all projects)"""
+    if project_id is not None:
+        return snapshot.project_ids == project_id
+    if readable is None:
+        return np.ones(len(snapshot), dtype=bool)
+    return np.isin(snapshot.project_ids, np.asarray(readable, dtype=np.int32))
+
+
+def throughput_report(snapshot: TaskSnapshot, weeks: int, project_id: Optional[int] = None,
+                      now: Optional[datetime] = None, readable: Optional[Sequence[int]] = None) -> ThroughputReport:
+    """
+    Tasks created and completed per week over the last weeks (Monday-based).
+    A task counts as completed in the week of its last change while its status is completed.
+    Without project_id, only projects in ``readable`` are counted (None means all).
+    """
+    today = np.datetime64((now or datetime.utcnow()).date(), "D")
+    # 1970-01-01 was a Thursday: shift by 3 days so weeks start on Monday
+    current_week = (today - np.datetime64("1970-01-05", "D")).astype(np.int64) // 7
+    first_week = current_week - weeks + 1
+
+    def per_week(dates: np.ndarray) -> np.ndarray:
+        # Seconds since the epoch -> days -> weeks since Monday 1970-01-05, in integer arithmetic
+        week_numbers = (dates.view(np.int64) // 86400 - 4) // 7
+        offsets = week_numbers - first_week
+        offsets = offsets[(offsets >= 0) & (offsets < weeks)]
+        return np.bincount(offsets, minlength=weeks)
+
+    mask = _project_mask(snapshot, project_id, readable)
+    created = per_week(snapshot.created[mask])
+    completed = per_week(snapshot.updated[mask & (snapshot.statuses == COMPLETED_CODE)])
+
+    week_starts = np.datetime64("1970-01-05", "D") + (np.arange(first_week, current_week + 1) * 7)
+    return ThroughputReport(
+        project_id=project_id,
+        weeks=[
+            ThroughputWeek(week_start=start.astype(datetime), created=int(c), completed=int(d))
+            for start, c, d in zip(week_starts, created, completed)
+        ]
+    )
+
+
+def _group_counts(keys: np.ndarray, codes: np.ndarray, width: int):
+    """
+    Count (key, code) pairs. Returns the distinct keys and a (keys x width) count matrix.
+    Compact keys (auto-increment ids) are grouped with a dense bincount, which avoids sorting.
+    """
+    if len(keys) and keys.max() <= 4 * len(keys):
+        dense = np.bincount(keys.astype(np.int64) * width + codes, minlength=(int(keys.max()) + 1) * width)
+        dense = dense.reshape(-1, width)
+        present = np.flatnonzero(dense.any(axis=1))
+        return present, dense[present]
+    distinct, index = np.unique(keys, return_inverse=True)
+    counts = np.bincount(index * width + codes, minlength=len(distinct) * width)
+    return distinct, counts.reshape(len(distinct), width)
+
+
+def status_distribution_report(snapshot: TaskSnapshot, limit: int, project_id: Optional[int] = None,
+                               readable: Optional[Sequence[int]] = None) -> StatusDistributionReport:
+    """Task counts per status for each project (of ``readable`` when given), largest projects first"""
+    mask = _project_mask(snapshot, project_id, readable)
+    project_ids, counts = _group_counts(snapshot.project_ids[mask], snapshot.statuses[mask], len(TASK_STATUSES) + 1)
+
+    totals = counts.sum(axis=1)
+    top = np.argsort(-totals, kind="stable")[:limit]
+    return StatusDistributionReport(
+        total_projects=len(project_ids),
+        projects=[
+            ProjectStatusCounts(
+                project_id=int(project_ids[i]),
+                total=int(totals[i]),
+                by_status={status: int(counts[i, code]) for status, code in STATUS_CODES.items()}
+            )
+            for i in top
+        ]
+    )
+
+
+def assignee_load_report(snapshot: TaskSnapshot, bins: List[int], top: int, project_id: Optional[int] = None,
+                         readable: Optional[Sequence[int]] = None) -> AssigneeLoadReport:
+    """Histogram of open tasks per assignee (in ``readable`` projects when given) plus the most loaded assignees"""
+    open_tasks = _project_mask(snapshot, project_id, readable) & np.isin(snapshot.statuses, OPEN_CODES)
+    assigned = snapshot.assignees[open_tasks & (snapshot.assignees > 0)]
+    assignees, loads = _group_counts(assigned, np.zeros(len(assigned), dtype=np.int8), 1)
+    loads = loads[:, 0]
+
+    edges = np.array(sorted(set(bins)) + [np.iinfo(np.int64).max], dtype=np.int64)
+    histogram, _ = np.histogram(loads, bins=edges)
+    order = np.argsort(-loads, kind="stable")[:top]
+    return AssigneeLoadReport(
+        project_id=project_id,
+        assignees=len(assignees),
+        unassigned_open=int((open_tasks & (snapshot.assignees == 0)).sum()),
+        histogram=[
+            LoadBucket(min_open=int(low), max_open=None if i == len(histogram) - 1 else int(edges[i + 1]) - 1,
+                       assignees=int(count))
+            for i, (low, count) in enumerate(zip(edges[:-1], histogram))
+        ],
+        top_assignees=[AssigneeLoadItem(assigned_to=int(assignees[i]), open=int(loads[i])) for i in order]
+    )
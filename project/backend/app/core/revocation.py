@@ -0,0 +1,209 @@
+"""
+Token Revocation Module
+=======================
+Logout and revoke-all for JWT access tokens without a DB hit per request.
+
+Two mechanisms are stored durably:
+
+- ``revoked_tokens``: the ``jti`` of single access tokens (logout), kept
+  until the token would have expired anyway.
+- ``users.tokens_not_before``: tokens issued before it are rejected
+  (revoke every session of a user). It is read from the user row that
+  authentication already loads, so it costs nothing extra.
+
+Each worker mirrors the revoked ``jti`` values into a Bloom filter plus a
+small exact set of recent revocations. A negative check is answered from
+memory; only Bloom filter hits are confirmed with one primary key lookup.
+The scheduler pulls new revocations from other workers every
+``revocation_sync_seconds`` and rebuilds the filter hourly, dropping
+expired entries.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional
+from sqlmodel import Session, select, delete
+from ..models.revoked_token import RevokedToken
+from ..models.user import User
+from .database import engine
+from .refresh_tokens import revoke_user_refresh_tokens
+
+logger = logging.getLogger(__name__)
+
+# Target false positive rate of the Bloom filter
+FALSE_POSITIVE_RATE = 0.01
+MIN_CAPACITY = 10000
+# Revocations re-read on every sync, to cover commits that land out of order and clock skew
+SYNC_OVERLAP = timedelta(seconds=60)
+# Tokens confirmed not revoked after a Bloom filter hit, so a false positive costs one lookup
+MAX_CLEARED = 10000
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on a BLAKE2b digest)"""
+
+    def __init__(self, capacity: int, false_positive_rate: float = FALSE_POSITIVE_RATE):
+        self.capacity = max(capacity, 1)
+        self.size = max(int(-self.capacity * math.log(false_positive_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class RevocationList:
+    """In-process view of the revoked jti values"""
+
+    def __init__(self):
+        self.bloom = BloomFilter(MIN_CAPACITY)
+        self.recent: set[str] = set()  # revoked since the last rebuild, exact
+        self.cleared: "OrderedDict[str, None]" = OrderedDict()  # Bloom filter false positives
+        self.synced_at: Optional[datetime] = None  # None until first loaded
+        self.lock = threading.Lock()
+
+    def add(self, jtis: Iterable[str]) -> None:
+        with self.lock:
+            for jti in jtis:
+                if jti not in self.recent:
+                    self.recent.add(jti)
+                    self.bloom.add(jti)
+                self.cleared.pop(jti, None)
+
+    def load(self, session: Session, now: Optional[datetime] = None) -> int:
+        """Rebuild the filter from every unexpired revocation"""
+        now = now or datetime.utcnow()
+        jtis = session.exec(select(RevokedToken.jti).where(RevokedToken.expires_at > now)).all()
+        bloom = BloomFilter(max(len(jtis) * 2, MIN_CAPACITY))
+        for jti in jtis:
+            bloom.add(jti)
+        with self.lock:
+            self.bloom = bloom
+            self.recent = set()
+            self.cleared.clear()
+            self.synced_at = now
+        logger.info(f"Revocation filter loaded ({len(jtis)} tokens)")
+        return len(jtis)
+
+    def sync(self, session: Session, now: Optional[datetime] = None) -> int:
+        """Add revocations made since the last sync (by any worker)"""
+        now = now or datetime.utcnow()
+        if self.synced_at is None:
+            return self.load(session, now)
+        jtis = session.exec(
+            select(RevokedToken.jti).where(RevokedToken.revoked_at >= self.synced_at - SYNC_OVERLAP)
+        ).all()
+        self.add(jtis)
+        self.synced_at = now
+        if self.bloom.count > self.bloom.capacity:
+            # Past its capacity the false positive rate climbs: resize
+            self.load(session, now)
+        return len(jtis)
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """Answer from memory only: True for revoked tokens and unconfirmed Bloom filter hits"""
+        if jti in self.recent:
+            return True
+        return jti in self.bloom and jti not in self.cleared
+
+    def is_revoked(self, session: Session, jti: str) -> bool:
+        if self.synced_at is None:
+            self.load(session)
+        if jti in self.recent:
+            return True
+        if jti not in self.bloom or jti in self.cleared:
+            return False
+
+        # Bloom filter hit: confirm with the primary key
+        revoked = session.get(RevokedToken, jti) is not None
+        with self.lock:
+            if revoked:
+                self.recent.add(jti)
+            else:
+                self.cleared[jti] = None
+                while len(self.cleared) > MAX_CLEARED:
+                    self.cleared.popitem(last=False)
+        return revoked
+
+
+revocations = RevocationList()
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None)
+
+
+def is_token_revoked(session: Session, payload: Dict[str, Any], user: User) -> bool:
+    """
+    Check an authenticated token against revoke-all and single-token revocations.
+
+    Args:
+        session: Database session, used only to confirm a Bloom filter hit
+        payload: Decoded token claims
+        user: User the token belongs to (already loaded by authentication)
+    """
+    if user.tokens_not_before is not None and _utc(payload.get("iat", 0)) < user.tokens_not_before:
+        return True
+    jti = payload.get("jti")
+    return jti is not None and revocations.is_revoked(session, jti)
+
+
+def revoke_token(session: Session, payload: Dict[str, Any], user_id: int) -> None:
+    """
+    Revoke a single access token until it expires and commit.
+
+    Always commits, even for tokens without ``jti`` (issued before revocation
+    existed) or already revoked, so changes the caller left pending (the
+    refresh family revoked on logout) are saved.
+    """
+    jti = payload.get("jti")
+    if jti is not None and session.get(RevokedToken, jti) is None:
+        session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=_utc(payload["exp"])))
+    session.commit()
+    if jti is not None:
+        revocations.add([jti])
+
+
+def revoke_all_tokens(session: Session, user: User) -> None:
+    """
+    Reject every access and refresh token issued to a user so far and commit.
+
+    The cutoff is rounded up to the next second because token ``iat`` has
+    whole-second precision; tokens issued later start at the cutoff.
+    """
+    now = datetime.utcnow()
+    user.tokens_not_before = now.replace(microsecond=0) + timedelta(seconds=1)
+    session.add(user)
+    revoke_user_refresh_tokens(session, user.id, now)
+    session.commit()
+
+
+def sync_revocations() -> int:
+    """Pull revocations made by other workers (scheduler job)"""
+    with Session(engine) as session:
+        return revocations.sync(session)
+
+
+def rebuild_revocations() -> int:
+    """Delete expired revocations and rebuild the filter from the rest (scheduler job)"""
+    with Session(engine) as session:
+        now = datetime.utcnow()
+        session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        session.commit()
+        return revocations.load(session, now)
@@ -0,0 +1,51 @@
+"""
+Project Role Templates Module
+=============================
+Default roles created together with every new project.
+
+Templates come from the PROJECT_ROLE_TEMPLATES setting (a JSON list of
+{"name", "description", "capabilities"} objects) and fall back to the built-in roles. They
+are parsed and validated once and cached in memory.
+"""
+
+import json
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Tuple
+from ..models.project_role import ProjectRoleBase
+from .settings import get_settings
+
+DEFAULT_ROLE_TEMPLATES = (
+    {"name": "Administrador", "description": "Administrador del proyecto", "capabilities": "read,write,manage"},
+    {"name": "Desarrollador", "description": "Desarrollador del proyecto", "capabilities": "read,write"},
+    {"name": "Revisor", "description": "Revisor del proyecto", "capabilities": "read"},
+)
+
+
+@lru_cache
+def get_role_templates() -> Tuple[Dict[str, Any], ...]:
+    """
+    Get the role templates for new projects.
+
+    Returns:
+        Tuple of dicts with validated role name, description and capabilities
+
+    Raises:
+        ValueError: If PROJECT_ROLE_TEMPLATES is not a valid list of roles
+    """
+    raw = get_settings().project_role_templates
+    templates = json.loads(raw) if raw else DEFAULT_ROLE_TEMPLATES
+    if not isinstance(templates, (list, tuple)):
+        raise ValueError("PROJECT_ROLE_TEMPLATES must be a JSON list")
+
+    validated = []
+    for template in templates:
+        # project_id is a placeholder: only name, description and capabilities are templated
+        role = ProjectRoleBase.model_validate({**template, "project_id": 0})
+        validated.append({"name": role.name, "description": role.description, "capabilities": role.capabilities})
+    return tuple(validated)
+
+
+def default_role_rows(project_ids: Iterable[int]) -> List[Dict[str, Any]]:
+    """Build the role rows for the given projects, ready for a multi-row INSERT"""
+    templates = get_role_templates()
+    return [{**template, "project_id": project_id} for project_id in project_ids for template in templates]
@@ -6,9 +6,15 @@ Handles scheduled tasks and automation.
 
 import asyncio
 import logging
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Optional
 from .task_automation import update_overdue_tasks
+from .deletion import resume_deletion_jobs
+from .task_stats import reconcile_task_stats
+from .snapshots import write_snapshots
+from .refresh_tokens import purge_refresh_tokens
+from .revocation import sync_revocations, rebuild_revocations
+from .settings import get_settings
 from .database import get_session
 
 logger = logging.getLogger(__name__)
@@ -20,6 +26,9 @@ class TaskScheduler:
     def __init__(self):
         self.running = False
         self.task: Optional[asyncio.Task] = None
+        self.revocation_task: Optional[asyncio.Task] = None
+        # The stats table is populated by its migration, so the first reconcile waits a full interval
+        self.last_stats_reconcile = datetime.utcnow()
         
     async def start(self):
         """Start the scheduler"""
@@ -29,6 +38,7 @@ class TaskScheduler:
             
         self.running = True
         self.task = asyncio.create_task(self._run_scheduler())
+        self.revocation_task = asyncio.create_task(self._run_revocation_sync())
         logger.info("Task scheduler started")
         
     async def stop(self):
@@ -37,12 +47,13 @@ class TaskScheduler:
             return
             
         self.running = False
-        if self.task:
-            self.task.cancel()
-            try:
-                await self.task
-            except asyncio.CancelledError:
-                pass
+        for task in (self.task, self.revocation_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         logger.info("Task scheduler stopped")
         
     async def _run_scheduler(self):
@@ -50,6 +61,11 @@ class TaskScheduler:
         while self.running:
             try:
                 await self._check_and_update_overdue_tasks()
+                await self._resume_deletion_jobs()
+                await self._reconcile_task_stats()
+                await self._write_snapshots()
+                await self._purge_refresh_tokens()
+                await self._rebuild_revocations()
                 # Wait 1 hour before next check
                 await asyncio.sleep(3600)  # 3600 seconds = 1 hour
             except asyncio.CancelledError:
@@ -75,6 +91,62 @@ class TaskScheduler:
         except Exception as e:
             logger.error(f"Error updating overdue tasks: {e}")
 
+    async def _resume_deletion_jobs(self):
+        """Resume background deletions left unfinished or failed"""
+        try:
+            resumed = await asyncio.to_thread(resume_deletion_jobs)
+            if resumed > 0:
+                logger.info(f"Resumed {resumed} deletion jobs")
+        except Exception as e:
+            logger.error(f"Error resuming deletion jobs: {e}")
+
+    async def _reconcile_task_stats(self):
+        """Rebuild the task stats table once every stats_reconcile_hours"""
+        interval = timedelta(hours=get_settings().stats_reconcile_hours)
+        if datetime.utcnow() - self.last_stats_reconcile < interval:
+            return
+        try:
+            await asyncio.to_thread(reconcile_task_stats)
+            self.last_stats_reconcile = datetime.utcnow()
+        except Exception as e:
+            logger.error(f"Error reconciling task stats: {e}")
+
+    async def _write_snapshots(self):
+        """Rewrite the snapshot files when enabled and due (one worker at a time)"""
+        try:
+            await asyncio.to_thread(write_snapshots)
+        except Exception as e:
+            logger.error(f"Error writing snapshots: {e}")
+
+
+    async def _purge_refresh_tokens(self):
+        """Delete expired refresh tokens"""
+        try:
+            purged = await asyncio.to_thread(purge_refresh_tokens)
+            if purged > 0:
+                logger.info(f"Purged {purged} expired refresh tokens")
+        except Exception as e:
+            logger.error(f"Error purging refresh tokens: {e}")
+
+
+    async def _rebuild_revocations(self):
+        """Drop expired revocations and rebuild the revocation filter"""
+        try:
+            await asyncio.to_thread(rebuild_revocations)
+        except Exception as e:
+            logger.error(f"Error rebuilding revocation filter: {e}")
+
+    async def _run_revocation_sync(self):
+        """Pull token revocations made by other workers every revocation_sync_seconds"""
+        while self.running:
+            try:
+                await asyncio.sleep(get_settings().revocation_sync_seconds)
+                await asyncio.to_thread(sync_revocations)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error syncing token revocations: {e}")
+
 
 # Global scheduler instance
 scheduler = TaskScheduler()
@@ -1,3 +1,4 @@
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from jose import jwt, JWTError
@@ -13,11 +14,15 @@ def hash_password(p: str) -> str:
 def verify_password(p: str, hashed: str) -> bool:
     return pwd_context.verify(p, hashed)
 
-def create_access_token(data: dict[str, Any], expires_minutes: int) -> str:
+def create_access_token(data: dict[str, Any], expires_minutes: int, not_before: Optional[datetime] = None) -> str:
     settings = get_settings()
     to_encode = data.copy()
-    expire = datetime.now(tz=timezone.utc) + timedelta(minutes=expires_minutes)
-    to_encode.update({"exp": expire})
+    now = datetime.now(tz=timezone.utc)
+    expire = now + timedelta(minutes=expires_minutes)
+    # iat never precedes the user's revoke-all cutoff (naive UTC), or the new token would be rejected
+    issued_at = max(now, not_before.replace(tzinfo=timezone.utc)) if not_before else now
+    # jti identifies the token for logout
+    to_encode.update({"exp": expire, "iat": issued_at, "jti": secrets.token_hex(16)})
     return jwt.encode(to_encode, settings.secret_key, algorithm=ALGO)
 
 def decode_token(token: str) -> Optional[dict[str, Any]]:
@@ -9,6 +9,9 @@ load_dotenv()
 class Settings(BaseModel):
     secret_key: str = os.getenv("SECRET_KEY", "devsecret")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+    refresh_token_expire_days: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "30"))
+    revocation_sync_seconds: int = int(os.getenv("REVOCATION_SYNC_SECONDS", "15"))
+    admin_emails: list[str] = [e.strip().lower() for e in os.getenv("ADMIN_EMAILS", "").split(",") if e.strip()]
     
     # Database settings
     database_url: str = os.getenv("DATABASE_URL", "")  # Empty by default to use MySQL config
@@ -17,10 +20,44 @@ class Settings(BaseModel):
     mysql_user: str = os.getenv("MYSQL_USER", "root")
     mysql_password: str = os.getenv("MYSQL_PASSWORD", "root")
     mysql_database: str = os.getenv("MYSQL_DATABASE", "microcrm_db")
+    read_replica_urls: list[str] = [u.strip() for u in os.getenv("READ_REPLICA_URLS", "").split(",") if u.strip()]
+    read_replica_policy: str = os.getenv("READ_REPLICA_POLICY", "round_robin")  # or least_loaded
+    replica_max_lag_seconds: float = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+    replica_lag_check_seconds: float = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+    replica_sticky_seconds: float = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))  # reads on primary after a write
     
     cors_origins: list[str] = [o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:5173").split(",")]
     rate_limit_auth_per_min: int = int(os.getenv("RATE_LIMIT_AUTH_PER_MIN", "5"))
     rate_limit_api_per_min: int = int(os.getenv("RATE_LIMIT_API_PER_MIN", "60"))
+    bulk_max_items: int = int(os.getenv("BULK_MAX_ITEMS", "1000"))
+    export_batch_size: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    deletion_batch_size: int = int(os.getenv("DELETION_BATCH_SIZE", "1000"))
+    import_batch_size: int = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    project_role_templates: str = os.getenv("PROJECT_ROLE_TEMPLATES", "")  # JSON list of {"name", "description", "capabilities"}
+    import_hash_workers: int = int(os.getenv("IMPORT_HASH_WORKERS", str(os.cpu_count() or 4)))
+    stats_reconcile_hours: int = int(os.getenv("STATS_RECONCILE_HOURS", "24"))
+    calendar_index_projects: int = int(os.getenv("CALENDAR_INDEX_PROJECTS", "0"))  # 0 disables the in-memory index
+    calendar_index_ttl_seconds: int = int(os.getenv("CALENDAR_INDEX_TTL_SECONDS", "60"))
+    calendar_index_max_tasks: int = int(os.getenv("CALENDAR_INDEX_MAX_TASKS", "50000"))
+    report_snapshot_max_age_seconds: int = int(os.getenv("REPORT_SNAPSHOT_MAX_AGE_SECONDS", "60"))
+    snapshot_dir: str = os.getenv("SNAPSHOT_DIR", "")  # Empty disables snapshot files
+    snapshot_interval_minutes: int = int(os.getenv("SNAPSHOT_INTERVAL_MINUTES", "60"))
+    snapshot_max_age_minutes: int = int(os.getenv("SNAPSHOT_MAX_AGE_MINUTES", "180"))
+    permission_cache_users: int = int(os.getenv("PERMISSION_CACHE_USERS", "10000"))  # 0 disables the cache
+    permission_cache_ttl_seconds: int = int(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "300"))
+    # Concurrent requests per worker (default: SQLAlchemy's pool of 5 + 10 overflow); 0 disables admission control
+    admission_max_concurrency: int = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "15"))
+    admission_max_queue: int = int(os.getenv("ADMISSION_MAX_QUEUE", "100"))  # waiting requests per priority class
+    admission_queue_timeout_ms: int = int(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "2000"))
+    # Response encodings in preference order (zstd/br need their packages); empty disables compression
+    compression_encodings: list[str] = [e.strip() for e in os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip").split(",") if e.strip()]
+    compression_min_size: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))  # bytes
+    compression_gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    compression_brotli_level: int = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "5"))
+    compression_zstd_level: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    compression_cache_mb: int = int(os.getenv("COMPRESSION_CACHE_MB", "32"))  # 0 disables the compressed body cache
+    batch_max_requests: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))  # sub-requests per POST /api/batch
+    batch_max_concurrency: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))  # concurrent GET sub-requests per batch
 
 @lru_cache
 def get_settings() -> Settings:
@@ -0,0 +1,96 @@
+"""
+Normalized Responses Module
+===========================
+Handles ``?shape=normalized`` on list endpoints. Instead of repeating the
+related project, user and role attributes on every row, items keep only
+their foreign keys and each related entity is sent once in ``included``,
+keyed by collection and id:
+
+    {"items": [{"id": 1, "project_id": 7, "assigned_to": 3, ...}],
+     "included": {"projects": {"7": {"name": ..., "description": ...}},
+                  "users": {"3": {"name": ..., "email": ...}}}}
+
+Each related table is read with one ``IN`` query over the distinct ids of
+the page, so both the payload and the lookups grow with the number of
+distinct related entities rather than with the number of rows. Combined
+with ``fields``, only the requested related attributes are loaded.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+from fastapi import Query
+from sqlmodel import Session, SQLModel, select
+from .fieldsets import wants, columns_for
+
+
+class Relation(NamedTuple):
+    """Related entity side-loaded into ``included``"""
+    foreign_key: str         # item attribute holding the related id
+    collection: str          # key under "included"
+    model: type[SQLModel]
+    fields: Dict[str, str]   # nested response field -> related column
+
+
+def normalized_shape(
+    shape: str = Query(
+        default="nested",
+        pattern="^(nested|normalized)$",
+        description="nested repeats related attributes on every item; normalized side-loads them in 'included'"
+    )
+) -> bool:
+    """Dependency telling whether the normalized shape was requested"""
+    return shape == "normalized"
+
+
+def normalized_columns(
+    model: type[SQLModel],
+    response_model: type[SQLModel],
+    relations: Iterable[Relation],
+    fieldset: Optional[Set[str]]
+) -> list:
+    """
+    Get the table columns of normalized items: the requested attributes of the
+    item itself plus the foreign key of every relation with requested fields.
+    """
+    relations = list(relations)
+    related_fields = {name for relation in relations for name in relation.fields}
+    requested = set(response_model.model_fields) if fieldset is None else set(fieldset)
+    foreign_keys = [relation.foreign_key for relation in relations if wants(fieldset, relation.fields)]
+    return columns_for(model, requested - related_fields, *foreign_keys)
+
+
+def side_load(
+    session: Session,
+    rows: List[dict],
+    relations: Iterable[Relation],
+    fieldset: Optional[Set[str]] = None
+) -> Dict[str, Dict[int, Dict[str, Any]]]:
+    """
+    Load the related entities referenced by a page of items.
+
+    Args:
+        session: Database session
+        rows: Item dicts holding the foreign keys
+        relations: Related entities of the item type
+        fieldset: Requested response fields (None means all)
+
+    Returns:
+        Mapping of collection name to {id: attributes}, one query per relation
+    """
+    included: Dict[str, Dict[int, Dict[str, Any]]] = {}
+    for relation in relations:
+        if not wants(fieldset, relation.fields):
+            continue
+        names = [
+            column for field, column in relation.fields.items()
+            if fieldset is None or field in fieldset
+        ]
+        ids = {row[relation.foreign_key] for row in rows if row[relation.foreign_key] is not None}
+        entities = included.setdefault(relation.collection, {})
+        if not ids:
+            continue
+        statement = select(relation.model.id, *(getattr(relation.model, name) for name in names)).where(
+            relation.model.id.in_(ids)
+        )
+        for row in session.execute(statement).mappings():
+            entities[row["id"]] = {name: row[name] for name in names}
+    return included
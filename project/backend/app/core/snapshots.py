@@ -0,0 +1,229 @@
+"""
+Snapshot Files Module
+=====================
+Compact on-disk snapshots of the task columns used by the reports.
+
+Each table is stored in its own file: a fixed prefix (magic, format
+version, header length), a small JSON header describing the columns, then
+every column as a contiguous fixed-width array aligned to 64 bytes.
+Readers ``mmap`` the file read-only and get NumPy views over it, so all
+workers on a host share one copy through the page cache instead of each
+loading the tables from MySQL after a deploy.
+
+A writer job (run by the scheduler, one worker at a time) rewrites the
+files atomically. Readers reject files with another format version or
+older than ``snapshot_max_age_minutes`` and fall back to the database.
+
+Users and project memberships are deliberately not snapshotted. The
+permission index is loaded lazily, one indexed query per principal, not
+in bulk at startup. It also cannot use data hours old: a removed member
+would keep access, while the index bounds staleness across workers to
+``permission_cache_ttl_seconds``. Memberships have no change watermark
+that would let a reader apply only the changes since the snapshot.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+from sqlmodel import Session
+from .database import engine
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MCRMSNAP"
+FORMAT_VERSION = 1
+PREFIX = struct.Struct("<8sII")  # magic, format version, header length
+ALIGN = 64
+# Only tables with a reader: users and memberships are not snapshotted (see the module docstring)
+SNAPSHOT_TABLES = ("tasks",)
+
+
+@dataclass(frozen=True)
+class MappedTable:
+    """Read-only column views over a snapshot file"""
+    name: str
+    version: str  # creation time of the file, changes on every write
+    created_at: datetime
+    rows: int
+    columns: Dict[str, np.ndarray]
+    meta: dict
+
+
+def snapshot_path(table: str) -> Optional[str]:
+    """Path of a table snapshot, or None when snapshots are disabled"""
+    directory = get_settings().snapshot_dir
+    return os.path.join(directory, f"{table}.snap") if directory else None
+
+
+def write_table(path: str, columns: Dict[str, np.ndarray], meta: Optional[dict] = None) -> None:
+    """
+    Write columns of equal length to a snapshot file, atomically replacing the old one.
+    Readers that mapped the previous file keep a valid mapping of it.
+    """
+    rows = len(next(iter(columns.values()))) if columns else 0
+    layout, offset = [], 0
+    for name, values in columns.items():
+        if len(values) != rows:
+            raise ValueError(f"Column {name} has {len(values)} rows, expected {rows}")
+        layout.append({"name": name, "dtype": values.dtype.str, "offset": offset})
+        offset += -(-values.nbytes // ALIGN) * ALIGN
+
+    header = json.dumps({
+        "rows": rows,
+        "created_at": datetime.utcnow().isoformat(),
+        "columns": layout,
+        "meta": meta or {},
+    }).encode("utf-8")
+    data_start = -(-(PREFIX.size + len(header)) // ALIGN) * ALIGN
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".snap-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            for column, values in zip(layout, columns.values()):
+                f.seek(data_start + column["offset"])
+                f.write(np.ascontiguousarray(values).tobytes())
+            f.truncate(data_start + offset)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def read_table(path: str, max_age: Optional[timedelta] = None) -> Optional[MappedTable]:
+    """
+    Map a snapshot file read-only.
+
+    Args:
+        path: Snapshot file
+        max_age: Reject files created longer ago than this
+
+    Returns:
+        The mapped table, or None if the file is missing, from another format version or stale
+    """
+    try:
+        with open(path, "rb") as f:
+            magic, version, header_length = PREFIX.unpack(f.read(PREFIX.size))
+            if magic != MAGIC or version != FORMAT_VERSION:
+                logger.warning(f"Ignoring snapshot {path}: unsupported format")
+                return None
+            header = json.loads(f.read(header_length))
+            created_at = datetime.fromisoformat(header["created_at"])
+            if max_age is not None and datetime.utcnow() - created_at > max_age:
+                return None
+            # The mapping outlives the file object; arrays keep it alive through their base
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logger.warning(f"Ignoring snapshot {path}: {e}")
+        return None
+
+    data_start = -(-(PREFIX.size + header_length) // ALIGN) * ALIGN
+    rows = header["rows"]
+    columns = {
+        column["name"]: np.frombuffer(
+            mapped, dtype=np.dtype(column["dtype"]), count=rows, offset=data_start + column["offset"]
+        )
+        for column in header["columns"]
+    }
+    return MappedTable(
+        name=os.path.basename(path).removesuffix(".snap"),
+        version=header["created_at"],
+        created_at=created_at,
+        rows=rows,
+        columns=columns,
+        meta=header["meta"],
+    )
+
+
+def load_snapshot(table: str) -> Optional[MappedTable]:
+    """Map a table snapshot if snapshots are enabled and the file is fresh enough"""
+    path = snapshot_path(table)
+    if path is None:
+        return None
+    return read_table(path, timedelta(minutes=get_settings().snapshot_max_age_minutes))
+
+
+# Loaders return (columns, header metadata)
+TableData = Tuple[Dict[str, np.ndarray], dict]
+
+
+def _task_columns(session: Session) -> TableData:
+    # Same columns as the report snapshot, which maps this file on cold start
+    from .reports import TASK_COLUMN_NAMES, build_snapshot
+    snapshot = build_snapshot(session)
+    meta = {"watermark": snapshot.watermark.isoformat()} if snapshot.watermark else {}
+    return {name: getattr(snapshot, name) for name in TASK_COLUMN_NAMES}, meta
+
+
+TABLE_LOADERS: Dict[str, Callable[[Session], TableData]] = {
+    "tasks": _task_columns,
+}
+
+
+def _try_lock(lock_file) -> bool:
+    """
+    Take an exclusive, non-blocking lock on an open file (released when it is closed).
+    The lock modules are platform-specific, so they are imported only when snapshots are enabled.
+    """
+    if os.name == "nt":
+        import msvcrt
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    import fcntl
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def write_snapshots(force: bool = False) -> bool:
+    """
+    Rewrite every table snapshot from the database (scheduler job).
+
+    Only one process writes at a time (file lock), and nothing is written
+    while the current files are younger than snapshot_interval_minutes.
+
+    Returns:
+        True if the snapshots were written
+    """
+    settings = get_settings()
+    if not settings.snapshot_dir:
+        return False
+    os.makedirs(settings.snapshot_dir, exist_ok=True)
+
+    with open(os.path.join(settings.snapshot_dir, ".lock"), "w") as lock:
+        if not _try_lock(lock):
+            return False
+
+        current = read_table(snapshot_path("tasks"))
+        if not force and current and datetime.utcnow() - current.created_at < timedelta(
+            minutes=settings.snapshot_interval_minutes
+        ):
+            return False
+
+        with Session(engine) as session:
+            for table in SNAPSHOT_TABLES:
+                columns, meta = TABLE_LOADERS[table](session)
+                write_table(snapshot_path(table), columns, meta)
+                logger.info(f"Snapshot {table} written ({len(columns['ids'])} rows)")
+        return True
@@ -0,0 +1,183 @@
+"""
+Statement Cache Module
+======================
+Hot query shapes built once and reused across requests.
+
+SQLAlchemy caches compiled SQL by a statement's cache key, but building a
+new ``select()`` per request still pays for the expression tree and for
+computing its key (a full traversal), close to a millisecond for a
+filtered list with its count subquery. The factories below build each
+query shape once (which filters are present, the selected columns, the
+order column and direction) with bind parameters in place of the values,
+and keep it in an LRU. A reused statement has its cache key memoized, so
+executing it skips construction, key generation and compilation; the
+values are passed as ``params``.
+
+Ordering only accepts the columns listed in ``ORDERABLE_COLUMNS``.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Type
+from fastapi import HTTPException
+from sqlalchemy import Integer, bindparam
+from sqlalchemy.sql import Select
+from sqlmodel import SQLModel, select, func
+from ..models.project import Project
+from ..models.project_member import ProjectMember
+from ..models.project_role import ProjectRole
+from ..models.task import Task
+from ..models.user import User
+from .deletion import deleting_projects, deleting_users
+
+# Columns list endpoints may order by (?order_by=)
+ORDERABLE_COLUMNS: Dict[Type[SQLModel], Tuple[str, ...]] = {
+    Task: ("id", "title", "status", "project_id", "assigned_to", "due_date", "created_at", "updated_at"),
+    Project: ("id", "name", "id_user", "created_at", "updated_at"),
+    User: ("id", "name", "email", "active", "created_at", "updated_at"),
+    ProjectMember: ("id", "project_id", "user_id", "project_role_id", "created_at"),
+}
+
+# Distinct shapes kept per factory (fieldsets make the space large but skewed)
+STATEMENT_CACHE_SIZE = 256
+
+ColumnNames = Optional[Tuple[str, ...]]
+StatementPair = Tuple[Select, Select]
+
+
+def order_column_name(model: Type[SQLModel], order_by: str) -> str:
+    """
+    Validate an order_by parameter against the model's orderable columns.
+
+    Raises:
+        HTTPException: 400 if the column cannot be ordered by
+    """
+    allowed = ORDERABLE_COLUMNS[model]
+    if order_by not in allowed:
+        raise HTTPException(status_code=400, detail=f"order_by must be one of: {', '.join(allowed)}")
+    return order_by
+
+
+def column_names(columns: Optional[Iterable]) -> ColumnNames:
+    """Hashable form of a projected column list (None selects the whole model)"""
+    return None if columns is None else tuple(column.key for column in columns)
+
+
+def _select(model: Type[SQLModel], columns: ColumnNames) -> Select:
+    return select(model) if columns is None else select(*(getattr(model, name) for name in columns))
+
+
+def _paged(statement: Select, model: Type[SQLModel], order_by: str, descending: bool) -> StatementPair:
+    """Page statement (ordered, :skip/:limit) and count statement of a filtered select"""
+    count = select(func.count()).select_from(statement.subquery())
+    column = getattr(model, order_by)
+    page = (
+        statement.order_by(column.desc() if descending else column.asc())
+        .offset(bindparam("skip", type_=Integer))
+        .limit(bindparam("limit", type_=Integer))
+    )
+    return page, count
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def task_list_statements(columns: ColumnNames, filters: frozenset, order_by: str, descending: bool) -> StatementPair:
+    """
+    Task list shape.
+
+    Params: project_ids (readable projects) plus one per filter present:
+    search (LIKE pattern), status, project_id, assigned_to, due_from, due_to.
+    """
+    statement = _select(Task, columns).where(
+        Task.project_id.not_in(deleting_projects()),
+        Task.project_id.in_(bindparam("project_ids", expanding=True))
+    )
+    if "search" in filters:
+        statement = statement.where(Task.title.like(bindparam("search")) | Task.description.like(bindparam("search")))
+    for name in ("status", "project_id", "assigned_to"):
+        if name in filters:
+            statement = statement.where(getattr(Task, name) == bindparam(name))
+    if "due_from" in filters:
+        statement = statement.where(Task.due_date >= bindparam("due_from"))
+    if "due_to" in filters:
+        statement = statement.where(Task.due_date < bindparam("due_to"))
+    return _paged(statement, Task, order_by, descending)
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def project_tasks_statement(columns: ColumnNames) -> Select:
+    """Tasks of a project, newest first. Params: project_id"""
+    return _select(Task, columns).where(Task.project_id == bindparam("project_id")).order_by(Task.created_at.desc())
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def member_list_statements(columns: ColumnNames, filters: frozenset, order_by: str, descending: bool) -> StatementPair:
+    """
+    Project member list shape.
+
+    Params: project_ids (readable projects) plus project_id and user_id when filtered.
+    """
+    statement = _select(ProjectMember, columns).where(
+        ProjectMember.project_id.not_in(deleting_projects()),
+        ProjectMember.user_id.not_in(deleting_users()),
+        ProjectMember.project_id.in_(bindparam("project_ids", expanding=True))
+    )
+    for name in ("project_id", "user_id"):
+        if name in filters:
+            statement = statement.where(getattr(ProjectMember, name) == bindparam(name))
+    return _paged(statement, ProjectMember, order_by, descending)
+
+
+@lru_cache(maxsize=1)
+def project_task_page_statement() -> Select:
+    """First tasks of a project, newest first. Params: project_id, limit"""
+    return select(Task).where(Task.project_id == bindparam("project_id")).order_by(
+        Task.created_at.desc(), Task.id.desc()
+    ).limit(bindparam("limit", type_=Integer))
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def project_members_statement(columns: ColumnNames) -> Select:
+    """Members of a project, newest first. Params: project_id"""
+    return _select(ProjectMember, columns).where(
+        ProjectMember.project_id == bindparam("project_id"),
+        ProjectMember.user_id.not_in(deleting_users())
+    ).order_by(ProjectMember.created_at.desc())
+
+
+@lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def user_memberships_statement(columns: ColumnNames) -> Select:
+    """Memberships of a user in readable projects, newest first. Params: user_id, project_ids"""
+    return _select(ProjectMember, columns).where(
+        ProjectMember.user_id == bindparam("user_id"),
+        ProjectMember.project_id.not_in(deleting_projects()),
+        ProjectMember.project_id.in_(bindparam("project_ids", expanding=True))
+    ).order_by(ProjectMember.created_at.desc())
+
+
+@lru_cache(maxsize=1)
+def project_roles_statement() -> Select:
+    """Roles of a project by name. Params: project_id"""
+    return select(ProjectRole).where(ProjectRole.project_id == bindparam("project_id")).order_by(ProjectRole.name.asc())
+
+
+@lru_cache(maxsize=1)
+def project_with_creator_statement() -> Select:
+    """Project and its creator (None if missing) in one query. Params: project_id"""
+    return select(Project, User).join(User, User.id == Project.id_user, isouter=True).where(
+        Project.id == bindparam("project_id")
+    )
+
+
+@lru_cache(maxsize=1)
+def user_by_email_statement() -> Select:
+    """User with an email (login, registration). Params: email"""
+    return select(User).where(User.email == bindparam("email"))
+
+
+@lru_cache(maxsize=1)
+def overdue_tasks_statement() -> Select:
+    """Pending or in-progress tasks due before a time (overdue sweep). Params: now"""
+    return select(Task).where(
+        Task.due_date.is_not(None),
+        Task.due_date < bindparam("now"),
+        Task.status.in_(["pending", "in_progress"])
+    )
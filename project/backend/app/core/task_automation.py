@@ -9,6 +9,10 @@ from datetime import datetime
 from typing import List
 from ..models.task import Task
 from .database import get_session
+from .task_stats import task_key, apply_task_changes
+from .calendar import invalidate_calendar
+from .task_history import record_transitions
+from .statements import overdue_tasks_statement
 
 
 def update_overdue_tasks(session: Session) -> int:
@@ -29,22 +33,23 @@ def update_overdue_tasks(session: Session) -> int:
     
     # Find tasks that should be marked as overdue
     # ONLY pending and in_progress tasks can be automatically marked as overdue
-    statement = select(Task).where(
-        Task.due_date.is_not(None),  # Has due date
-        Task.due_date < current_time,  # Due date has passed
-        Task.status.in_(["pending", "in_progress"])  # ONLY these statuses
-    )
-    
-    overdue_tasks = session.exec(statement).all()
+    overdue_tasks = session.exec(overdue_tasks_statement(), params={"now": current_time}).all()
     
     # Update status to overdue
     updated_count = 0
+    removed, added, transitions = [], [], []
     for task in overdue_tasks:
+        removed.append(task_key(task))
+        transitions.append((task.id, task.project_id, task.status, "overdue", task.created_at))
         task.status = "overdue"
+        added.append(task_key(task))
         updated_count += 1
     
     if updated_count > 0:
+        apply_task_changes(session, removed, added)
+        record_transitions(session, transitions)
         session.commit()
+        invalidate_calendar(project_id for project_id, _, _ in added)
     
     return updated_count
 
@@ -92,8 +97,12 @@ def mark_task_overdue_if_needed(session: Session, task: Task) -> bool:
     current_time = datetime.utcnow()
     
     if task.due_date < current_time:
+        old_key = task_key(task)
         task.status = "overdue"
+        apply_task_changes(session, removed=[old_key], added=[task_key(task)])
+        record_transitions(session, [(task.id, task.project_id, old_key[2], task.status, task.created_at)])
         session.commit()
+        invalidate_calendar([task.project_id])
         return True
         
     return False
@@ -0,0 +1,146 @@
+"""
+Task History Module
+===================
+Append-only status transition log with daily per-project rollups.
+
+Every status change (including creation and deletion) is appended to
+``task_status_history`` and counted in ``project_status_daily`` in the
+caller's transaction: one executemany INSERT and one executemany upsert per
+write, however many tasks it touches, and nothing when no status changes.
+Burndown and cycle-time charts read the daily rollup, never the log.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlmodel import Session, select, insert, delete
+from ..models.task import TASK_STATUSES, OPEN_TASK_STATUSES
+from ..models.task_history import (
+    TaskStatusHistory, ProjectStatusDaily, BurndownDay, BurndownResponse, CycleTimeDay, CycleTimeResponse
+)
+from .bulk import upsert_increments
+
+# Longest range a single chart request may cover
+MAX_CHART_DAYS = 366
+
+# (task_id, project_id, from_status, to_status, task created_at)
+# from_status None = created, to_status None = deleted; created_at is used for cycle time
+Transition = Tuple[int, int, Optional[str], Optional[str], Optional[datetime]]
+
+
+def record_transitions(session: Session, transitions: Iterable[Transition], now: Optional[datetime] = None) -> None:
+    """
+    Log status transitions and add them to the daily rollup (not committed here).
+    Transitions where the status did not change are ignored.
+    """
+    now = now or datetime.utcnow()
+    today = now.date()
+    log_rows = []
+    rollup: Dict[Tuple[int, str], List[int]] = defaultdict(lambda: [0, 0, 0])  # entered, exited, cycle seconds
+
+    for task_id, project_id, from_status, to_status, created_at in transitions:
+        if from_status == to_status:
+            continue
+        log_rows.append({
+            "task_id": task_id,
+            "project_id": project_id,
+            "from_status": from_status,
+            "to_status": to_status,
+            "changed_at": now,
+        })
+        if from_status is not None:
+            rollup[(project_id, from_status)][1] += 1
+        if to_status is not None:
+            rollup[(project_id, to_status)][0] += 1
+            if to_status == "completed" and created_at is not None:
+                rollup[(project_id, to_status)][2] += max(int((now - created_at).total_seconds()), 0)
+
+    if not log_rows:
+        return
+    session.execute(insert(TaskStatusHistory), log_rows)
+    upsert_increments(
+        session,
+        ProjectStatusDaily,
+        [
+            {"project_id": project_id, "day": today, "status": status,
+             "entered": entered, "exited": exited, "cycle_seconds": cycle_seconds}
+            for (project_id, status), (entered, exited, cycle_seconds) in rollup.items()
+        ],
+        ("project_id", "day", "status"),
+        ("entered", "exited", "cycle_seconds")
+    )
+
+
+def clear_project_rollup(session: Session, project_id: int) -> None:
+    """Drop the daily rollup rows of a project (not committed here)"""
+    session.exec(delete(ProjectStatusDaily).where(ProjectStatusDaily.project_id == project_id))
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def project_burndown(session: Session, project_id: int, start: date, end: date) -> BurndownResponse:
+    """
+    Open, completed and cancelled task counts at the end of each day.
+
+    Counts are running sums of the rollup's (entered - exited) per status, so
+    the result is built from at most one row per day and status.
+    """
+    rows = session.exec(
+        select(ProjectStatusDaily.day, ProjectStatusDaily.status, ProjectStatusDaily.entered,
+               ProjectStatusDaily.exited)
+        .where(ProjectStatusDaily.project_id == project_id, ProjectStatusDaily.day <= end)
+        .order_by(ProjectStatusDaily.day)
+    ).all()
+
+    counts = dict.fromkeys(TASK_STATUSES, 0)
+    net_by_day: Dict[date, Dict[str, int]] = defaultdict(dict)
+    for day, status, entered, exited in rows:
+        if day < start:
+            counts[status] = counts.get(status, 0) + entered - exited
+        else:
+            net_by_day[day][status] = net_by_day[day].get(status, 0) + entered - exited
+
+    days = []
+    for day in _days(start, end):
+        for status, net in net_by_day.get(day, {}).items():
+            counts[status] = counts.get(status, 0) + net
+        days.append(BurndownDay(
+            day=day,
+            open=sum(counts[status] for status in OPEN_TASK_STATUSES),
+            completed=counts["completed"],
+            cancelled=counts["cancelled"]
+        ))
+    return BurndownResponse(project_id=project_id, start=start, end=end, days=days)
+
+
+def project_cycle_time(session: Session, project_id: int, start: date, end: date) -> CycleTimeResponse:
+    """Tasks completed per day and their average time from creation to completion"""
+    rows = session.exec(
+        select(ProjectStatusDaily.day, ProjectStatusDaily.entered, ProjectStatusDaily.cycle_seconds).where(
+            ProjectStatusDaily.project_id == project_id,
+            ProjectStatusDaily.status == "completed",
+            ProjectStatusDaily.day >= start,
+            ProjectStatusDaily.day <= end
+        )
+    ).all()
+    by_day = {day: (entered, cycle_seconds) for day, entered, cycle_seconds in rows}
+
+    def average_hours(completed: int, cycle_seconds: int) -> Optional[float]:
+        return round(cycle_seconds / completed / 3600, 2) if completed else None
+
+    days = [
+        CycleTimeDay(day=day, completed=by_day.get(day, (0, 0))[0],
+                     avg_cycle_hours=average_hours(*by_day.get(day, (0, 0))))
+        for day in _days(start, end)
+    ]
+    completed = sum(entered for entered, _ in by_day.values())
+    return CycleTimeResponse(
+        project_id=project_id,
+        start=start,
+        end=end,
+        completed=completed,
+        avg_cycle_hours=average_hours(completed, sum(cycle for _, cycle in by_day.values())),
+        days=days
+    )
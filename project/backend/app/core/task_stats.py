@@ -0,0 +1,150 @@
+"""
+Task Statistics Module
+======================
+Per-project task counts kept in the ``project_task_stats`` summary table.
+
+Each row holds how many tasks of a project have a given assignee and
+status. Every write path that creates, moves or deletes tasks applies the
+matching +1/-1 deltas with an atomic upsert in its own transaction, so the
+stats endpoint reads a handful of small rows instead of scanning the
+tasks table. A periodic reconcile job rebuilds the table from the tasks
+to repair any drift.
+"""
+
+import logging
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple
+from sqlmodel import Session, select, delete, func
+from ..models.task import Task, TASK_STATUSES, OPEN_TASK_STATUSES
+from ..models.task_stats import ProjectTaskStat, ProjectTaskStatsResponse, AssigneeLoad
+from .database import engine
+from .bulk import upsert_increments
+
+logger = logging.getLogger(__name__)
+
+# (project_id, assigned_to, status) of a task
+TaskKey = Tuple[int, Optional[int], str]
+
+# Rows written per statement when rebuilding the table
+REBUILD_CHUNK = 1000
+
+
+def task_key(task: Task) -> TaskKey:
+    """Get the stats key a task is counted under"""
+    return task.project_id, task.assigned_to, task.status
+
+
+def _upsert_counts(session: Session, counts: Counter) -> None:
+    """Add each count to its stats row, creating missing rows (one executemany)"""
+    rows = [
+        {"project_id": project_id, "assignee_id": assignee_id, "status": status, "task_count": count}
+        for (project_id, assignee_id, status), count in counts.items() if count
+    ]
+    upsert_increments(session, ProjectTaskStat, rows, ("project_id", "assignee_id", "status"), ("task_count",))
+
+
+def apply_task_changes(
+    session: Session,
+    removed: Iterable[TaskKey] = (),
+    added: Iterable[TaskKey] = ()
+) -> None:
+    """
+    Record tasks leaving and entering stats keys in the caller's transaction.
+
+    Args:
+        session: Database session (not committed here)
+        removed: Keys of deleted tasks, or the old keys of changed tasks
+        added: Keys of created tasks, or the new keys of changed tasks
+    """
+    counts: Counter = Counter()
+    for project_id, assigned_to, status in removed:
+        counts[(project_id, assigned_to or 0, status)] -= 1
+    for project_id, assigned_to, status in added:
+        counts[(project_id, assigned_to or 0, status)] += 1
+    _upsert_counts(session, counts)
+
+
+def clear_project_stats(session: Session, project_id: int) -> None:
+    """Drop the stats rows of a project (not committed here)"""
+    session.exec(delete(ProjectTaskStat).where(ProjectTaskStat.project_id == project_id))
+
+
+def get_project_stats(session: Session, project_id: int) -> ProjectTaskStatsResponse:
+    """
+    Build a project's statistics from its stats rows.
+
+    Args:
+        session: Database session
+        project_id: Project to summarize
+
+    Returns:
+        Totals by status, overdue count and per-assignee load
+    """
+    rows = session.exec(
+        select(ProjectTaskStat.assignee_id, ProjectTaskStat.status, ProjectTaskStat.task_count).where(
+            ProjectTaskStat.project_id == project_id,
+            ProjectTaskStat.task_count > 0
+        )
+    ).all()
+
+    by_status = dict.fromkeys(TASK_STATUSES, 0)
+    loads = {}
+    for assignee_id, status, count in rows:
+        by_status[status] = by_status.get(status, 0) + count
+        load = loads.setdefault(assignee_id, AssigneeLoad(assigned_to=assignee_id or None, total=0, open=0))
+        load.total += count
+        if status in OPEN_TASK_STATUSES:
+            load.open += count
+
+    return ProjectTaskStatsResponse(
+        project_id=project_id,
+        total=sum(by_status.values()),
+        by_status=by_status,
+        overdue=by_status["overdue"],
+        by_assignee=sorted(loads.values(), key=lambda load: (-load.open, load.assigned_to or 0))
+    )
+
+
+def rebuild_project_stats(session: Session, project_ids: Optional[List[int]] = None) -> int:
+    """
+    Recompute stats rows from the tasks table and commit.
+
+    The aggregate is read with a plain (non-locking) SELECT and the summary
+    rows are replaced afterwards, so task writes are not blocked while the
+    tasks table is scanned.
+
+    Args:
+        session: Database session
+        project_ids: Projects to rebuild, or None for all of them
+
+    Returns:
+        Number of stats rows written
+    """
+    statement = select(
+        Task.project_id, func.coalesce(Task.assigned_to, 0), Task.status, func.count()
+    ).group_by(Task.project_id, func.coalesce(Task.assigned_to, 0), Task.status)
+    clear = delete(ProjectTaskStat)
+    if project_ids is not None:
+        if not project_ids:
+            return 0
+        statement = statement.where(Task.project_id.in_(project_ids))
+        clear = clear.where(ProjectTaskStat.project_id.in_(project_ids))
+
+    rows = [
+        {"project_id": project_id, "assignee_id": assignee_id, "status": status, "task_count": count}
+        for project_id, assignee_id, status, count in session.exec(statement).all()
+    ]
+
+    session.exec(clear)
+    for start in range(0, len(rows), REBUILD_CHUNK):
+        session.execute(ProjectTaskStat.__table__.insert(), rows[start:start + REBUILD_CHUNK])
+    session.commit()
+    return len(rows)
+
+
+def reconcile_task_stats() -> int:
+    """Fully rebuild the stats table in its own session (scheduler job)"""
+    with Session(engine) as session:
+        written = rebuild_project_stats(session)
+    logger.info(f"Task stats reconciled ({written} rows)")
+    return written
@@ -11,7 +11,10 @@ from .core.exceptions import (
     general_exception_handler
 )
 from .core.scheduler import start_scheduler, stop_scheduler
-from .api.routes import auth, users, projects, tasks, project_members, project_roles
+from .core.admission import AdmissionMiddleware, get_admission_controller
+from .core.replicas import ReplicaStickinessMiddleware, replicas
+from .core.compression import CompressionMiddleware, get_compressor
+from .api.routes import auth, users, projects, tasks, project_members, project_roles, imports, deletion_jobs, me, reports, batch
 
 
 @asynccontextmanager
@@ -36,6 +39,15 @@ app = FastAPI(
 
 settings = get_settings()
 
+# Read-your-writes: a user's reads go to the primary for a while after a write
+app.add_middleware(ReplicaStickinessMiddleware)
+
+# Admission control (added first so CORS wraps it and 503 responses carry CORS headers)
+app.add_middleware(AdmissionMiddleware)
+
+# Response compression (outside admission control, so compressing does not hold a slot)
+app.add_middleware(CompressionMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -43,7 +55,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With"],
-    expose_headers=["Content-Length", "X-Total-Count"],
+    expose_headers=["Content-Length", "X-Total-Count", "Retry-After", "ETag"],
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
@@ -57,6 +69,21 @@ app.add_exception_handler(Exception, general_exception_handler)
 def health():
     return {"status": "ok", "message": "Micro CRM API is running"}
 
+@app.get("/health/admission")
+async def health_admission():
+    """Admission control counters of this worker (queue depth, shed requests)"""
+    return get_admission_controller().snapshot()
+
+@app.get("/health/compression")
+async def health_compression():
+    """Bandwidth saved by response compression in this worker"""
+    return get_compressor().snapshot()
+
+@app.get("/health/replicas")
+def health_replicas():
+    """Read replicas with their last measured lag"""
+    return replicas.status()
+
 @app.get("/")
 def root():
     return {
@@ -68,7 +95,12 @@ def root():
             "projects": "/api/projects", 
             "tasks": "/api/tasks",
             "project_members": "/api/project-members",
-            "project_roles": "/api/project-roles"
+            "project_roles": "/api/project-roles",
+            "import": "/api/import",
+            "deletion_jobs": "/api/deletion-jobs",
+            "me": "/api/me",
+            "reports": "/api/reports",
+            "batch": "/api/batch"
         }
     }
 
@@ -79,3 +111,8 @@ app.include_router(projects.router, prefix="/api")
 app.include_router(tasks.router, prefix="/api")
 app.include_router(project_members.router, prefix="/api")
 app.include_router(project_roles.router, prefix="/api")
+app.include_router(imports.router, prefix="/api")
+app.include_router(deletion_jobs.router, prefix="/api")
+app.include_router(me.router, prefix="/api")
+app.include_router(reports.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
@@ -0,0 +1,31 @@
+from sqlmodel import SQLModel, Field
+from pydantic import field_validator
+from typing import Any, Dict, List, Optional
+
+BATCH_METHODS = ["GET", "POST", "PUT", "PATCH", "DELETE"]
+
+class BatchRequestItem(SQLModel):
+    id: Optional[str] = Field(default=None, max_length=100)  # echoed back to match responses
+    method: str = Field(default="GET")
+    url: str = Field(max_length=2000)  # /api/... path with its query string
+    body: Optional[Any] = None  # JSON body
+
+    @field_validator("method")
+    @classmethod
+    def validate_method(cls, v):
+        v = v.upper()
+        if v not in BATCH_METHODS:
+            raise ValueError(f"Method must be one of: {', '.join(BATCH_METHODS)}")
+        return v
+
+class BatchRequest(SQLModel):
+    requests: List[BatchRequestItem]
+
+class BatchResponseItem(SQLModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+class BatchResponse(SQLModel):
+    responses: List[BatchResponseItem]
@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel
+from typing import List, Optional
+
+class BulkItemResult(SQLModel):
+    index: int
+    id: Optional[int] = None
+    success: bool
+    error: Optional[str] = None
+
+class BulkResponse(SQLModel):
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
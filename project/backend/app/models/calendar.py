@@ -0,0 +1,22 @@
+from sqlmodel import SQLModel
+from typing import List, Optional
+from datetime import date, datetime
+
+class CalendarTask(SQLModel):
+    id: int
+    title: str
+    status: str
+    assigned_to: Optional[int] = None
+    due_date: datetime
+
+class CalendarDay(SQLModel):
+    date: date
+    count: int
+    tasks: List[CalendarTask]
+
+class ProjectCalendarResponse(SQLModel):
+    project_id: int
+    start: date
+    end: date
+    total: int
+    days: List[CalendarDay]
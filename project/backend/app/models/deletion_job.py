@@ -0,0 +1,31 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class DeletionJob(SQLModel, table=True):
+    __tablename__ = "deletion_jobs"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    entity: str = Field(max_length=20)  # "project" or "user"
+    entity_id: int = Field(index=True)
+    requested_by: Optional[int] = Field(default=None)  # user who started the deletion
+    status: str = Field(default="pending", max_length=20, index=True)  # pending, running, completed, failed
+    deleted_rows: int = Field(default=0)
+    error: Optional[str] = Field(default=None, max_length=255)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+class DeletionJobResponse(SQLModel):
+    id: int
+    entity: str
+    entity_id: int
+    status: str
+    deleted_rows: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,13 @@
+from sqlmodel import SQLModel
+from typing import List
+
+class ImportRowError(SQLModel):
+    line: int
+    error: str
+
+class ImportReport(SQLModel):
+    entity: str
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = []
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar, List
+from typing import Any, Dict, Generic, TypeVar, List, Optional
 from pydantic import BaseModel, Field
 
 T = TypeVar('T')
@@ -21,3 +21,21 @@ class PaginatedResponse(BaseModel, Generic[T]):
     class Config:
         from_attributes = True
 
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    """Generic keyset-paginated response; pass next_cursor back as ?cursor= for the next page"""
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool
+
+
+class NormalizedPaginatedResponse(PaginatedResponse[T], Generic[T]):
+    """Paginated response whose related entities are side-loaded once in included (?shape=normalized)"""
+    included: Dict[str, Dict[int, Dict[str, Any]]]
+
+
+class NormalizedListResponse(BaseModel, Generic[T]):
+    """List response whose related entities are side-loaded once in included (?shape=normalized)"""
+    items: List[T]
+    included: Dict[str, Dict[int, Dict[str, Any]]]
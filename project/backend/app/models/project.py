@@ -30,6 +30,8 @@ class Project(ProjectBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set while a background deletion job removes the project and its children
+    deleting: bool = Field(default=False, index=True)
     
     # Relationships
     creator: Optional["User"] = Relationship(back_populates="created_projects")
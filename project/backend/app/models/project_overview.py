@@ -0,0 +1,15 @@
+from sqlmodel import SQLModel
+from typing import List
+from .project import ProjectResponse
+from .project_role import ProjectRoleResponse
+from .project_member import ProjectMemberResponse
+from .task import TaskResponse
+from .task_stats import ProjectTaskStatsResponse
+
+class ProjectOverviewResponse(SQLModel):
+    project: ProjectResponse
+    roles: List[ProjectRoleResponse]
+    members: List[ProjectMemberResponse]
+    tasks: List[TaskResponse]  # newest first, up to task_limit
+    has_more_tasks: bool
+    stats: ProjectTaskStatsResponse
@@ -6,10 +6,26 @@ if TYPE_CHECKING:
     from .project import Project
     from .project_member import ProjectMember
 
+# Role capabilities, from least to most privileged; each one implies the ones before it
+CAPABILITIES = ("read", "write", "manage")
+DEFAULT_CAPABILITIES = "read,write"
+
+def normalize_capabilities(value: str) -> str:
+    """Validate a comma-separated capability list and add the implied capabilities"""
+    names = {name.strip().lower() for name in value.split(",") if name.strip()}
+    unknown = names - set(CAPABILITIES)
+    if unknown:
+        raise ValueError(f"Capabilities must be among: {', '.join(CAPABILITIES)}")
+    if not names:
+        raise ValueError("Capabilities cannot be empty")
+    highest = max(CAPABILITIES.index(name) for name in names)
+    return ",".join(CAPABILITIES[:highest + 1])
+
 class ProjectRoleBase(SQLModel):
     name: str = Field(max_length=50, index=True)
     description: Optional[str] = Field(default=None, max_length=150)
     project_id: int = Field(foreign_key="projects.id", ondelete="CASCADE")
+    capabilities: str = Field(default=DEFAULT_CAPABILITIES, max_length=50)
 
     @field_validator("name")
     @classmethod
@@ -20,6 +36,11 @@ class ProjectRoleBase(SQLModel):
             raise ValueError("Role name must be 50 characters or less")
         return v.strip()
 
+    @field_validator("capabilities")
+    @classmethod
+    def validate_capabilities(cls, v):
+        return normalize_capabilities(v)
+
 class ProjectRole(ProjectRoleBase, table=True):
     __tablename__ = "project_roles"
     
@@ -35,12 +56,19 @@ class ProjectRoleCreate(ProjectRoleBase):
 class ProjectRoleUpdate(SQLModel):
     name: Optional[str] = Field(default=None, max_length=50)
     description: Optional[str] = Field(default=None, max_length=150)
+    capabilities: Optional[str] = Field(default=None, max_length=50)
+
+    @field_validator("capabilities")
+    @classmethod
+    def validate_capabilities(cls, v):
+        return normalize_capabilities(v) if v is not None else v
 
 class ProjectRoleResponse(SQLModel):
     id: int
     name: str
     description: Optional[str] = None
     project_id: int
+    capabilities: str
     # Include related data
     project_name: Optional[str] = None
 
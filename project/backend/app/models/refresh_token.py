@@ -0,0 +1,27 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class RefreshToken(SQLModel, table=True):
+    """
+    Issued refresh token, stored only as its HMAC.
+    Tokens rotated from the same login share a family_id.
+    """
+    __tablename__ = "refresh_tokens"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", ondelete="CASCADE", index=True)
+    family_id: str = Field(max_length=32, index=True)
+    token_hash: str = Field(max_length=64, unique=True, index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(index=True)
+    used_at: Optional[datetime] = None  # set when rotated; presenting it again is a reuse
+    revoked_at: Optional[datetime] = None
+
+class TokenRefreshRequest(SQLModel):
+    refresh_token: str = Field(max_length=128)
+
+class TokenRefreshResponse(SQLModel):
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
@@ -0,0 +1,37 @@
+from sqlmodel import SQLModel
+from typing import Dict, List, Optional
+from datetime import date
+
+class ThroughputWeek(SQLModel):
+    week_start: date
+    created: int
+    completed: int
+
+class ThroughputReport(SQLModel):
+    project_id: Optional[int] = None
+    weeks: List[ThroughputWeek]
+
+class ProjectStatusCounts(SQLModel):
+    project_id: int
+    total: int
+    by_status: Dict[str, int]
+
+class StatusDistributionReport(SQLModel):
+    total_projects: int
+    projects: List[ProjectStatusCounts]
+
+class LoadBucket(SQLModel):
+    min_open: int
+    max_open: Optional[int] = None  # None = no upper bound
+    assignees: int
+
+class AssigneeLoadItem(SQLModel):
+    assigned_to: int
+    open: int
+
+class AssigneeLoadReport(SQLModel):
+    project_id: Optional[int] = None
+    assignees: int
+    unassigned_open: int
+    histogram: List[LoadBucket]
+    top_assignees: List[AssigneeLoadItem]
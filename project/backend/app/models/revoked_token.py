@@ -0,0 +1,16 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+from datetime import datetime
+
+class RevokedToken(SQLModel, table=True):
+    """Access token revoked before its expiration (kept until it expires)"""
+    __tablename__ = "revoked_tokens"
+
+    jti: str = Field(max_length=32, primary_key=True)
+    user_id: int = Field(foreign_key="users.id", ondelete="CASCADE", index=True)
+    revoked_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    expires_at: datetime = Field(index=True)
+
+class LogoutRequest(SQLModel):
+    # Also revoke this refresh token and every token rotated from the same login
+    refresh_token: Optional[str] = Field(default=None, max_length=128)
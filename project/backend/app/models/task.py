@@ -1,8 +1,12 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 from pydantic import field_validator
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
+TASK_STATUSES = ["pending", "in_progress", "overdue", "in_review", "completed", "cancelled"]
+# Statuses that still count towards an assignee's workload
+OPEN_TASK_STATUSES = ["pending", "in_progress", "overdue", "in_review"]
+
 class TaskBase(SQLModel):
     project_id: int = Field(foreign_key="projects.id", ondelete="CASCADE")
     title: str = Field(max_length=150)
@@ -37,9 +41,19 @@ class TaskBase(SQLModel):
 
 class Task(TaskBase, table=True):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset paging of a user's tasks by due date (/api/me/work)
+        Index("idx_tasks_assigned_due", "assigned_to", "due_date", "id"),
+        # Calendar range queries of a project (/api/projects/{id}/calendar)
+        Index("idx_tasks_project_due", "project_id", "due_date"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Change watermark for incremental report snapshots
+    updated_at: datetime = Field(
+        default_factory=datetime.utcnow, index=True, sa_column_kwargs={"onupdate": datetime.utcnow}
+    )
     
 
 class TaskCreate(TaskBase):
@@ -78,3 +92,14 @@ class TaskResponse(SQLModel):
 
     class Config:
         from_attributes = True
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: int
+
+class TaskBulkDelete(SQLModel):
+    ids: List[int]
+
+class WorkItemResponse(TaskResponse):
+    """Task assigned to the current user, with the user's role in its project (none for its creator)"""
+    project_role_id: Optional[int] = None
+    role_name: Optional[str] = None
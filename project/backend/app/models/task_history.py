@@ -0,0 +1,65 @@
+from sqlmodel import SQLModel, Field, Index
+from typing import List, Optional
+from datetime import date, datetime
+
+class TaskStatusHistory(SQLModel, table=True):
+    """Append-only log of task status transitions (no FK: it outlives deleted tasks)"""
+    __tablename__ = "task_status_history"
+    __table_args__ = (
+        Index("idx_task_status_history_project", "project_id", "changed_at"),
+    )
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    task_id: int = Field(index=True)
+    project_id: int
+    from_status: Optional[str] = Field(default=None, max_length=50)  # None = task created
+    to_status: Optional[str] = Field(default=None, max_length=50)  # None = task deleted
+    changed_at: datetime = Field(default_factory=datetime.utcnow)
+
+class ProjectStatusDaily(SQLModel, table=True):
+    """Transitions per project, day and status, aggregated as they are logged"""
+    __tablename__ = "project_status_daily"
+    
+    project_id: int = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    status: str = Field(primary_key=True, max_length=50)
+    entered: int = Field(default=0)
+    exited: int = Field(default=0)
+    # Sum of created -> completed durations of the tasks that entered "completed" that day
+    cycle_seconds: int = Field(default=0)
+
+class TaskStatusHistoryResponse(SQLModel):
+    id: int
+    task_id: int
+    project_id: int
+    from_status: Optional[str] = None
+    to_status: Optional[str] = None
+    changed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class BurndownDay(SQLModel):
+    day: date
+    open: int
+    completed: int
+    cancelled: int
+
+class BurndownResponse(SQLModel):
+    project_id: int
+    start: date
+    end: date
+    days: List[BurndownDay]
+
+class CycleTimeDay(SQLModel):
+    day: date
+    completed: int
+    avg_cycle_hours: Optional[float] = None
+
+class CycleTimeResponse(SQLModel):
+    project_id: int
+    start: date
+    end: date
+    completed: int
+    avg_cycle_hours: Optional[float] = None
+    days: List[CycleTimeDay]
@@ -0,0 +1,23 @@
+from sqlmodel import SQLModel, Field
+from typing import Dict, List, Optional
+
+class ProjectTaskStat(SQLModel, table=True):
+    """Task count per project, assignee and status, maintained incrementally"""
+    __tablename__ = "project_task_stats"
+    
+    project_id: int = Field(primary_key=True)
+    assignee_id: int = Field(default=0, primary_key=True)  # 0 = unassigned
+    status: str = Field(primary_key=True, max_length=50)
+    task_count: int = Field(default=0)
+
+class AssigneeLoad(SQLModel):
+    assigned_to: Optional[int] = None
+    total: int
+    open: int
+
+class ProjectTaskStatsResponse(SQLModel):
+    project_id: int
+    total: int
+    by_status: Dict[str, int]
+    overdue: int
+    by_assignee: List[AssigneeLoad]
@@ -38,6 +38,10 @@ class User(UserBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Set while a background deletion job removes the user and its data
+    deleting: bool = Field(default=False, index=True)
+    # Access tokens issued before this time are rejected (revoke all sessions)
+    tokens_not_before: Optional[datetime] = None
     
     # Relationships
     created_projects: List["Project"] = Relationship(
@@ -90,5 +94,6 @@ class UserLogin(SQLModel):
 
 class UserLoginResponse(SQLModel):
     access_token: str
+    refresh_token: Optional[str] = None
     token_type: str = "bearer"
     user: UserResponse
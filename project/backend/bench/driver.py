@@ -0,0 +1,255 @@
+"""
+Benchmark Load Driver
+=====================
+Replays a weighted mix of user scenarios against the API and reports
+per-endpoint latency percentiles, throughput and SQL statement counts.
+
+Scenarios:
+
+- board: open a project board (project, its tasks, stats, calendar, members)
+- overview: open a project through /overview, then revalidate it with its ETag
+- search: full-text task search across the user's projects
+- login: password login (the expensive hash on the auth path)
+- bulk: list a page of task ids and bulk-update their status
+
+By default the app runs in-process through httpx's ASGI transport against
+the database named in the generator manifest, and every request's SQL
+statements are counted. With --url the driver targets a running server
+(uvicorn, MySQL) and only latencies are measured. Run bench.generate first.
+
+Usage (from the backend directory):
+    python -m bench.driver --duration 30 --concurrency 16
+    python -m bench.driver --mix board=6,search=2,login=1,bulk=1 --requests 5000
+    python -m bench.driver --url http://localhost:8000 --duration 60
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .report import summarize, save_report, print_summary, previous_report, load_report, compare
+
+DEFAULT_MIX = "board=5,search=3,login=1,bulk=1"
+BULK_SIZE = 20
+
+# Statements executed while handling the current request (in-process runs only)
+statement_counter: ContextVar[Optional[List[int]]] = ContextVar("statement_counter", default=None)
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario: {name.strip()}")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+class Driver:
+    """Runs scenarios and records one sample per HTTP request"""
+
+    def __init__(self, client: httpx.AsyncClient, manifest: Dict[str, Any], rng: random.Random, count_queries: bool):
+        self.client = client
+        self.manifest = manifest
+        self.rng = rng
+        self.count_queries = count_queries
+        self.tokens: Dict[str, str] = {}
+        self.samples: List[Dict[str, Any]] = []
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        counter = [0] if self.count_queries else None
+        statement_counter.set(counter)
+        started = time.perf_counter()
+        response = await self.client.request(method, url, **kwargs)
+        self.samples.append({
+            "endpoint": endpoint,
+            "latency": time.perf_counter() - started,
+            "status": response.status_code,
+            "queries": counter[0] if counter is not None else None,
+            "bytes": response.num_bytes_downloaded,
+        })
+        return response
+
+    async def login(self, principal: Dict[str, Any], endpoint: str = "POST /api/auth/login") -> Optional[str]:
+        response = await self.request(endpoint, "POST", "/api/auth/login", json={
+            "email": principal["email"], "password": self.manifest["password"]
+        })
+        if response.status_code != 200:
+            return None
+        token = response.json()["access_token"]
+        self.tokens[principal["email"]] = token
+        return token
+
+    def pick(self) -> tuple[Dict[str, Any], Dict[str, str]]:
+        principal = self.rng.choice(self.manifest["principals"])
+        return principal, {"Authorization": f"Bearer {self.tokens[principal['email']]}"}
+
+    async def board(self) -> None:
+        principal, headers = self.pick()
+        project_id = self.rng.choice(principal["projects"])
+        today = datetime.utcnow().date()
+        await self.request("GET /api/projects/{id}", "GET", f"/api/projects/{project_id}", headers=headers)
+        await self.request("GET /api/tasks/project/{id}", "GET", f"/api/tasks/project/{project_id}", headers=headers)
+        await self.request("GET /api/projects/{id}/stats", "GET", f"/api/projects/{project_id}/stats", headers=headers)
+        await self.request(
+            "GET /api/projects/{id}/calendar", "GET", f"/api/projects/{project_id}/calendar",
+            params={"start": str(today.replace(day=1)), "end": str(today.replace(day=1) + timedelta(days=31))},
+            headers=headers
+        )
+        await self.request(
+            "GET /api/project-members/project/{id}", "GET", f"/api/project-members/project/{project_id}",
+            headers=headers
+        )
+
+    async def overview(self) -> None:
+        principal, headers = self.pick()
+        project_id = self.rng.choice(principal["projects"])
+        url = f"/api/projects/{project_id}/overview"
+        response = await self.request("GET /api/projects/{id}/overview", "GET", url, headers=headers)
+        etag = response.headers.get("etag")
+        if etag:
+            await self.request(
+                "GET /api/projects/{id}/overview (etag)", "GET", url,
+                headers={**headers, "If-None-Match": etag}
+            )
+
+    async def search(self) -> None:
+        _, headers = self.pick()
+        await self.request("GET /api/tasks/?search", "GET", "/api/tasks/", params={
+            "search": self.rng.choice(self.manifest["search_terms"]), "limit": 20
+        }, headers=headers)
+
+    async def login_storm(self) -> None:
+        await self.login(self.rng.choice(self.manifest["principals"]))
+
+    async def bulk(self) -> None:
+        principal, headers = self.pick()
+        project_id = self.rng.choice(principal["projects"])
+        response = await self.request("GET /api/tasks/?fields=id", "GET", "/api/tasks/", params={
+            "project_id": project_id, "fields": "id", "limit": BULK_SIZE, "skip": self.rng.randrange(0, 100)
+        }, headers=headers)
+        if response.status_code != 200 or not response.json()["items"]:
+            return
+        status = self.rng.choice(("pending", "in_progress", "in_review", "completed"))
+        await self.request("PATCH /api/tasks/bulk", "PATCH", "/api/tasks/bulk", json=[
+            {"id": item["id"], "status": status} for item in response.json()["items"]
+        ], headers=headers)
+
+
+SCENARIOS = {
+    "board": Driver.board,
+    "overview": Driver.overview,
+    "search": Driver.search,
+    "login": Driver.login_storm,
+    "bulk": Driver.bulk,
+}
+
+
+async def run(args, manifest: Dict[str, Any], transport: Optional[httpx.AsyncBaseTransport]) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    async with httpx.AsyncClient(
+        transport=transport, base_url=args.url or "http://bench", timeout=args.timeout
+    ) as client:
+        driver = Driver(client, manifest, rng, count_queries=transport is not None)
+        # Log every principal in up front (not measured)
+        for principal in manifest["principals"]:
+            if await driver.login(principal) is None:
+                raise SystemExit(f"Login failed for {principal['email']}: check the manifest and rate limits")
+        manifest["principals"] = [p for p in manifest["principals"] if p["projects"]]
+        driver.samples.clear()
+
+        deadline = time.perf_counter() + args.duration if args.requests is None else None
+        remaining = [args.requests]
+
+        async def worker() -> None:
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                if deadline is None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                await SCENARIOS[rng.choices(names, weights)[0]](driver)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return {"samples": driver.samples, "elapsed": time.perf_counter() - started}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a benchmark scenario mix against the API")
+    parser.add_argument("--manifest", default=os.path.join("bench", "data", "manifest.json"), help="Generator manifest")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process ASGI)")
+    parser.add_argument("--database-url", help="Database for in-process runs (default: from the manifest)")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX, help=f"Scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--requests", type=int, help="Run this many scenarios instead of a fixed duration")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the scenario sequence")
+    parser.add_argument("--no-save", action="store_true", help="Do not write a report to bench/results")
+    args = parser.parse_args()
+
+    with open(args.manifest, encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    transport = None
+    if args.url is None:
+        database_url = args.database_url or manifest.get("database_url") or os.getenv("DATABASE_URL")
+        if database_url:
+            os.environ["DATABASE_URL"] = database_url
+        # Rate limits would throttle the load itself; the app reads them on import
+        os.environ["RATE_LIMIT_API_PER_MIN"] = "100000000"
+        os.environ["RATE_LIMIT_AUTH_PER_MIN"] = "100000000"
+        from sqlalchemy import event
+        from app.main import app
+        from app.core.database import engine
+
+        engine.echo = False
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            counter = statement_counter.get()
+            if counter is not None:
+                counter[0] += 1
+
+        # The lifespan (background scheduler) is not started by the ASGI transport
+        transport = httpx.ASGITransport(app=app)
+
+    result = asyncio.run(run(args, manifest, transport))
+    summary = summarize(result["samples"], result["elapsed"])
+    print_summary(summary)
+
+    if not args.no_save:
+        meta = {
+            "target": args.url or "asgi",
+            "database": manifest.get("database"),
+            "dataset": {key: manifest.get(key) for key in ("seed", "users", "projects", "tasks", "memberships")},
+            "mix": args.mix,
+            "concurrency": args.concurrency,
+            "duration": round(result["elapsed"], 3),
+            "seed": args.seed,
+        }
+        path = save_report(summary, meta)
+        print(f"\nReport written to {path}")
+        baseline = previous_report(path)
+        if baseline is not None:
+            print()
+            compare(load_report(baseline), load_report(path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Benchmark Data Generator
+========================
+Fills a database with a seeded, realistic data set for the benchmark driver.
+
+The default volumes (10k users, 50k projects, 5M tasks) can be scaled down
+with --scale. Popularity is skewed like real usage: a few users create and
+join many projects (Zipf), and task counts per project follow a lognormal
+distribution, so a handful of projects are very large. All users share one
+password, hashed once, and the task stats summary is rebuilt so the stats
+endpoints read consistent data.
+
+A manifest with the credentials and ids the driver needs is written next
+to the data (bench/data/manifest.json by default).
+
+Usage (from the backend directory):
+    python -m bench.generate --database-url sqlite:///bench.sqlite --scale 0.01
+    python -m bench.generate --scale 1 --seed 7   # MySQL settings from .env
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+DEFAULT_USERS = 10_000
+DEFAULT_PROJECTS = 50_000
+DEFAULT_TASKS = 5_000_000
+PASSWORD = "BenchPass123"
+CHUNK = 10_000
+
+# Status mix of generated tasks
+STATUS_WEIGHTS = {
+    "pending": 0.30,
+    "in_progress": 0.20,
+    "overdue": 0.10,
+    "in_review": 0.10,
+    "completed": 0.25,
+    "cancelled": 0.05,
+}
+VERBS = ("Revisar", "Diseñar", "Implementar", "Probar", "Documentar", "Migrar", "Optimizar", "Desplegar")
+NOUNS = ("factura", "cliente", "reporte", "tablero", "contrato", "pedido", "campaña", "inventario", "presupuesto")
+
+# Principals written to the manifest for the driver
+MANIFEST_PRINCIPALS = 200
+
+
+def zipf_weights(n: int, exponent: float) -> np.ndarray:
+    """Probabilities proportional to 1 / rank**exponent"""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def log(message: str, end: str = "\n") -> None:
+    print(message, file=sys.stderr, end=end, flush=True)
+
+
+def insert_rows(session, table, columns: Dict[str, np.ndarray]) -> None:
+    """Insert column arrays as one executemany and commit"""
+    names = list(columns)
+    values = [column.tolist() for column in columns.values()]
+    session.execute(table.insert(), [dict(zip(names, row)) for row in zip(*values)])
+    session.commit()
+
+
+def insert_chunks(session, table, columns: Dict[str, np.ndarray], label: str) -> None:
+    """Insert column arrays in chunks of CHUNK rows"""
+    total = len(next(iter(columns.values())))
+    started = time.perf_counter()
+    for start in range(0, total, CHUNK):
+        insert_rows(session, table, {name: column[start:start + CHUNK] for name, column in columns.items()})
+        log(f"{label}: {min(start + CHUNK, total)}/{total}", end="\r")
+    log(f"{label}: {total} rows in {time.perf_counter() - started:.1f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic data set for benchmarks")
+    parser.add_argument("--database-url", help="Target database (default: DATABASE_URL / MySQL settings)")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the default volumes")
+    parser.add_argument("--users", type=int, help=f"Users to create (default {DEFAULT_USERS} x scale)")
+    parser.add_argument("--projects", type=int, help=f"Projects to create (default {DEFAULT_PROJECTS} x scale)")
+    parser.add_argument("--tasks", type=int, help=f"Tasks to create (default {DEFAULT_TASKS} x scale)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed")
+    parser.add_argument("--manifest", default=os.path.join("bench", "data", "manifest.json"), help="Manifest output path")
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    # Imported after DATABASE_URL is set: the engine is created on import
+    from sqlmodel import Session, SQLModel, select, func
+    from app.core.database import engine, DATABASE_URL
+    from app.core.security import hash_password
+    from app.core.role_templates import get_role_templates
+    from app.core.task_stats import rebuild_project_stats
+    from app.models.user import User
+    from app.models.project import Project
+    from app.models.project_role import ProjectRole
+    from app.models.project_member import ProjectMember
+    from app.models.task import Task
+
+    engine.echo = False
+    if engine.dialect.name == "sqlite":
+        # MySQL schemas come from the migrations; SQLite files are created from the
+        # models, all of which the app registers on import
+        import app.main  # noqa: F401
+        SQLModel.metadata.create_all(engine)
+
+    n_users = args.users or max(int(DEFAULT_USERS * args.scale), 10)
+    n_projects = args.projects or max(int(DEFAULT_PROJECTS * args.scale), 10)
+    n_tasks = args.tasks if args.tasks is not None else int(DEFAULT_TASKS * args.scale)
+    rng = np.random.default_rng(args.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    now64 = np.datetime64(now, "s")
+
+    with Session(engine) as session:
+        def next_id(model) -> int:
+            return (session.exec(select(func.max(model.id))).one() or 0) + 1
+
+        # Users: one shared password hash, explicit ids so later tables can reference them
+        user_base = next_id(User)
+        user_ids = np.arange(user_base, user_base + n_users)
+        created = now64 - rng.integers(0, 365 * 86400, n_users).astype("timedelta64[s]")
+        insert_chunks(session, User.__table__, {
+            "id": user_ids,
+            "name": np.array([f"Usuario {i}" for i in range(n_users)], dtype=object),
+            "email": np.array([f"bench{user_base + i}@bench.example.com" for i in range(n_users)], dtype=object),
+            "password": np.full(n_users, hash_password(PASSWORD), dtype=object),
+            "active": np.ones(n_users, dtype=bool),
+            "deleting": np.zeros(n_users, dtype=bool),
+            "created_at": created.astype(datetime),
+            "updated_at": created.astype(datetime),
+        }, "users")
+
+        # Users ranked by activity: popular users create and join more projects
+        user_rank = rng.permutation(user_ids)
+        user_weights = zipf_weights(n_users, 1.1)
+
+        project_base = next_id(Project)
+        project_ids = np.arange(project_base, project_base + n_projects)
+        creators = rng.choice(user_rank, n_projects, p=user_weights)
+        project_created = now64 - rng.integers(0, 365 * 86400, n_projects).astype("timedelta64[s]")
+        insert_chunks(session, Project.__table__, {
+            "id": project_ids,
+            "name": np.array([f"Proyecto {i}" for i in range(n_projects)], dtype=object),
+            "description": np.full(n_projects, "Proyecto generado para benchmarks", dtype=object),
+            "id_user": creators,
+            "deleting": np.zeros(n_projects, dtype=bool),
+            "created_at": project_created.astype(datetime),
+            "updated_at": project_created.astype(datetime),
+        }, "projects")
+
+        # Default roles of every project, ids in template order
+        templates = get_role_templates()
+        role_base = next_id(ProjectRole)
+        role_ids = role_base + np.arange(n_projects * len(templates))
+        insert_chunks(session, ProjectRole.__table__, {
+            "id": role_ids,
+            "name": np.tile(np.array([t["name"] for t in templates], dtype=object), n_projects),
+            "description": np.tile(np.array([t["description"] for t in templates], dtype=object), n_projects),
+            "capabilities": np.tile(np.array([t["capabilities"] for t in templates], dtype=object), n_projects),
+            "project_id": np.repeat(project_ids, len(templates)),
+        }, "project_roles")
+
+        # Members: the creator as first role, plus a skewed sample of other users
+        extra = rng.poisson(3, n_projects)
+        member_counts = 1 + extra
+        offsets = np.concatenate(([0], np.cumsum(member_counts)))
+        member_projects = np.repeat(np.arange(n_projects), member_counts)
+        member_users = rng.choice(user_rank, offsets[-1], p=user_weights)
+        member_users[offsets[:-1]] = creators
+        # Drop duplicate (project, user) pairs, keeping the creator's row
+        _, first = np.unique(member_projects.astype(np.int64) * (user_base + n_users) + member_users, return_index=True)
+        keep = np.sort(first)
+        member_projects, member_users = member_projects[keep], member_users[keep]
+        is_creator = np.zeros(len(keep), dtype=bool)
+        is_creator[np.searchsorted(keep, offsets[:-1])] = True
+        role_offset = np.where(is_creator, 0, np.where(rng.random(len(keep)) < 0.8, 1, len(templates) - 1))
+        insert_chunks(session, ProjectMember.__table__, {
+            "project_id": project_ids[member_projects],
+            "user_id": member_users,
+            "project_role_id": role_base + member_projects * len(templates) + role_offset,
+            "created_at": np.full(len(keep), now, dtype=object),
+        }, "project_members")
+
+        # Tasks: lognormal project sizes, assignees among the project's members
+        member_counts = np.bincount(member_projects, minlength=n_projects)
+        offsets = np.concatenate(([0], np.cumsum(member_counts)))
+        sizes = rng.lognormal(0, 1.5, n_projects)
+        task_counts = rng.multinomial(n_tasks, sizes / sizes.sum()) if n_tasks else np.zeros(n_projects, dtype=np.int64)
+        statuses = np.array(list(STATUS_WEIGHTS), dtype=object)
+        task_base = next_id(Task)
+        order = np.argsort(project_created)  # older projects first, like real ids
+
+        written = 0
+        started = time.perf_counter()
+        batch_projects: List[int] = []
+        batch_size = 0
+
+        def flush(projects: List[int]) -> None:
+            nonlocal written
+            task_projects = np.repeat(np.array(projects), task_counts[projects])
+            count = len(task_projects)
+            member_pick = offsets[task_projects] + (rng.random(count) * member_counts[task_projects]).astype(np.int64)
+            assigned = member_users[member_pick].astype(object)
+            assigned[rng.random(count) >= 0.8] = None
+            age = (now64 - project_created[task_projects]).astype(np.int64)
+            task_created = project_created[task_projects] + (rng.random(count) * age).astype("timedelta64[s]")
+            due = (task_created + rng.integers(-30 * 86400, 60 * 86400, count).astype("timedelta64[s]")).astype(datetime)
+            due[rng.random(count) >= 0.7] = None
+            verbs = np.array(VERBS, dtype=object)[rng.integers(0, len(VERBS), count)]
+            nouns = np.array(NOUNS, dtype=object)[rng.integers(0, len(NOUNS), count)]
+            insert_rows(session, Task.__table__, {
+                "id": task_base + written + np.arange(count),
+                "title": verbs + " " + nouns + " " + (written + np.arange(count)).astype(str).astype(object),
+                "status": statuses[rng.choice(len(statuses), count, p=list(STATUS_WEIGHTS.values()))],
+                "project_id": project_ids[task_projects],
+                "assigned_to": assigned,
+                "due_date": due,
+                "created_at": task_created.astype(datetime),
+                "updated_at": task_created.astype(datetime),
+            })
+            written += count
+            log(f"tasks: {written}/{n_tasks}", end="\r")
+
+        for project in order:
+            batch_projects.append(project)
+            batch_size += task_counts[project]
+            if batch_size >= CHUNK:
+                flush(batch_projects)
+                batch_projects, batch_size = [], 0
+        if batch_size:
+            flush(batch_projects)
+        log(f"tasks: {written} rows in {time.perf_counter() - started:.1f}s")
+
+        # Summary rows read by the stats endpoints
+        started = time.perf_counter()
+        rebuild_project_stats(session)
+        log(f"task stats rebuilt in {time.perf_counter() - started:.1f}s")
+
+    # Principals for the driver: the most active users with the projects they can write to
+    writable: Dict[int, List[int]] = {}
+    for project, user, offset in zip(member_projects, member_users, role_offset):
+        if offset < len(templates) - 1:
+            writable.setdefault(int(user), []).append(int(project_ids[project]))
+    principals = [
+        {"email": f"bench{user}@bench.example.com", "user_id": user, "projects": writable[user][:50]}
+        for user in (int(u) for u in user_rank[:MANIFEST_PRINCIPALS * 2]) if user in writable
+    ][:MANIFEST_PRINCIPALS]
+    manifest = {
+        "generated_at": now.isoformat(),
+        "database": engine.dialect.name,
+        "database_url": DATABASE_URL if engine.dialect.name == "sqlite" else None,
+        "seed": args.seed,
+        "users": n_users,
+        "projects": n_projects,
+        "tasks": written,
+        "memberships": int(len(member_users)),
+        "largest_project_tasks": int(task_counts.max()) if n_projects else 0,
+        "password": PASSWORD,
+        "principals": principals,
+        "search_terms": list(NOUNS),
+    }
+    os.makedirs(os.path.dirname(args.manifest) or ".", exist_ok=True)
+    with open(args.manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    log(f"manifest written to {args.manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""
+Micro-benchmarks
+================
+Timings of hot functions on the request path, checked against a stored
+baseline so a regression fails the run.
+
+Each benchmark receives a ``Benchmark`` fixture, in the style of
+pytest-benchmark: ``bench(fn)`` calibrates how many calls make a
+measurable round and times rounds until the time budget is spent;
+``bench.pedantic(fn, setup=...)`` runs an untimed setup before every
+round for functions that consume their input (e.g. the overdue update).
+
+Medians (or --stat) are compared with the baseline
+(bench/results/micro-baseline.json by default); the run exits with status 1 when any benchmark is slower
+than the baseline by more than --max-regression percent.
+
+Usage (from the backend directory):
+    python -m bench.micro --save-baseline       # record the baseline
+    python -m bench.micro                       # compare, fail on regressions
+    python -m bench.micro -k token --max-regression 10
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_BASELINE = os.path.join("bench", "results", "micro-baseline.json")
+DEFAULT_MAX_REGRESSION = 20.0
+# Shortest timed round; faster functions are called several times per round
+MIN_ROUND_TIME = 0.002
+MIN_ROUNDS = 5
+OVERDUE_TABLE_SIZE = 20_000
+OVERDUE_BACKLOGS = (0, 100, 1_000, 10_000)
+
+
+class Benchmark:
+    """Times a function and keeps per-call statistics of the rounds"""
+
+    def __init__(self, max_time: float):
+        self.max_time = max_time
+        self.stats: Optional[Dict[str, Any]] = None
+
+    def _record(self, per_call: List[float], iterations: int) -> None:
+        self.stats = {
+            "min": min(per_call),
+            "median": statistics.median(per_call),
+            "mean": statistics.fmean(per_call),
+            "stddev": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+            "rounds": len(per_call),
+            "iterations": iterations,
+        }
+
+    def __call__(self, fn: Callable[[], Any]) -> Any:
+        result = fn()  # warm-up, also the returned value
+        iterations = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            if time.perf_counter() - started >= MIN_ROUND_TIME:
+                break
+            iterations *= 10
+
+        per_call = []
+        deadline = time.perf_counter() + self.max_time
+        gc.collect()
+        while len(per_call) < MIN_ROUNDS or time.perf_counter() < deadline:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                fn()
+            per_call.append((time.perf_counter() - started) / iterations)
+        self._record(per_call, iterations)
+        return result
+
+    def pedantic(self, fn: Callable[[], Any], setup: Callable[[], None], rounds: int = MIN_ROUNDS) -> Any:
+        result = None
+        per_call = []
+        for _ in range(rounds + 1):
+            setup()
+            gc.collect()
+            started = time.perf_counter()
+            result = fn()
+            per_call.append(time.perf_counter() - started)
+        self._record(per_call[1:], 1)  # the first round warms caches
+        return result
+
+
+BENCHMARKS: Dict[str, Callable[[Benchmark], Any]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark function under a name"""
+    def register(fn: Callable[[Benchmark], Any]) -> Callable[[Benchmark], Any]:
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+
+# ---------------------------------------------------------------------------
+# Rate limiting
+# ---------------------------------------------------------------------------
+
+@benchmark("rate_limit._allow[first request]")
+def bench_allow_first(bench: Benchmark) -> None:
+    from app.core.rate_limit import _allow
+    bucket: Dict[str, list] = {}
+
+    def run():
+        bucket.clear()
+        _allow(bucket, "user", 60)
+    bench(run)
+
+
+@benchmark("rate_limit._allow[59 in window]")
+def bench_allow_busy(bench: Benchmark) -> None:
+    from app.core.rate_limit import _allow
+    now = time.time()
+    history = [now - i for i in range(59)]
+    bucket: Dict[str, list] = {}
+
+    def run():
+        # _allow replaces the list, so the shared history is never modified
+        bucket["user"] = history
+        _allow(bucket, "user", 60)
+    bench(run)
+
+
+# ---------------------------------------------------------------------------
+# Tokens and passwords
+# ---------------------------------------------------------------------------
+
+@benchmark("security.create_access_token")
+def bench_create_token(bench: Benchmark) -> None:
+    from app.core.security import create_access_token
+    bench(lambda: create_access_token({"sub": "42", "email": "ana@example.com"}, expires_minutes=60))
+
+
+@benchmark("security.decode_token")
+def bench_decode_token(bench: Benchmark) -> None:
+    from app.core.security import create_access_token, decode_token
+    token = create_access_token({"sub": "42", "email": "ana@example.com"}, expires_minutes=60)
+    assert bench(lambda: decode_token(token)) is not None
+
+
+@benchmark("UserBase.validate_password")
+def bench_validate_password(bench: Benchmark) -> None:
+    from app.models.user import UserBase
+    bench(lambda: UserBase.validate_password("Str0ng.Passw0rd"))
+
+
+# ---------------------------------------------------------------------------
+# Response building
+# ---------------------------------------------------------------------------
+
+def _memory_engine():
+    """In-memory SQLite engine with every table of the app"""
+    from sqlalchemy.pool import StaticPool
+    from sqlmodel import SQLModel, create_engine
+    import app.main  # noqa: F401  (registers every table)
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+def _task_rows(count: int, now: datetime) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": i + 1, "project_id": 1, "title": f"Tarea {i}", "description": "Descripción",
+            "status": "pending", "assigned_to": 1, "due_date": now + timedelta(days=i % 30),
+            "created_at": now, "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+@benchmark("tasks.enrich_task_response")
+def bench_enrich_task_response(bench: Benchmark) -> None:
+    from sqlmodel import Session
+    from app.api.routes.tasks import enrich_task_response
+    from app.models.project import Project
+    from app.models.task import Task
+    from app.models.user import User
+
+    now = datetime.utcnow()
+    # Same session options as get_session
+    with Session(_memory_engine(), expire_on_commit=False) as session:
+        session.add(User(id=1, name="Ana", email="ana@example.com", password="x"))
+        session.add(Project(id=1, name="Proyecto", description="Descripción", id_user=1))
+        session.add(Task(**_task_rows(1, now)[0]))
+        session.commit()
+        task = session.get(Task, 1)
+        # Like a list page: nothing else holds the project and user, so the
+        # (weak-referencing) identity map may not keep them between calls
+        bench(lambda: enrich_task_response(task, session))
+
+
+def _page(size: int):
+    from app.models.pagination import PaginatedResponse
+    from app.models.task import TaskResponse
+
+    now = datetime.utcnow()
+    items = [
+        TaskResponse(**row, project_name="Proyecto", project_description="Descripción",
+                     assigned_to_name="Ana", assigned_to_email="ana@example.com")
+        for row in _task_rows(size, now)
+    ]
+    return PaginatedResponse[TaskResponse](items=items, total=1000, skip=0, limit=size, has_more=True)
+
+
+@benchmark("PaginatedResponse[TaskResponse].model_dump_json[100]")
+def bench_paginated_dump_json(bench: Benchmark) -> None:
+    page = _page(100)
+    bench(page.model_dump_json)
+
+
+@benchmark("PaginatedResponse[TaskResponse] response_model[100]")
+def bench_paginated_response_model(bench: Benchmark) -> None:
+    from fastapi.encoders import jsonable_encoder
+    from app.models.pagination import PaginatedResponse
+    from app.models.task import TaskResponse
+
+    page = _page(100)
+    model = PaginatedResponse[TaskResponse]
+    # What FastAPI does with a returned model: dump, validate against response_model, encode
+    bench(lambda: jsonable_encoder(model.model_validate(page.model_dump())))
+
+
+# ---------------------------------------------------------------------------
+# Overdue update
+# ---------------------------------------------------------------------------
+
+def _overdue_benchmark(backlog: int) -> Callable[[Benchmark], Any]:
+    def run(bench: Benchmark) -> None:
+        from sqlmodel import Session, update, delete
+        from app.core.task_automation import update_overdue_tasks
+        from app.models.project import Project
+        from app.models.task import Task
+        from app.models.task_history import TaskStatusHistory, ProjectStatusDaily
+        from app.models.user import User
+
+        now = datetime.utcnow()
+        with Session(_memory_engine(), expire_on_commit=False) as session:
+            session.add(User(id=1, name="Ana", email="ana@example.com", password="x"))
+            session.add(Project(id=1, name="Proyecto", id_user=1))
+            session.commit()
+            rows = _task_rows(OVERDUE_TABLE_SIZE, now)
+            for row in rows:
+                row["due_date"] = now + timedelta(days=1 + row["id"] % 30)
+            session.execute(Task.__table__.insert(), rows)
+            session.commit()
+
+            def setup() -> None:
+                # The first `backlog` tasks become pending and past due again
+                session.execute(update(Task).values(status="pending", due_date=now + timedelta(days=1)))
+                if backlog:
+                    session.execute(
+                        update(Task).where(Task.id <= backlog).values(due_date=now - timedelta(days=1))
+                    )
+                session.execute(delete(TaskStatusHistory))
+                session.execute(delete(ProjectStatusDaily))
+                session.commit()
+                session.expunge_all()
+
+            assert bench.pedantic(lambda: update_overdue_tasks(session), setup=setup) == backlog
+    return run
+
+
+for _backlog in OVERDUE_BACKLOGS:
+    benchmark(f"task_automation.update_overdue_tasks[{_backlog} of {OVERDUE_TABLE_SIZE}]")(_overdue_benchmark(_backlog))
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run micro-benchmarks and compare them with a baseline")
+    parser.add_argument("-k", dest="filter", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument(
+        "--max-regression", type=float, default=float(os.getenv("BENCH_MAX_REGRESSION", DEFAULT_MAX_REGRESSION)),
+        help="Fail when a median is this many percent slower than the baseline"
+    )
+    parser.add_argument("--stat", choices=("median", "min", "mean"), default="median", help="Statistic compared")
+    parser.add_argument("--max-time", type=float, default=0.5, help="Seconds spent timing each benchmark")
+    args = parser.parse_args()
+
+    # Nothing here needs MySQL: the app engine is never connected
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from app.core.database import engine
+    engine.echo = False
+
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+
+    results: Dict[str, Dict[str, Any]] = {}
+    regressions = []
+    print(f"{'benchmark':<58}{'min':>10}{'median':>10}{'stddev':>10}{'rounds':>8}{'vs base':>10}")
+    for name, fn in BENCHMARKS.items():
+        if args.filter and args.filter not in name:
+            continue
+        bench = Benchmark(args.max_time)
+        fn(bench)
+        stats = results[name] = bench.stats
+        change = ""
+        if name in baseline:
+            delta = (stats[args.stat] - baseline[name][args.stat]) / baseline[name][args.stat] * 100
+            change = f"{delta:+.1f}%"
+            if delta > args.max_regression:
+                regressions.append((name, delta))
+                change += " !"
+        print(
+            f"{name:<58}{format_time(stats['min']):>10}{format_time(stats['median']):>10}"
+            f"{format_time(stats['stddev']):>10}{stats['rounds']:>8}{change:>10}"
+        )
+
+    if args.save_baseline:
+        from .report import git_commit
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {"commit": git_commit(), "created_at": datetime.utcnow().isoformat(), "python": sys.version},
+                "benchmarks": results,
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed more than {args.max_regression:.0f}%:")
+        for name, delta in regressions:
+            print(f"  {name}: {delta:+.1f}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Benchmark Reports
+=================
+Summaries of driver runs, stored as JSON for run-over-run comparison.
+
+Each report holds, per endpoint, the request count, errors, latency
+percentiles (p50/p95/p99, in milliseconds), throughput, the mean response
+size on the wire (after compression) and the number of SQL statements per
+request when the driver could count them. Reports are
+written to bench/results/ with the git commit and run parameters, and
+``compare`` prints the change of every metric against a previous report.
+
+Usage (from the backend directory):
+    python -m bench.report                       # latest report against the one before
+    python -m bench.report bench/results/a.json bench/results/b.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+RESULTS_DIR = os.path.join("bench", "results")
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate request samples per endpoint.
+
+    Args:
+        samples: Dicts with "endpoint", "latency" (seconds), "status", "queries" (or None)
+            and "bytes" (response body on the wire)
+        elapsed: Wall time of the run in seconds, for throughput
+
+    Returns:
+        Mapping of endpoint to its metrics, plus an "all" entry
+    """
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for sample in samples:
+        groups.setdefault(sample["endpoint"], []).append(sample)
+    groups["all"] = samples
+
+    summary = {}
+    for endpoint, group in sorted(groups.items()):
+        latencies = sorted(sample["latency"] * 1000 for sample in group)
+        queries = [sample["queries"] for sample in group if sample["queries"] is not None]
+        sizes = [sample["bytes"] for sample in group if sample.get("bytes") is not None]
+        summary[endpoint] = {
+            "requests": len(group),
+            "errors": sum(1 for sample in group if sample["status"] >= 400),
+            "rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "kb_mean": round(sum(sizes) / len(sizes) / 1024, 2) if sizes else None,
+            "queries_mean": round(sum(queries) / len(queries), 2) if queries else None,
+            "queries_max": max(queries) if queries else None,
+        }
+    return summary
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_report(summary: Dict[str, Any], meta: Dict[str, Any], name: str = "run", directory: str = RESULTS_DIR) -> str:
+    """Write a report with its run metadata and return its path"""
+    os.makedirs(directory, exist_ok=True)
+    started = datetime.utcnow()
+    path = os.path.join(directory, f"{name}-{started.strftime('%Y%m%dT%H%M%S')}.json")
+    report = {"meta": {**meta, "commit": git_commit(), "created_at": started.isoformat()}, "endpoints": summary}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def previous_report(path: str, directory: str = RESULTS_DIR) -> Optional[str]:
+    """The most recent report of the same kind written before the given one"""
+    prefix = os.path.basename(path).rsplit("-", 1)[0] + "-"
+    candidates = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(prefix) and name.endswith(".json") and name < os.path.basename(path)
+    )
+    return os.path.join(directory, candidates[-1]) if candidates else None
+
+
+def _delta(old: Optional[float], new: Optional[float]) -> str:
+    if old is None or new is None:
+        return "-"
+    if not old:
+        return "n/a" if new else "0.0%"
+    return f"{(new - old) / old * 100:+.1f}%"
+
+
+def print_summary(summary: Dict[str, Dict[str, Any]], out=sys.stdout) -> None:
+    print(f"{'endpoint':<42}{'reqs':>7}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'kB':>8}{'sql':>7}", file=out)
+    for endpoint, metrics in summary.items():
+        queries = metrics["queries_mean"]
+        size = metrics.get("kb_mean")
+        print(
+            f"{endpoint:<42}{metrics['requests']:>7}{metrics['errors']:>5}{metrics['rps']:>9.1f}"
+            f"{metrics['p50_ms']:>9.2f}{metrics['p95_ms']:>9.2f}{metrics['p99_ms']:>9.2f}"
+            f"{'-' if size is None else f'{size:.1f}':>8}"
+            f"{'-' if queries is None else f'{queries:.1f}':>7}",
+            file=out
+        )
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any], out=sys.stdout) -> None:
+    """Print the relative change of latency, throughput, response size and query counts per endpoint"""
+    print(f"baseline {old['meta'].get('commit')} ({old['meta'].get('created_at')}) -> "
+          f"{new['meta'].get('commit')} ({new['meta'].get('created_at')})", file=out)
+    print(f"{'endpoint':<42}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'kB':>9}{'sql':>9}", file=out)
+    for endpoint, metrics in new["endpoints"].items():
+        before = old["endpoints"].get(endpoint)
+        if before is None:
+            print(f"{endpoint:<42}{'new':>9}", file=out)
+            continue
+        print(
+            f"{endpoint:<42}"
+            + "".join(
+                f"{_delta(before.get(key), metrics.get(key)):>9}"
+                for key in ("rps", "p50_ms", "p95_ms", "p99_ms", "kb_mean", "queries_mean")
+            ),
+            file=out
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark reports")
+    parser.add_argument("reports", nargs="*", help="Baseline and new report (default: the two latest runs)")
+    args = parser.parse_args()
+
+    if len(args.reports) == 2:
+        baseline, latest = args.reports
+    elif len(args.reports) <= 1:
+        latest = args.reports[0] if args.reports else None
+        if latest is None:
+            runs = sorted(name for name in os.listdir(RESULTS_DIR) if name.startswith("run-")) if os.path.isdir(RESULTS_DIR) else []
+            if not runs:
+                print("No reports found", file=sys.stderr)
+                return 1
+            latest = os.path.join(RESULTS_DIR, runs[-1])
+        baseline = previous_report(latest, os.path.dirname(latest) or ".")
+        if baseline is None:
+            print_summary(load_report(latest)["endpoints"])
+            return 0
+    else:
+        parser.error("expected at most two reports")
+
+    compare(load_report(baseline), load_report(latest))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Bulk Import CLI
+===============
+Loads users, projects or tasks from a CSV or NDJSON file into the database.
+
+Usage:
+    python import_data.py users usuarios.csv
+    python import_data.py tasks tareas.ndjson --batch-size 1000
+    cat tareas.csv | python import_data.py tasks - --format csv
+"""
+
+import argparse
+import json
+import sys
+from sqlmodel import Session
+from app.core.database import engine
+from app.core.importer import Importer, IMPORT_ENTITIES, IMPORT_FORMATS
+from app.core.settings import get_settings
+from app.models.import_report import ImportReport
+
+
+def print_progress(report: ImportReport) -> None:
+    print(
+        f"\r{report.entity}: {report.processed} processed, {report.imported} imported, {report.failed} failed",
+        end="",
+        file=sys.stderr,
+        flush=True
+    )
+
+
+def main() -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Bulk import users, projects or tasks")
+    parser.add_argument("entity", choices=IMPORT_ENTITIES, help="Entity to import")
+    parser.add_argument("path", help="Input file, or - to read from stdin")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Input format (default: from file extension)")
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size, help="Rows per transaction")
+    parser.add_argument("--hash-workers", type=int, default=settings.import_hash_workers, help="Parallel password hashing workers")
+    args = parser.parse_args()
+
+    import_format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    # Keep SQL logging out of the progress output
+    engine.echo = False
+
+    stream = sys.stdin if args.path == "-" else open(args.path, encoding="utf-8-sig", newline="")
+    try:
+        with Session(engine) as session:
+            importer = Importer(
+                session,
+                args.entity,
+                batch_size=args.batch_size,
+                hash_workers=args.hash_workers,
+                on_progress=print_progress
+            )
+            report = importer.run(stream, import_format)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(file=sys.stderr)
+    print(json.dumps(report.model_dump(), indent=2, ensure_ascii=False))
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
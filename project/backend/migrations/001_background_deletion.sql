@@ -0,0 +1,24 @@
+-- =====================================================
+-- Background deletion of projects and users
+-- =====================================================
+ALTER TABLE projects
+    ADD COLUMN deleting TINYINT(1) NOT NULL DEFAULT 0,
+    ADD KEY idx_projects_deleting (deleting);
+
+ALTER TABLE users
+    ADD COLUMN deleting TINYINT(1) NOT NULL DEFAULT 0,
+    ADD KEY idx_users_deleting (deleting);
+
+CREATE TABLE deletion_jobs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    entity VARCHAR(20) NOT NULL,
+    entity_id INT NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    deleted_rows INT NOT NULL DEFAULT 0,
+    error VARCHAR(255) NULL,
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    finished_at DATETIME NULL,
+    KEY idx_deletion_jobs_entity (entity_id),
+    KEY idx_deletion_jobs_status (status)
+);
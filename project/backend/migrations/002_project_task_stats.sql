@@ -0,0 +1,16 @@
+-- =====================================================
+-- Precomputed per-project task statistics
+-- =====================================================
+CREATE TABLE project_task_stats (
+    project_id INT NOT NULL,
+    assignee_id INT NOT NULL DEFAULT 0,  -- 0 = unassigned
+    status VARCHAR(50) NOT NULL,
+    task_count INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, assignee_id, status)
+);
+
+-- Initial load; afterwards the API keeps it up to date and the scheduler reconciles it
+INSERT INTO project_task_stats (project_id, assignee_id, status, task_count)
+SELECT project_id, COALESCE(assigned_to, 0), status, COUNT(*)
+FROM tasks
+GROUP BY project_id, COALESCE(assigned_to, 0), status;
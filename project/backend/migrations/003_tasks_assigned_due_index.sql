@@ -0,0 +1,5 @@
+-- =====================================================
+-- Keyset paging of a user's tasks by due date (/api/me/work)
+-- =====================================================
+ALTER TABLE tasks
+    ADD KEY idx_tasks_assigned_due (assigned_to, due_date, id);
@@ -0,0 +1,5 @@
+-- =====================================================
+-- Calendar range queries of a project by due date
+-- =====================================================
+ALTER TABLE tasks
+    ADD KEY idx_tasks_project_due (project_id, due_date);
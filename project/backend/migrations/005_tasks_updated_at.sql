@@ -0,0 +1,6 @@
+-- =====================================================
+-- Change watermark for incremental report snapshots
+-- =====================================================
+ALTER TABLE tasks
+    ADD COLUMN updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    ADD KEY idx_tasks_updated_at (updated_at);
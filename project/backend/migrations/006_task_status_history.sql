@@ -0,0 +1,29 @@
+-- =====================================================
+-- Task status history and daily rollups for burndown charts
+-- =====================================================
+CREATE TABLE task_status_history (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    task_id INT NOT NULL,
+    project_id INT NOT NULL,
+    from_status VARCHAR(50) NULL,  -- NULL = task created
+    to_status VARCHAR(50) NULL,    -- NULL = task deleted
+    changed_at DATETIME NOT NULL,
+    KEY idx_task_status_history_task (task_id),
+    KEY idx_task_status_history_project (project_id, changed_at)
+);
+
+CREATE TABLE project_status_daily (
+    project_id INT NOT NULL,
+    day DATE NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    entered INT NOT NULL DEFAULT 0,
+    exited INT NOT NULL DEFAULT 0,
+    cycle_seconds BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (project_id, day, status)
+);
+
+-- Existing tasks enter their current status on the migration day so burndown counts start right
+INSERT INTO project_status_daily (project_id, day, status, entered)
+SELECT project_id, UTC_DATE(), status, COUNT(*)
+FROM tasks
+GROUP BY project_id, status;
@@ -0,0 +1,9 @@
+-- =====================================================
+-- Role capabilities for project-scoped authorization
+-- =====================================================
+ALTER TABLE project_roles
+    ADD COLUMN capabilities VARCHAR(50) NOT NULL DEFAULT 'read,write';
+
+-- Existing roles created from the default templates
+UPDATE project_roles SET capabilities = 'read,write,manage' WHERE name = 'Administrador';
+UPDATE project_roles SET capabilities = 'read' WHERE name = 'Revisor';
@@ -0,0 +1,18 @@
+-- =====================================================
+-- Refresh tokens (stored as HMAC-SHA256, rotated on every use)
+-- =====================================================
+CREATE TABLE refresh_tokens (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    user_id INT NOT NULL,
+    family_id VARCHAR(32) NOT NULL,   -- tokens rotated from the same login
+    token_hash CHAR(64) NOT NULL,
+    created_at DATETIME NOT NULL,
+    expires_at DATETIME NOT NULL,
+    used_at DATETIME NULL,            -- set on rotation; a second use revokes the family
+    revoked_at DATETIME NULL,
+    UNIQUE KEY uq_refresh_tokens_hash (token_hash),
+    KEY idx_refresh_tokens_user (user_id),
+    KEY idx_refresh_tokens_family (family_id),
+    KEY idx_refresh_tokens_expires (expires_at),
+    CONSTRAINT fk_refresh_tokens_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
@@ -0,0 +1,18 @@
+-- =====================================================
+-- Access token revocation (logout and revoke-all)
+-- =====================================================
+-- Tokens issued before this time are rejected
+ALTER TABLE users
+    ADD COLUMN tokens_not_before DATETIME NULL;
+
+-- Single revoked access tokens, kept until they expire
+CREATE TABLE revoked_tokens (
+    jti VARCHAR(32) NOT NULL PRIMARY KEY,
+    user_id INT NOT NULL,
+    revoked_at DATETIME NOT NULL,
+    expires_at DATETIME NOT NULL,
+    KEY idx_revoked_tokens_user (user_id),
+    KEY idx_revoked_tokens_revoked (revoked_at),
+    KEY idx_revoked_tokens_expires (expires_at),
+    CONSTRAINT fk_revoked_tokens_user FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+);
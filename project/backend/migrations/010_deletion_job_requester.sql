@@ -0,0 +1,6 @@
+-- =====================================================
+-- User who started each background deletion
+-- =====================================================
+-- No foreign key: a user deleting their own account is the requester
+ALTER TABLE deletion_jobs
+    ADD COLUMN requested_by INT NULL;
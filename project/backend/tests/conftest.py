@@ -0,0 +1,79 @@
+"""
+Test configuration: the app runs against a throwaway SQLite database.
+
+Settings are read from the environment when app.core.settings is imported,
+so the environment is prepared before any app module is loaded.
+"""
+
+import os
+import sys
+import tempfile
+
+DB_DIR = tempfile.mkdtemp(prefix="microcrm-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(DB_DIR, 'test.sqlite')}"
+os.environ["RATE_LIMIT_API_PER_MIN"] = "100000"
+os.environ["RATE_LIMIT_AUTH_PER_MIN"] = "100000"
+os.environ["SNAPSHOT_DIR"] = ""
+os.environ["READ_REPLICA_URLS"] = ""
+os.environ["REVOCATION_SYNC_SECONDS"] = "3600"  # one revocation load per run, so counts are stable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import SQLModel
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from app.main import app  # registers every table on SQLModel.metadata
+    from app.core.database import engine
+    engine.echo = False
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    from app.main import app
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client):
+    response = client.post(
+        "/api/auth/register",
+        json={"name": "Ana", "email": "ana@example.com", "password": "Passw0rd!"}
+    )
+    assert response.status_code == 201, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def user_id(client, auth_headers):
+    return client.get("/api/auth/me", headers=auth_headers).json()["id"]
+
+
+class StatementCounter:
+    """SQL statements sent by the engine, recorded with before_cursor_execute"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(" ".join(statement.split()))
+
+    def reset(self):
+        self.statements.clear()
+
+    def __len__(self):
+        return len(self.statements)
+
+
+@pytest.fixture
+def statements(engine):
+    counter = StatementCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine, "before_cursor_execute", counter)
@@ -0,0 +1,44 @@
+"""
+Logout revokes the refresh token of the same login even when the access
+token itself needs no new revocation row (issued without jti).
+"""
+
+from datetime import datetime, timedelta, timezone
+from jose import jwt
+
+
+def legacy_access_token(user_id: int, email: str) -> str:
+    """Access token as issued before revocation existed: no jti claim"""
+    from app.core.security import ALGO
+    from app.core.settings import get_settings
+    now = datetime.now(tz=timezone.utc)
+    claims = {"sub": str(user_id), "email": email, "iat": now, "exp": now + timedelta(minutes=5)}
+    return jwt.encode(claims, get_settings().secret_key, algorithm=ALGO)
+
+
+def register(client, email):
+    response = client.post("/api/auth/register", json={"name": "Dana", "email": email, "password": "Passw0rd!"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_logout_without_jti_revokes_refresh_token(client):
+    login = register(client, "dana@example.com")
+    headers = {"Authorization": f"Bearer {legacy_access_token(login['user']['id'], login['user']['email'])}"}
+
+    response = client.post("/api/auth/logout", json={"refresh_token": login["refresh_token"]}, headers=headers)
+    assert response.status_code == 204, response.text
+
+    response = client.post("/api/auth/refresh", json={"refresh_token": login["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_access_and_refresh_tokens(client):
+    login = register(client, "erin@example.com")
+    headers = {"Authorization": f"Bearer {login['access_token']}"}
+
+    response = client.post("/api/auth/logout", json={"refresh_token": login["refresh_token"]}, headers=headers)
+    assert response.status_code == 204, response.text
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+    assert client.post("/api/auth/refresh", json={"refresh_token": login["refresh_token"]}).status_code == 401
@@ -0,0 +1,206 @@
+"""
+Statements sent per write request.
+
+Write handlers build their responses from the objects they already hold:
+sessions keep attributes after commit (expire_on_commit=False) and the
+project, user and role validated by the handler are reused for the
+response, so no refresh SELECT follows the write.
+
+Every request is measured after a warm-up GET, so the revocation filter
+and the permission index are already loaded. The counts include the
+authentication lookup of the current user.
+"""
+
+import re
+import pytest
+
+# Task writes also maintain the status summary and the status history
+TASK_BOOKKEEPING_TABLES = ("project_task_stats", "task_status_history", "project_status_daily")
+
+
+def written_tables(statements):
+    return [
+        match.group(1) for match in (
+            re.match(r"(?:INSERT INTO|UPDATE) (\w+)", statement) for statement in statements
+        ) if match
+    ]
+
+
+def refreshed(statements, table):
+    """Whether a row of ``table`` is read back after it was written"""
+    written = False
+    for statement in statements:
+        if re.match(rf"(?:INSERT INTO|UPDATE) {table}\b", statement):
+            written = True
+        elif written and statement.startswith("SELECT") and re.search(rf"\bFROM {table}\b", statement):
+            return True
+    return False
+
+
+def without_bookkeeping(statements):
+    return [
+        statement for statement in statements
+        if not any(table in statement for table in TASK_BOOKKEEPING_TABLES)
+    ]
+
+
+@pytest.fixture
+def project(client, auth_headers, user_id):
+    response = client.post(
+        "/api/projects/",
+        json={"name": "Project", "description": "Statements", "id_user": user_id},
+        headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def other_user(client):
+    response = client.post(
+        "/api/users/",
+        json={"name": "Bob", "email": f"bob{id(object())}@example.com", "password": "Passw0rd!"}
+    )
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def warm_up(client, auth_headers, project):
+    assert client.get(f"/api/projects/{project['id']}", headers=auth_headers).status_code == 200
+
+
+def test_create_project(client, auth_headers, user_id, project, statements):
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.post(
+        "/api/projects/",
+        json={"name": "Another", "description": "d", "id_user": user_id},
+        headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    # user, project, default roles (one multi-row INSERT)
+    assert written_tables(statements.statements) == ["projects", "project_roles"]
+    assert not refreshed(statements.statements, "projects")
+    assert len(statements) == 3
+
+
+def test_update_project(client, auth_headers, project, statements):
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.put(f"/api/projects/{project['id']}", json={"name": "Renamed"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "Renamed"
+    # user, project, UPDATE
+    assert not refreshed(statements.statements, "projects")
+    assert len(statements) == 3
+
+
+def test_create_task(client, auth_headers, user_id, project, statements):
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.post(
+        "/api/tasks/",
+        json={"project_id": project["id"], "title": "Task", "assigned_to": user_id},
+        headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["project_name"] == project["name"]
+    assert not refreshed(statements.statements, "tasks")
+    # user, project, INSERT (the assignee is the current user, already loaded)
+    assert len(without_bookkeeping(statements.statements)) == 3
+
+
+def test_update_task(client, auth_headers, project, statements):
+    task = client.post("/api/tasks/", json={"project_id": project["id"], "title": "Task"}, headers=auth_headers).json()
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.put(f"/api/tasks/{task['id']}", json={"status": "completed"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "completed"
+    assert not refreshed(statements.statements, "tasks")
+    # user, task, UPDATE, project (for the response)
+    assert len(without_bookkeeping(statements.statements)) == 4
+
+
+def test_create_user(client, statements):
+    statements.reset()
+    response = client.post(
+        "/api/users/",
+        json={"name": "Carol", "email": "carol@example.com", "password": "Passw0rd!"}
+    )
+    assert response.status_code == 201, response.text
+    # email uniqueness check, INSERT
+    assert not refreshed(statements.statements, "users")
+    assert len(statements) == 2
+
+
+def test_update_user(client, auth_headers, user_id, project, statements):
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.put(f"/api/users/{user_id}", json={"name": "Ana Maria"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    # user, UPDATE
+    assert not refreshed(statements.statements, "users")
+    assert len(statements) == 2
+
+
+def test_create_project_role(client, auth_headers, project, statements):
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.post(
+        "/api/project-roles/",
+        json={"name": "QA", "project_id": project["id"]},
+        headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    # user, project, duplicate name check, INSERT
+    assert not refreshed(statements.statements, "project_roles")
+    assert len(statements) == 4
+
+
+def test_update_project_role(client, auth_headers, project, statements):
+    role = client.post(
+        "/api/project-roles/", json={"name": "QA", "project_id": project["id"]}, headers=auth_headers
+    ).json()
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.put(f"/api/project-roles/{role['id']}", json={"name": "QA Lead"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    # user, role, UPDATE, project (for the response)
+    assert not refreshed(statements.statements, "project_roles")
+    assert len(statements) == 4
+
+
+def test_create_project_member(client, auth_headers, project, other_user, statements):
+    role_id = client.get(f"/api/project-roles/project/{project['id']}", headers=auth_headers).json()[0]["id"]
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.post(
+        "/api/project-members/",
+        json={"project_id": project["id"], "user_id": other_user["id"], "project_role_id": role_id},
+        headers=auth_headers
+    )
+    assert response.status_code == 201, response.text
+    assert response.json()["user_name"] == other_user["name"]
+    # current user, project, member user, role, duplicate check, INSERT
+    assert not refreshed(statements.statements, "project_members")
+    assert len(statements) == 6
+
+
+def test_update_project_member(client, auth_headers, project, other_user, statements):
+    roles = client.get(f"/api/project-roles/project/{project['id']}", headers=auth_headers).json()
+    member = client.post(
+        "/api/project-members/",
+        json={"project_id": project["id"], "user_id": other_user["id"], "project_role_id": roles[0]["id"]},
+        headers=auth_headers
+    ).json()
+    warm_up(client, auth_headers, project)
+    statements.reset()
+    response = client.put(
+        f"/api/project-members/{member['id']}", json={"project_role_id": roles[1]["id"]}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["role_name"] == roles[1]["name"]
+    # user, member, new role, UPDATE, project and member user (for the response)
+    assert not refreshed(statements.statements, "project_members")
+    assert len(statements) == 6